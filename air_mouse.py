@@ -1,45 +1,44 @@
-import cv2
-import mediapipe as mp
 import pyautogui
 import math
 import numpy as np
-import time
-
-# Initialize MediaPipe Hands
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-
-cap = cv2.VideoCapture(0)
-screen_w, screen_h = pyautogui.size()
+import argparse
+from demo_runtime import add_input_args, CameraDemo, open_input, run_cv2
+from gestures import GestureTracker
+from latency import LatencyProbe
+from overlay import landmark_array
 
 # Settings
 smoothening = 7        # Cursor smoothness
 dead_zone = 5          # Ignore tiny shakes
-scroll_scale = 2       # Scroll speed
+scroll_gain = 30       # Scroll clicks per frame at 1 frame height / second of finger speed
+scroll_dead_speed = 0.1  # Finger speed (frame heights / second) below which scrolling coasts
+flick_scroll = 40      # Scroll kick from a vertical flick, then coasts
 momentum_decay = 0.9   # Scroll momentum decay (0-1)
 
-prev_x, prev_y = 0, 0
-scroll_velocity = 0
 
-with mp_hands.Hands(
-    max_num_hands=1,
-    min_detection_confidence=0.6,
-    min_tracking_confidence=0.6
-) as hands:
+class AirMouseDemo(CameraDemo):
+    title = "Air Controller"
 
-    while True:
-        success, frame = cap.read()
-        if not success:
-            break
+    def start(self, screen):
+        super().start(screen)
+        self.screen_w, self.screen_h = pyautogui.size()
+        self.prev_x, self.prev_y = 0, 0
+        self.scroll_velocity = 0
+        # fingertip motion history: scroll speed comes from its velocity
+        self.gestures = GestureTracker()
 
-        frame = cv2.flip(frame, 1)
+    def on_frame(self, frame, results):
+        if frame is None:
+            return
         h, w, c = frame.shape
-        img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(img_rgb)
+        screen_w, screen_h = self.screen_w, self.screen_h
+        prev_x, prev_y = self.prev_x, self.prev_y
+        scroll_velocity = self.scroll_velocity
 
+        self.overlay.draw(frame, results.multi_hand_landmarks or [], self.preview_visible)
         if results.multi_hand_landmarks:
             hand_landmarks = results.multi_hand_landmarks[0]
-            mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+            gestures = self.gestures.update(landmark_array(hand_landmarks))
 
             # --- Cursor control ---
             index_tip = hand_landmarks.landmark[8]
@@ -55,6 +54,7 @@ with mp_hands.Hands(
                 curr_x = prev_x + dx / smoothening
                 curr_y = prev_y + dy / smoothening
                 pyautogui.moveTo(curr_x, curr_y)
+                self.probe.output("cursor", now=True)
                 prev_x, prev_y = curr_x, curr_y
 
             # --- Pinch for left click ---
@@ -63,6 +63,7 @@ with mp_hands.Hands(
             pinch_distance = math.hypot(x - thumb_x, y - thumb_y)
             if pinch_distance < 40:
                 pyautogui.click()
+                self.probe.output("click", now=True)
 
             # --- Fist for right click ---
             fingertips = [hand_landmarks.landmark[i] for i in [8, 12, 16, 20]]
@@ -75,10 +76,15 @@ with mp_hands.Hands(
 
             # Check if only index and middle fingers are up
             if index_tip.y < wrist.y and middle_tip.y < wrist.y:
-                dy_scroll = y - prev_y
-                if abs(dy_scroll) > 2:  # dead zone
-                    scroll_velocity = -dy_scroll * scroll_scale
-                    prev_y = y
+                # fingertip velocity over the last few frames, not the
+                # distance to the (smoothed) cursor position
+                vy = self.gestures.velocity()[1]
+                if "flick_up" in gestures or "flick_down" in gestures:
+                    scroll_velocity = flick_scroll if vy < 0 else -flick_scroll
+                elif abs(vy) > scroll_dead_speed:
+                    scroll_velocity = -vy * scroll_gain
+                else:
+                    scroll_velocity *= momentum_decay
             else:
                 # Apply momentum when fingers not in scrolling position
                 scroll_velocity *= momentum_decay
@@ -92,11 +98,31 @@ with mp_hands.Hands(
             fingers_folded = all(f.y > wrist.y for f in [hand_landmarks.landmark[i] for i in [8,12,16,20]])
             if thumb_tip_y < thumb_base_y and fingers_folded:
                 pyautogui.doubleClick()
+        else:
+            self.gestures.reset()
+            scroll_velocity = 0
 
+        self.prev_x, self.prev_y = prev_x, prev_y
+        self.scroll_velocity = scroll_velocity
         # --- Show camera feed ---
-        cv2.imshow("Air Controller", frame)
-        if cv2.waitKey(1) & 0xFF == 27:  # ESC to quit
-            break
+        self.output = frame
+
+
+def create_demo():
+    return AirMouseDemo()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Air mouse")
+    add_input_args(parser)
+    parser.add_argument("--overlay-hz", type=float, default=15, help="landmark overlay refresh rate (0: every frame)")
+    args = parser.parse_args()
 
-cap.release()
-cv2.destroyAllWindows()
+    demo = create_demo()
+    demo.overlay_hz = args.overlay_hz
+    cap, hands = open_input(demo.tracker, service=args.service, govern=args.govern,
+                            backend=args.backend)
+    probe = LatencyProbe() if args.latency else None
+    run_cv2(demo, cap, hands, "Air Controller", probe=probe)
+    if probe:
+        print(probe.report())
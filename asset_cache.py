@@ -0,0 +1,276 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections.abc import Mapping
+import pygame
+
+# ------------------------------
+# Asset pre-conversion cache
+# ------------------------------
+# PNG decoding and WAV decoding + resampling to the mixer's format happen
+# once; the results are stored raw under .asset_cache/ and later launches
+# only read bytes back:
+#   images  BGRA pixels, the usual 32-bit display layout, so convert_alpha()
+#           is a plain copy
+#   sounds  PCM in the mixer's (frequency, format, channels), loaded with
+#           Sound(buffer=...)
+# index.json maps each source file to its converted file. An entry is
+# reused while the source's size and mtime match; if only the mtime moved
+# (checkout, copy) the content hash decides. Bump CACHE_VERSION when the
+# conversion changes, which drops the whole cache.
+#
+# A missing source gets a placeholder (magenta checker image, short
+# silence) and a warning instead of an exception. LazyAssets loads each
+# asset on first access; warm() loads them all (e.g. on a startup worker).
+#
+#   python asset_cache.py                 # startup time: no cache / cold / warm
+#   python asset_cache.py --clear
+
+CACHE_VERSION = 1
+CACHE_DIR = ".asset_cache"
+IMAGE_FORMAT = "BGRA"
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+PLACEHOLDER_SIZE = (64, 64)
+PLACEHOLDER_SECONDS = 0.05
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def placeholder_image(size=PLACEHOLDER_SIZE):
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill((255, 0, 255, 255))
+    cell = max(1, size[0] // 4)
+    for y in range(0, size[1], cell):
+        for x in range((y // cell) % 2 * cell, size[0], 2 * cell):
+            surface.fill((0, 0, 0, 255), (x, y, cell, cell))
+    return surface
+
+
+def placeholder_sound():
+    frequency, fmt, channels = pygame.mixer.get_init()
+    frames = int(frequency * PLACEHOLDER_SECONDS)
+    return pygame.mixer.Sound(buffer=bytes(frames * channels * abs(fmt) // 8))
+
+
+def _write_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class AssetCache:
+    def __init__(self, root, cache_dir=CACHE_DIR, enabled=True):
+        # root: directory the asset names are relative to; enabled=False
+        # decodes straight from the sources (for comparisons)
+        self.root = root
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "converted": 0, "missing": 0, "uncached": 0}
+        self.load_time = 0.0
+        self.entries = {}
+        self.dirty = False
+        if enabled:
+            self._read_index()
+
+    # index
+    def _index_path(self):
+        return os.path.join(self.cache_dir, "index.json")
+
+    def _read_index(self):
+        try:
+            with open(self._index_path()) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+        if index.get("version") == CACHE_VERSION:
+            self.entries = index["entries"]
+
+    def save(self):
+        # called after each conversion; cheap, the index is a few lines
+        if not self.dirty:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data = json.dumps({"version": CACHE_VERSION, "entries": self.entries}, indent=1, sort_keys=True)
+        _write_atomic(self._index_path(), data.encode())
+        self.dirty = False
+
+    def _lookup(self, name, source, params):
+        # -> (entry, stat) with entry None when the cached copy can't be used
+        st = os.stat(source)
+        entry = self.entries.get(name)
+        if entry is None or entry["params"] != params:
+            return None, st
+        if not os.path.exists(os.path.join(self.cache_dir, entry["file"])):
+            return None, st
+        if entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry, st
+        if entry["size"] == st.st_size and entry["sha1"] == file_hash(source):
+            # touched, not changed
+            entry["mtime_ns"] = st.st_mtime_ns
+            self.dirty = True
+            return entry, st
+        return None, st
+
+    def _store(self, name, st, source, params, data, **info):
+        digest = file_hash(source)
+        base = name.replace(os.sep, "_").replace("/", "_")
+        filename = f"{base}-{digest[:12]}.raw"
+        os.makedirs(self.cache_dir, exist_ok=True)
+        old = self.entries.get(name)
+        _write_atomic(os.path.join(self.cache_dir, filename), data)
+        if old is not None and old["file"] != filename:
+            try:
+                os.remove(os.path.join(self.cache_dir, old["file"]))
+            except OSError:
+                pass
+        self.entries[name] = dict(info, file=filename, params=params, size=st.st_size,
+                                  mtime_ns=st.st_mtime_ns, sha1=digest)
+        self.dirty = True
+        self.save()
+
+    def _read(self, entry):
+        with open(os.path.join(self.cache_dir, entry["file"]), "rb") as f:
+            return f.read()
+
+    def _load(self, name, params, decode, from_raw, to_raw, placeholder):
+        t0 = time.perf_counter()
+        source = os.path.join(self.root, name)
+        try:
+            with self.lock:
+                if not os.path.exists(source):
+                    self.stats["missing"] += 1
+                    print(f"assets: {source} missing, using a placeholder")
+                    return placeholder()
+                if not self.enabled:
+                    self.stats["uncached"] += 1
+                    return decode(source)
+                entry, st = self._lookup(name, source, params)
+                if entry is not None:
+                    self.stats["hits"] += 1
+                    return from_raw(self._read(entry), entry)
+                asset = decode(source)
+                data, info = to_raw(asset)
+                self._store(name, st, source, params, data, **info)
+                self.stats["converted"] += 1
+                return asset
+        finally:
+            self.load_time += time.perf_counter() - t0
+
+    # assets
+    def image(self, name):
+        """Decoded image (a plain Surface; convert_alpha() it once the display is up)."""
+        def to_raw(surface):
+            return pygame.image.tobytes(surface, IMAGE_FORMAT), {"dims": list(surface.get_size())}
+
+        def from_raw(data, entry):
+            return pygame.image.frombytes(data, tuple(entry["dims"]), IMAGE_FORMAT)
+
+        return self._load(name, [IMAGE_FORMAT], pygame.image.load, from_raw, to_raw, placeholder_image)
+
+    def sound(self, name):
+        """Sound in the current mixer format (the mixer must be initialized)."""
+        def to_raw(sound):
+            return sound.get_raw(), {}
+
+        def from_raw(data, entry):
+            return pygame.mixer.Sound(buffer=data)
+
+        return self._load(name, list(pygame.mixer.get_init()), pygame.mixer.Sound, from_raw, to_raw,
+                          placeholder_sound)
+
+    def load(self, name):
+        return self.image(name) if name.lower().endswith(IMAGE_EXTENSIONS) else self.sound(name)
+
+    def summary(self):
+        return (f"assets: {self.stats['hits']} cached, {self.stats['converted']} converted, "
+                f"{self.stats['uncached']} uncached, {self.stats['missing']} missing, "
+                f"{self.load_time * 1000:.1f} ms")
+
+
+class LazyAssets(Mapping):
+    """key -> asset, loaded with load(filename) on first access."""
+
+    def __init__(self, load, files):
+        self._load = load
+        self.files = dict(files)
+        self.loaded = {}
+
+    def __getitem__(self, key):
+        asset = self.loaded.get(key)
+        if asset is None:
+            asset = self.loaded[key] = self._load(self.files[key])
+        return asset
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __len__(self):
+        return len(self.files)
+
+    def warm(self):
+        for key in self.files:
+            self[key]
+        return self
+
+
+def clear(cache_dir=CACHE_DIR):
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+# ------------------------------
+# Startup time: no cache vs cold vs warm cache
+# ------------------------------
+def time_load(root, names, cache_dir, enabled):
+    cache = AssetCache(root, cache_dir, enabled)
+    t0 = time.perf_counter()
+    for name in names:
+        cache.load(name)
+    return time.perf_counter() - t0, cache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Asset cache: startup time with and without it")
+    parser.add_argument("--dir", default="space_game", help="asset directory")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (best is reported)")
+    parser.add_argument("--clear", action="store_true", help="delete the cache and exit")
+    args = parser.parse_args(argv)
+    if args.clear:
+        clear(args.cache_dir)
+        print(f"removed {args.cache_dir}")
+        return
+
+    pygame.mixer.init()
+    names = sorted(n for n in os.listdir(args.dir)
+                   if n.lower().endswith(IMAGE_EXTENSIONS + (".wav", ".ogg")))
+    cases = []
+    cases.append(("no cache", min(time_load(args.dir, names, args.cache_dir, False)[0]
+                                  for _ in range(args.repeat))))
+    cold = []
+    for _ in range(args.repeat):
+        clear(args.cache_dir)
+        cold.append(time_load(args.dir, names, args.cache_dir, True)[0])
+    cases.append(("cold cache (converting)", min(cold)))
+    warm, cache = min((time_load(args.dir, names, args.cache_dir, True) for _ in range(args.repeat)),
+                      key=lambda r: r[0])
+    cases.append(("warm cache", warm))
+    print(f"{len(names)} assets in {args.dir}")
+    for label, secs in cases:
+        print(f"{label:<24} {secs * 1000:8.1f} ms")
+    print(cache.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import random
+import time
+import pygame
+
+# ------------------------------
+# Audio manager
+# ------------------------------
+# Sound effects go through a fixed pool of mixer channels instead of
+# Sound.play() grabbing whatever is free. Each effect has a concurrency cap,
+# a minimum retrigger interval and a priority used when a voice has to be
+# stolen. Counters record what got played, dropped, coalesced or stolen.
+# Works with SDL_AUDIODRIVER=dummy for headless checks.
+
+
+class AudioManager:
+    def __init__(self, voices=16, clock=time.perf_counter, seed=None):
+        pygame.mixer.set_num_channels(voices)
+        self.channels = [pygame.mixer.Channel(i) for i in range(voices)]
+        # what each voice is currently playing
+        self.voice_effect = [None] * voices
+        self.voice_priority = [0] * voices
+        self.voice_started = [0.0] * voices
+        self.effects = {}
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.stats = {"played": 0, "dropped": 0, "coalesced": 0, "stolen": 0}
+
+    def add(self, name, sounds, max_voices=4, min_interval=0.03, priority=1, volume=1.0):
+        """Register an effect; several sounds means a random variant per play."""
+        if not isinstance(sounds, (list, tuple)):
+            sounds = [sounds]
+        for s in sounds:
+            s.set_volume(volume)
+        self.effects[name] = {
+            "sounds": list(sounds),
+            "max_voices": max_voices,
+            "min_interval": min_interval,
+            "priority": priority,
+            "last": None,
+            "stats": {"played": 0, "dropped": 0, "coalesced": 0, "stolen": 0},
+        }
+
+    def _count(self, effect, key):
+        self.stats[key] += 1
+        effect["stats"][key] += 1
+
+    def _release_finished(self):
+        for i, ch in enumerate(self.channels):
+            if self.voice_effect[i] is not None and not ch.get_busy():
+                self.voice_effect[i] = None
+
+    def _pick_voice(self, priority):
+        # free voice first, else steal the oldest voice of the lowest priority
+        # that is strictly below ours
+        victim = None
+        for i in range(len(self.channels)):
+            if self.voice_effect[i] is None:
+                return i, False
+            if self.voice_priority[i] < priority:
+                if (victim is None or
+                        (self.voice_priority[i], self.voice_started[i]) <
+                        (self.voice_priority[victim], self.voice_started[victim])):
+                    victim = i
+        return victim, victim is not None
+
+    def play(self, name):
+        """Play an effect; returns the channel used, or None if it was skipped."""
+        effect = self.effects[name]
+        now = self.clock()
+
+        # several triggers inside the retrigger window collapse into one
+        if effect["last"] is not None and now - effect["last"] < effect["min_interval"]:
+            self._count(effect, "coalesced")
+            return None
+
+        self._release_finished()
+        if self.voice_effect.count(name) >= effect["max_voices"]:
+            self._count(effect, "dropped")
+            return None
+
+        voice, stolen = self._pick_voice(effect["priority"])
+        if voice is None:
+            self._count(effect, "dropped")
+            return None
+        if stolen:
+            self.channels[voice].stop()
+            self._count(self.effects[self.voice_effect[voice]], "stolen")
+
+        channel = self.channels[voice]
+        channel.play(self.rng.choice(effect["sounds"]))
+        self.voice_effect[voice] = name
+        self.voice_priority[voice] = effect["priority"]
+        self.voice_started[voice] = now
+        effect["last"] = now
+        self._count(effect, "played")
+        return channel
+
+    def summary(self):
+        per_effect = ", ".join(
+            f"{name} {e['stats']['played']}/{e['stats']['dropped']}/{e['stats']['coalesced']}/{e['stats']['stolen']}"
+            for name, e in self.effects.items())
+        s = self.stats
+        return (f"audio played {s['played']} dropped {s['dropped']} coalesced {s['coalesced']} "
+                f"stolen {s['stolen']} (played/dropped/coalesced/stolen: {per_effect})")
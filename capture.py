@@ -0,0 +1,205 @@
+import argparse
+import json
+import random
+import time
+import numpy as np
+
+# ------------------------------
+# Camera capture negotiation
+# ------------------------------
+# Default backends often hand out YUYV at a reduced frame rate with several
+# frames queued in the driver, which is latency before the tracker even
+# runs. Camera asks for MJPG, a frame rate, a 1-frame buffer and a size, reads
+# back what the device actually accepted, and times every read() so
+# effective FPS and inter-frame jitter show up in the instrumentation
+# output (LatencyProbe.report()).
+#
+#   python capture.py                          # negotiate camera 0 and measure
+#   python capture.py --video clip.mp4 --pace 30 --jitter-ms 4
+
+FOURCC = "MJPG"
+FPS = 30
+BUFFER_SIZE = 1
+SIZE = (1280, 720)
+
+
+def fourcc_name(value):
+    value = int(value)
+    if value <= 0:
+        return "?"
+    return "".join(chr((value >> 8 * i) & 0xFF) for i in range(4))
+
+
+def negotiate(cap, size=SIZE, fps=FPS, fourcc=FOURCC, buffer_size=BUFFER_SIZE):
+    """Request capture settings and return {"requested", "accepted", "rejected"}.
+
+    Order matters on V4L2: the pixel format has to be set before the size
+    and the rate, or the driver may renegotiate them back.
+    """
+    import cv2
+    requested = {"fourcc": fourcc, "width": size[0] if size else None, "height": size[1] if size else None,
+                 "fps": fps, "buffer": buffer_size}
+    if fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    if size:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+    if fps:
+        cap.set(cv2.CAP_PROP_FPS, fps)
+    if buffer_size:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+    accepted = {"fourcc": fourcc_name(cap.get(cv2.CAP_PROP_FOURCC)),
+                "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                "fps": round(cap.get(cv2.CAP_PROP_FPS), 2), "buffer": int(cap.get(cv2.CAP_PROP_BUFFERSIZE))}
+    rejected = [key for key, value in requested.items()
+                if value is not None and accepted[key] != value
+                and not (key == "fps" and abs(accepted[key] - value) < 0.5)]
+    return {"requested": requested, "accepted": accepted, "rejected": rejected}
+
+
+class Camera:
+    """cv2.VideoCapture with negotiated settings and per-read timing.
+
+    Drop-in for the scripts (read/release/isOpened/set/get). The last
+    `window` read() return times are kept in a ring for stats().
+    """
+
+    def __init__(self, source=0, size=SIZE, fps=FPS, fourcc=FOURCC, buffer_size=BUFFER_SIZE, window=512):
+        import cv2
+        self.source = source
+        self.cap = source if hasattr(source, "read") else cv2.VideoCapture(source)
+        self.negotiated = negotiate(self.cap, size, fps, fourcc, buffer_size)
+        self.times = np.zeros(window)
+        self.count = 0
+        self.failed = 0
+        self.frame_size = None
+
+    def read(self):
+        success, frame = self.cap.read()
+        if success:
+            self.times[self.count % len(self.times)] = time.perf_counter()
+            self.count += 1
+            if self.frame_size is None:
+                self.frame_size = (frame.shape[1], frame.shape[0])
+        else:
+            self.failed += 1
+        return success, frame
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+    def stats(self):
+        """Effective FPS and inter-frame jitter over the recent reads (ms)."""
+        n = min(self.count, len(self.times))
+        if n < 3:
+            return None
+        start = self.count % len(self.times) if self.count > len(self.times) else 0
+        times = np.roll(self.times, -start)[:n]
+        gaps = np.diff(times) * 1000
+        return {"frames": self.count, "failed": self.failed, "fps": round(1000 / gaps.mean(), 1),
+                "interval_ms": round(float(gaps.mean()), 2), "jitter_ms": round(float(gaps.std()), 2),
+                "p95_ms": round(float(np.percentile(gaps, 95)), 2), "max_ms": round(float(gaps.max()), 2),
+                "frame_size": list(self.frame_size) if self.frame_size else None}
+
+    def report(self):
+        req, acc = self.negotiated["requested"], self.negotiated["accepted"]
+        line = (f"camera: requested {req['fourcc']} {req['width']}x{req['height']}@{req['fps']} buf {req['buffer']}"
+                f" -> accepted {acc['fourcc']} {acc['width']}x{acc['height']}@{acc['fps']} buf {acc['buffer']}")
+        if self.negotiated["rejected"]:
+            line += f" (not accepted: {', '.join(self.negotiated['rejected'])})"
+        s = self.stats()
+        if s:
+            line += (f"\ncamera: {s['fps']} fps effective, interval {s['interval_ms']} ms, jitter {s['jitter_ms']} ms,"
+                     f" p95 {s['p95_ms']} ms, max {s['max_ms']} ms, {s['failed']} failed reads")
+        return line
+
+
+class PacedCapture:
+    """Local camera stand-in: a recorded clip released at `fps`, optionally
+    with uniform +-jitter_ms on every frame, looping at the end.
+
+    Accepts the same set()/get() calls as a camera but, like many real
+    devices, ignores format requests.
+    """
+
+    def __init__(self, path, fps=30, jitter_ms=0.0, loop=True, seed=0):
+        import cv2
+        self.cap = cv2.VideoCapture(path)
+        self.interval = 1.0 / fps
+        self.jitter = jitter_ms / 1000
+        self.loop = loop
+        self.rng = random.Random(seed)
+        self.next_frame = None
+
+    def read(self):
+        import cv2
+        now = time.perf_counter()
+        if self.next_frame is None:
+            self.next_frame = now
+        delay = self.next_frame + self.rng.uniform(-self.jitter, self.jitter) - now
+        if delay > 0:
+            time.sleep(delay)
+        self.next_frame += self.interval
+        success, frame = self.cap.read()
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read()
+        return success, frame
+
+    def set(self, prop, value):
+        return False
+
+    def get(self, prop):
+        import cv2
+        if prop == cv2.CAP_PROP_FPS:
+            return 1.0 / self.interval
+        return self.cap.get(prop)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Negotiate camera capture settings and measure frame timing")
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--video", help="use a clip instead of the camera")
+    parser.add_argument("--pace", type=float, help="with --video: release frames at this rate like a camera")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="with --pace: random +- jitter per frame")
+    parser.add_argument("--frames", type=int, default=150)
+    parser.add_argument("--fourcc", default=FOURCC)
+    parser.add_argument("--fps", type=float, default=FPS)
+    parser.add_argument("--width", type=int, default=SIZE[0])
+    parser.add_argument("--height", type=int, default=SIZE[1])
+    parser.add_argument("--buffer", type=int, default=BUFFER_SIZE)
+    parser.add_argument("--json", action="store_true", help="print the negotiation and stats as JSON")
+    args = parser.parse_args(argv)
+
+    if args.video:
+        source = PacedCapture(args.video, args.pace, args.jitter_ms) if args.pace else args.video
+    else:
+        source = args.camera
+    cam = Camera(source, (args.width, args.height), args.fps, args.fourcc, args.buffer)
+    for _ in range(args.frames):
+        if not cam.read()[0] and not args.pace:
+            break
+    cam.release()
+    if args.json:
+        print(json.dumps(dict(cam.negotiated, stats=cam.stats()), indent=2))
+    else:
+        print(cam.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,96 +1,138 @@
 import cv2
-import mediapipe as mp
-import pyautogui
 import pygame
-import random
+import numpy as np
+import argparse
 import time
-
-# ------------------------------
-# Setup MediaPipe
-# ------------------------------
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-cap = cv2.VideoCapture(0)
-
-hands = mp_hands.Hands(
-    max_num_hands=1,
-    min_detection_confidence=0.6,
-    min_tracking_confidence=0.6
-)
-
-# ------------------------------
-# Setup Pygame
-# ------------------------------
-pygame.init()
-WIDTH, HEIGHT = 800, 600
-win = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Catch the Objects")
-
-clock = pygame.time.Clock()
-font = pygame.font.SysFont("Arial", 30)
+from hud import Hud
+from demo_runtime import add_input_args, Demo, hands_config, open_input, run_pygame
+from hand_assign import HandAssigner
+from latency import LatencyProbe
+from memwatch import MemoryWatch
+from profiler import FrameProfiler
 
 # Player
 player_w, player_h = 100, 20
-player_x = WIDTH // 2 - player_w // 2
-player_y = HEIGHT - player_h - 10
 player_speed = 10
+player_colors = [(0, 200, 0), (0, 120, 255)]
+
+# two players: one inference pass tracks both hands (hand_assign.py)
+TRACKER_2P = hands_config(2)
 
 # Objects
-objects = []
-spawn_timer = 0
 spawn_interval = 60  # frames
-object_radius = 20
 object_speed = 5
 
 # Score
-score = 0
-missed = 0
 max_missed = 5
 
-# ------------------------------
-# Helper function
-# ------------------------------
-def draw_game():
-    win.fill((30, 30, 30))
-    # Draw player
-    pygame.draw.rect(win, (0, 200, 0), (player_x, player_y, player_w, player_h))
-    # Draw objects
-    for obj in objects:
-        pygame.draw.circle(win, (200, 0, 0), (obj[0], obj[1]), object_radius)
-    # Draw score
-    text = font.render(f"Score: {score}  Missed: {missed}", True, (255, 255, 255))
-    win.blit(text, (10, 10))
-    pygame.display.update()
-
-# ------------------------------
-# Game loop
-# ------------------------------
-running = True
-prev_x = None
-
-while running:
-    clock.tick(60)
-    success, frame = cap.read()
-    if not success:
-        break
-
-    frame = cv2.flip(frame, 1)
-    h, w, c = frame.shape
-    img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(img_rgb)
-
-    hand_x = None
-
-    if results.multi_hand_landmarks:
-        hand_landmarks = results.multi_hand_landmarks[0]
-        mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
+class CatchDemo(Demo):
+    """Catch the Objects.
+
+    stress=True spawns spawn_per_frame objects per frame at random speeds
+    between min_speed and max_speed (px/frame) and disables the miss limit.
+    players=2 gives each tracked hand its own paddle and score; misses are
+    shared.
+    """
+    title = "Catch the Objects"
+
+    def __init__(self, stress=False, spawn_per_frame=40, min_speed=15, max_speed=60, players=1):
+        self.stress = stress
+        self.spawn_per_frame = spawn_per_frame
+        self.min_speed = min_speed
+        self.max_speed = max_speed
+        self.players = players
+        self.assigner = None
+        if players > 1:
+            self.tracker = TRACKER_2P
+            self.assigner = HandAssigner(players)
+
+    def start(self, screen):
+        super().start(screen)
+        self.width, self.height = screen.get_size()
+        self.clock = pygame.time.Clock()
+        font = pygame.font.SysFont("Arial", 30)
+        self.hud = Hud((self.width, 50))
+        if self.players > 1:
+            self.hud.add_text("score", font, (10, 10), "P1: {0[0]}  P2: {0[1]}  Missed: {0[2]}", (255, 255, 255))
+        else:
+            self.hud.add_text("score", font, (10, 10), "Score: {0[0]}  Missed: {0[1]}", (255, 255, 255))
+        if self.stress:
+            self.hud.add_text("stress", font, (self.width - 10, 10), "{0[0]} objects  {0[1]:.0f} FPS",
+                              (255, 255, 0), anchor="topright")
+
+        # Players: paddle x, paddle x last frame, last hand x, score
+        self.player_y = self.height - player_h - 10
+        self.paddles = []
+        for i in range(self.players):
+            x = self.width * (i + 1) // (self.players + 1) - player_w // 2
+            self.paddles.append({"x": x, "last_x": x, "hand_x": None, "score": 0})
+
+        # Objects: parallel arrays holding exactly the live objects; spawning
+        # concatenates onto them and step_objects keeps survivors by mask (both copy)
+        # (x, y = circle center, vy = fall speed in px/frame)
+        self.obj_x = np.zeros(0)
+        self.obj_y = np.zeros(0)
+        self.obj_vy = np.zeros(0)
+        self.spawn_timer = 0
+        self.object_radius = 8 if self.stress else 20
+
+        # Score
+        self.missed = 0
+        self.max_missed = float("inf") if self.stress else max_missed
+
+        # Pre-rendered object sprite, blitted in one batch per frame
+        r = self.object_radius
+        self.object_sprite = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+        pygame.draw.circle(self.object_sprite, (200, 0, 0), (r, r), r)
+
+    def gauges(self):
+        return {"objects": len(self.obj_x)}
+
+    # ------------------------------
+    # Helper functions
+    # ------------------------------
+    def spawn_objects(self, count, speed_min, speed_max):
+        r = self.object_radius
+        self.obj_x = np.concatenate([self.obj_x, np.random.randint(r, self.width - r, count)])
+        self.obj_y = np.concatenate([self.obj_y, np.zeros(count)])
+        self.obj_vy = np.concatenate([self.obj_vy, np.random.uniform(speed_min, speed_max, count)])
+
+    def step_objects(self, paddles):
+        """Move objects one frame with swept collision against the moving paddles.
+
+        paddles: (old x, new x) per paddle. An object is caught if its bottom
+        edge passes through the paddle's vertical extent during the frame and,
+        at that moment, its center is over the paddle (paddle x interpolated
+        between its old and new position). Fast objects can no longer skip
+        over the paddle. Returns ([caught per paddle], fell); an object over
+        two paddles counts for the first.
+        """
+        player_y = self.player_y
+        bottom0 = self.obj_y + self.object_radius
+        bottom1 = bottom0 + self.obj_vy
+        crossing = (bottom0 < player_y + player_h) & (bottom1 >= player_y)
+        t = np.clip((player_y - bottom0) / self.obj_vy, 0, 1)
+        caught = np.zeros(len(self.obj_x), dtype=bool)
+        counts = []
+        for paddle_x0, paddle_x1 in paddles:
+            paddle_at_t = paddle_x0 + (paddle_x1 - paddle_x0) * t
+            mine = crossing & ~caught & (self.obj_x > paddle_at_t) & (self.obj_x < paddle_at_t + player_w)
+            caught |= mine
+            counts.append(int(mine.sum()))
+
+        obj_y = self.obj_y + self.obj_vy
+        fell = ~caught & (obj_y > self.height)
+        keep = ~(caught | fell)
+        self.obj_x, self.obj_y, self.obj_vy = self.obj_x[keep], obj_y[keep], self.obj_vy[keep]
+        return counts, int(fell.sum())
+
+    def steer(self, paddle, hand_landmarks, w, h):
+        # one tracked hand -> one paddle
         index_tip = hand_landmarks.landmark[8]
-        middle_tip = hand_landmarks.landmark[12]
-        wrist = hand_landmarks.landmark[0]
 
         # Map hand x-position to player movement
-        hand_x = int(index_tip.x * WIDTH)
+        hand_x = int(index_tip.x * self.width)
 
         # Optional: pinch to speed up
         thumb_tip = hand_landmarks.landmark[4]
@@ -98,43 +140,117 @@ while running:
         pinch_distance = ((index_tip.x * w - thumb_x) ** 2 + (index_tip.y * h - thumb_y) ** 2) ** 0.5
         speed_multiplier = 2 if pinch_distance < 40 else 1
 
-        if prev_x is not None:
-            dx = hand_x - prev_x
-            player_x += int(dx * speed_multiplier)
-        prev_x = hand_x
-
-    # Keep player inside screen
-    if player_x < 0: player_x = 0
-    if player_x > WIDTH - player_w: player_x = WIDTH - player_w
-
-    # Spawn objects
-    spawn_timer += 1
-    if spawn_timer >= spawn_interval:
-        spawn_timer = 0
-        obj_x = random.randint(object_radius, WIDTH - object_radius)
-        objects.append([obj_x, 0])
-
-    # Move objects
-    for obj in objects[:]:
-        obj[1] += object_speed
-        # Check collision with player
-        if player_y < obj[1] + object_radius < player_y + player_h and player_x < obj[0] < player_x + player_w:
-            score += 1
-            objects.remove(obj)
-        elif obj[1] > HEIGHT:
-            missed += 1
-            objects.remove(obj)
-
-    draw_game()
-
-    # Quit events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    if missed >= max_missed:
-        running = False
-
-pygame.quit()
-cap.release()
-cv2.destroyAllWindows()
+        if paddle["hand_x"] is not None:
+            dx = hand_x - paddle["hand_x"]
+            paddle["x"] += int(dx * speed_multiplier)
+        paddle["hand_x"] = hand_x
+
+    def on_frame(self, frame, results):
+        self.clock.tick()
+        if results is not None and results.multi_hand_landmarks:
+            h, w, c = frame.shape
+            if self.assigner is not None:
+                # same player keeps the same hand (and paddle) across frames
+                hands = self.assigner.assign_results(results)
+            else:
+                hands = results.multi_hand_landmarks[:1]
+            for paddle, hand_landmarks in zip(self.paddles, hands):
+                if hand_landmarks is not None:
+                    self.steer(paddle, hand_landmarks, w, h)
+
+        # Keep players inside screen
+        for paddle in self.paddles:
+            paddle["x"] = max(0, min(self.width - player_w, paddle["x"]))
+
+        # Spawn objects
+        if self.stress:
+            self.spawn_objects(self.spawn_per_frame, self.min_speed, self.max_speed)
+        else:
+            self.spawn_timer += 1
+            if self.spawn_timer >= spawn_interval:
+                self.spawn_timer = 0
+                self.spawn_objects(1, object_speed, object_speed)
+
+        if any(paddle["x"] != paddle["last_x"] for paddle in self.paddles):
+            self.probe.output("paddle")
+
+        # Move objects (swept against where the paddles were and are now)
+        caught, fell = self.step_objects([(paddle["last_x"], paddle["x"]) for paddle in self.paddles])
+        for paddle, n in zip(self.paddles, caught):
+            paddle["score"] += n
+            paddle["last_x"] = paddle["x"]
+        self.missed += fell
+
+        if self.missed >= self.max_missed:
+            return False
+
+    def draw(self):
+        win = self.screen
+        r = self.object_radius
+        win.fill((30, 30, 30))
+        # Draw players
+        for paddle, color in zip(self.paddles, player_colors):
+            pygame.draw.rect(win, color, (paddle["x"], self.player_y, player_w, player_h))
+        # Draw objects
+        if len(self.obj_x):
+            corners = np.stack([self.obj_x - r, self.obj_y - r], axis=1).astype(int).tolist()
+            win.blits([(self.object_sprite, pos) for pos in corners], doreturn=False)
+        # Draw score (cached, only re-rendered when it changes)
+        self.hud.set("score", tuple(paddle["score"] for paddle in self.paddles) + (self.missed,))
+        if self.stress:
+            self.hud.set("stress", (len(self.obj_x), round(self.clock.get_fps())))
+        self.hud.draw(win)
+
+
+def create_demo(**options):
+    return CatchDemo(**options)
+
+
+if __name__ == "__main__":
+    # --stress spawns objects en masse at high speed (tunnelling / frame budget
+    # checks on big displays), e.g.: python catch_game.py --stress --fullscreen
+    parser = argparse.ArgumentParser(description="Catch the Objects")
+    parser.add_argument("--stress", action="store_true", help="high-density stress mode")
+    parser.add_argument("--spawn-per-frame", type=int, default=40, help="objects spawned per frame in stress mode")
+    parser.add_argument("--min-speed", type=float, default=15, help="stress mode min fall speed (px/frame)")
+    parser.add_argument("--max-speed", type=float, default=60, help="stress mode max fall speed (px/frame)")
+    parser.add_argument("--fullscreen", action="store_true")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1, help="2: a paddle per tracked hand")
+    add_input_args(parser)
+    parser.add_argument("--profile", type=int, metavar="FRAMES",
+                        help="profile FRAMES frames on F9 or SIGUSR1, written to profiles/")
+    parser.add_argument("--memwatch", type=float, metavar="SECONDS",
+                        help="log memory, GC and object gauges every SECONDS to memwatch.log")
+    args = parser.parse_args()
+
+    demo = create_demo(stress=args.stress, spawn_per_frame=args.spawn_per_frame,
+                       min_speed=args.min_speed, max_speed=args.max_speed, players=args.players)
+    cap, hands = open_input(demo.tracker, service=args.service, govern=args.govern,
+                            backend=args.backend)
+
+    # ------------------------------
+    # Setup Pygame
+    # ------------------------------
+    pygame.init()
+    if args.fullscreen:
+        win = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        win = pygame.display.set_mode((800, 600))
+    pygame.display.set_caption("Catch the Objects")
+
+    probe = LatencyProbe() if args.latency else None
+    if args.profile:
+        probe = FrameProfiler(probe, args.profile, demo)
+    watch = MemoryWatch(args.memwatch).start() if args.memwatch else None
+    try:
+        run_pygame(demo, cap, hands, win, fps=60, probe=probe, watch=watch)
+    finally:
+        if probe is not None:
+            # no-op unless run_pygame died before finishing it
+            probe.finish()
+    if args.latency:
+        print(probe.inner.report() if args.profile else probe.report())
+    if watch:
+        watch.stop()
+    pygame.quit()
+    cv2.destroyAllWindows()
@@ -0,0 +1,255 @@
+import time
+import pygame
+from latency import NULL_PROBE
+from memwatch import NULL_WATCH
+from capture import Camera
+from overlay import LandmarkOverlay
+from resolution import InferenceView, saved_capture_size, saved_inference_scale
+
+# ------------------------------
+# Demo plugin interface
+# ------------------------------
+# Every app (drawing, air mouse, catch game, space shooter, eye tracker) is a
+# Demo: it turns camera frames into tracker input in prepare(), reacts to the
+# tracker results in on_frame(), and draws. The scripts run their demo
+# standalone with run_cv2()/run_pygame(); launcher.py hosts them all in one
+# process on a camera and trackers that stay warm between switches.
+
+# (kind, params) so equal configs share one warm instance in the launcher
+HANDS_DEFAULT = ("hands", (("max_num_hands", 1), ("min_detection_confidence", 0.6),
+                           ("min_tracking_confidence", 0.6)))
+
+
+BACKENDS = ("solutions", "tasks")
+
+
+def hands_config(max_hands, base=HANDS_DEFAULT):
+    # the same hands config tracking up to max_hands hands
+    kind, params = base
+    return kind, tuple((k, max_hands if k == "max_num_hands" else v) for k, v in params)
+
+
+def make_tracker(config, backend="solutions"):
+    """Tracker for a (kind, params) config: legacy mp.solutions, or the
+    Tasks live-stream landmarkers behind the same interface (tasks_backend.py)."""
+    if backend == "tasks":
+        from tasks_backend import TasksTracker
+        return TasksTracker(config)
+    import mediapipe as mp
+    kind, params = config
+    if kind == "hands":
+        return mp.solutions.hands.Hands(**dict(params))
+    if kind == "face_mesh":
+        return mp.solutions.face_mesh.FaceMesh(**dict(params))
+    raise ValueError(f"unknown tracker kind: {kind}")
+
+
+def build_tracker(config, govern=None, backend="solutions"):
+    # govern: target loop rate for a TrackerGovernor around the model (governor.py)
+    if govern:
+        from governor import TrackerGovernor
+        return TrackerGovernor(config, govern, backend=backend)
+    return make_tracker(config, backend)
+
+
+def report_wait(tracker, seconds):
+    # time the loop spent blocked (clock wait, camera read) before this frame's
+    # process(); a TrackerGovernor leaves it out of the busy time it governs
+    blocked = getattr(tracker, "blocked", None)
+    if blocked is not None:
+        blocked(seconds)
+
+
+def open_input(tracker_config, service=False, mirror=True, govern=None, backend="solutions"):
+    """(cap, tracker) for a standalone script: camera + model, or the service."""
+    if service:
+        from landmark_service import ServiceClient
+        # the service owns the camera; one client stands in for cap and tracker
+        client = ServiceClient(mirror=mirror)
+        return client, client
+    return open_camera(), build_tracker(tracker_config, govern, backend)
+
+
+def add_input_args(parser, service=True):
+    # command-line options shared by the scripts and the launcher
+    if service:
+        parser.add_argument("--service", action="store_true", help="read landmarks from landmark_service.py instead of the camera")
+    parser.add_argument("--backend", choices=BACKENDS, default="solutions",
+                        help="tracker API: legacy mp.solutions or Tasks live-stream (tasks_backend.py)")
+    parser.add_argument("--govern", type=float, metavar="FPS", help="adapt model complexity/thresholds to hold this loop rate")
+    parser.add_argument("--latency", action="store_true", help="measure motion-to-photon latency and print it on exit")
+
+
+def open_camera(index=0, size=None):
+    # MJPG / fps / 1-frame buffer negotiated by capture.py; capture size from
+    # the resolution tuner (resolution.py) unless given, else the device default
+    cam = Camera(index, size or saved_capture_size())
+    print(cam.report())
+    return cam
+
+
+class Demo:
+    title = "Demo"
+    tracker = HANDS_DEFAULT
+    mirror = True  # flip frames horizontally before tracking
+    probe = NULL_PROBE  # latency probe; demos report outputs with probe.output()
+    # tracker input scale; None uses the tuned one from resolution.json (1.0 if
+    # untuned). Landmarks are normalized, so lm.x * frame width stays exact.
+    inference_scale = None
+    view = None
+    # whether anything the demo draws on camera frames can be seen (set by the
+    # runner: window not minimized/hidden)
+    preview_visible = True
+
+    def prepare(self, frame):
+        """Camera frame -> (frame used by the demo, RGB image for the tracker)."""
+        import cv2
+        if self.mirror:
+            frame = cv2.flip(frame, 1)
+        if self.view is None:
+            scale = self.inference_scale
+            self.view = InferenceView(saved_inference_scale() if scale is None else scale)
+        return frame, cv2.cvtColor(self.view.image(frame), cv2.COLOR_BGR2RGB)
+
+    def start(self, screen):
+        self.screen = screen
+
+    def on_frame(self, frame, results):
+        """Landmark callback, once per camera frame. Return False to end the demo."""
+
+    def on_event(self, event):
+        """pygame event. Return False to end the demo."""
+
+    def draw(self):
+        """Draw onto self.screen; the host flips the display."""
+
+    def stop(self):
+        pass
+
+    def gauges(self):
+        """{name: count} logged by the memory watch (memwatch.py)."""
+        return {}
+
+
+class CameraDemo(Demo):
+    # demos whose output is the annotated camera frame in self.output
+    output = None
+    overlay_hz = 15  # landmark overlay refresh rate (overlay.py)
+
+    def start(self, screen):
+        super().start(screen)
+        self.overlay = LandmarkOverlay(self.overlay_hz)
+
+    def draw(self):
+        if self.output is not None:
+            blit_bgr(self.screen, self.output)
+
+
+def blit_bgr(screen, frame):
+    # BGR numpy frame -> pygame surface, scaled to fill the screen
+    import cv2
+    h, w = frame.shape[:2]
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    surf = pygame.image.frombuffer(rgb.tobytes(), (w, h), "RGB")
+    if (w, h) != screen.get_size():
+        surf = pygame.transform.scale(surf, screen.get_size())
+    screen.blit(surf, (0, 0))
+
+
+# ------------------------------
+# Standalone runners
+# ------------------------------
+# starts an on-demand profile when the probe is a profiler.FrameProfiler
+PROFILE_KEY = pygame.K_F9
+
+def run_cv2(demo, cap, tracker, window, probe=None):
+    """OpenCV-window loop for CameraDemo scripts; ESC quits."""
+    import cv2
+    demo.probe = probe = probe or NULL_PROBE
+    if probe.enabled:
+        probe.source = cap
+    demo.start(None)
+    while True:
+        probe.begin()
+        t0 = time.perf_counter()
+        success, frame = cap.read()
+        report_wait(tracker, time.perf_counter() - t0)
+        probe.stamp("capture")
+        if not success:
+            # end of a recording; a dropped frame (or a silent landmark
+            # service) just keeps the window responsive
+            if not cap.isOpened():
+                break
+            if cv2.waitKey(1) & 0xFF == 27:
+                break
+            continue
+        frame, rgb = demo.prepare(frame)
+        probe.stamp("prepare")
+        results = tracker.process(rgb)
+        probe.stamp("inference")
+        probe.track(results)
+        if demo.on_frame(frame, results) is False:
+            break
+        probe.stamp("logic")
+        cv2.imshow(window, demo.output)
+        key = cv2.waitKey(1)
+        demo.preview_visible = cv2.getWindowProperty(window, cv2.WND_PROP_VISIBLE) >= 1
+        probe.present()
+        if key & 0xFF == 27:  # ESC to quit
+            break
+    # writes a profile still in progress (profiler.FrameProfiler)
+    probe.finish()
+    demo.stop()
+    cap.release()
+    cv2.destroyAllWindows()
+
+
+def run_pygame(demo, cap, tracker, screen, fps=60, probe=None, watch=None):
+    """pygame loop for game demos; a dropped camera frame still ticks/draws.
+
+    watch: a started memwatch.MemoryWatch, sampled from the loop.
+    """
+    demo.probe = probe = probe or NULL_PROBE
+    if probe.enabled:
+        probe.source = cap
+    watch = watch or NULL_WATCH
+    watch.attach(demo)
+    clock = pygame.time.Clock()
+    demo.start(screen)
+    running = True
+    while running:
+        t0 = time.perf_counter()
+        clock.tick(fps)
+        probe.begin()
+        success, frame = cap.read()
+        report_wait(tracker, time.perf_counter() - t0)
+        probe.stamp("capture")
+        if success:
+            frame, rgb = demo.prepare(frame)
+            probe.stamp("prepare")
+            results = tracker.process(rgb)
+            probe.stamp("inference")
+            probe.track(results)
+        else:
+            frame = results = None
+            # end of a recording / replay rather than a dropped frame
+            if not cap.isOpened():
+                break
+        if demo.on_frame(frame, results) is False:
+            running = False
+        probe.stamp("logic")
+        demo.draw()
+        probe.stamp("draw")
+        pygame.display.update()
+        probe.present()
+        demo.preview_visible = pygame.display.get_active()
+        watch.tick()
+        for event in pygame.event.get():
+            if event.type == pygame.KEYDOWN and event.key == PROFILE_KEY:
+                probe.request()
+            if event.type == pygame.QUIT or demo.on_event(event) is False:
+                running = False
+    # writes a profile still in progress (profiler.FrameProfiler)
+    probe.finish()
+    demo.stop()
+    cap.release()
@@ -1,19 +1,10 @@
-import cv2
-import mediapipe as mp
 import pygame
 import numpy as np
+import argparse
+from gaze_calibration import GazeModel, CalibrationSession, gaze_features
+from demo_runtime import add_input_args, Demo, open_input, run_pygame
+from latency import LatencyProbe
 
-pygame.init()
-screen_width, screen_height = 800, 600  # start windowed
-screen = pygame.display.set_mode((screen_width, screen_height))
-pygame.display.set_caption("Eye Tracker Debug")
-
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(max_num_faces=1)
-
-cap = cv2.VideoCapture(0)
-
-prev_dot = np.array([screen_width//2, screen_height//2], dtype=float)
 SMOOTH_ALPHA = 0.5
 
 def get_iris_position(landmarks, w, h):
@@ -21,39 +12,108 @@ def get_iris_position(landmarks, w, h):
         # Using landmark 468 for right iris center
         iris = landmarks[468]
         return np.array([iris.x * w, iris.y * h])
-    except:
+    except IndexError:
         return None
 
-running = True
-while running:
-    ret, frame = cap.read()
-    if not ret:
-        break
-
-    frame = cv2.flip(frame, 1)
-    h, w, _ = frame.shape
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = face_mesh.process(rgb_frame)
-
-    iris_pos = None
-    if results.multi_face_landmarks:
-        lm = results.multi_face_landmarks[0].landmark
-        iris_pos = get_iris_position(lm, w, h)
-
-    if iris_pos is not None:
-        # Smooth movement
-        prev_dot = SMOOTH_ALPHA * prev_dot + (1 - SMOOTH_ALPHA) * iris_pos
-    dot = prev_dot
-
-    screen.fill((0, 0, 0))
-    pygame.draw.circle(screen, (255, 0, 0), dot.astype(int), 20)
-    pygame.display.flip()
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN and event.key == pygame.K_q:
-            running = False
-
-cap.release()
-pygame.quit()
+
+class EyeDemo(Demo):
+    title = "Eye Tracker Debug"
+    # refine_landmarks adds the iris points (468+)
+    tracker = ("face_mesh", (("max_num_faces", 1), ("refine_landmarks", True)))
+
+    def start(self, screen):
+        super().start(screen)
+        screen_width, screen_height = screen.get_size()
+        self.font = pygame.font.SysFont("Arial", 24)
+        self.prev_dot = np.array([screen_width//2, screen_height//2], dtype=float)
+        self.screen_size = np.array([screen_width, screen_height], dtype=float)
+        # Cached calibration from a previous run (if any)
+        self.model = GazeModel.load() or GazeModel()
+        self.calibration = None
+
+    def on_frame(self, frame, results):
+        if frame is None:
+            return
+        h, w, _ = frame.shape
+        model, calibration = self.model, self.calibration
+
+        iris_pos = None
+        features = None
+        if results.multi_face_landmarks:
+            lm = results.multi_face_landmarks[0].landmark
+            iris_pos = get_iris_position(lm, w, h)
+            features = gaze_features(lm)
+
+        if calibration is not None:
+            calibration.update(features)
+            if calibration.done:
+                model.save()
+                self.calibration = calibration = None
+
+        if calibration is None:
+            target = None
+            if model.ready and features is not None:
+                # calibrated: features -> normalized screen coords
+                target = np.clip(model.predict(features), 0, 1) * self.screen_size
+            elif iris_pos is not None:
+                # uncalibrated fallback: raw camera-space iris position
+                target = iris_pos / (w, h) * self.screen_size
+            if target is not None:
+                # Smooth movement
+                dot = SMOOTH_ALPHA * self.prev_dot + (1 - SMOOTH_ALPHA) * target
+                if np.abs(dot - self.prev_dot).max() >= 1:
+                    self.probe.output("gaze")
+                self.prev_dot = dot
+
+    def draw(self):
+        screen, calibration = self.screen, self.calibration
+        screen.fill((0, 0, 0))
+        if calibration is not None:
+            tx, ty = (np.array(calibration.target) * self.screen_size).astype(int)
+            collecting = calibration.frame > calibration.settle_frames
+            pygame.draw.circle(screen, (0, 255, 0) if collecting else (255, 255, 255), (tx, ty), 15)
+            pygame.draw.circle(screen, (0, 0, 0), (tx, ty), 4)
+            label = f"Look at the dot ({calibration.index + 1}/{len(calibration.targets)})"
+            screen.blit(self.font.render(label, True, (255, 255, 255)), (10, 10))
+        else:
+            pygame.draw.circle(screen, (255, 0, 0), self.prev_dot.astype(int), 20)
+            status = "calibrated" if self.model.ready else "uncalibrated"
+            hint = f"{status} - C: calibrate  R: refine  Q: quit"
+            screen.blit(self.font.render(hint, True, (120, 120, 120)), (10, 10))
+
+    def on_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_q:
+            return False
+        elif event.key == pygame.K_c:
+            # full calibration from scratch
+            self.model.reset()
+            self.calibration = CalibrationSession(self.model)
+        elif event.key == pygame.K_r:
+            # incremental: add new samples on top of the existing fit
+            self.calibration = CalibrationSession(self.model)
+
+
+def create_demo():
+    return EyeDemo()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Eye tracker")
+    add_input_args(parser, service=False)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen_width, screen_height = 800, 600  # start windowed
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption("Eye Tracker Debug")
+
+    demo = create_demo()
+    cap, face_mesh = open_input(demo.tracker, govern=args.govern, backend=args.backend)
+    # no fps cap: paced by the camera like before
+    probe = LatencyProbe() if args.latency else None
+    run_pygame(demo, cap, face_mesh, screen, fps=0, probe=probe)
+    if probe:
+        print(probe.report())
+    pygame.quit()
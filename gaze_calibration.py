@@ -0,0 +1,175 @@
+import os
+import itertools
+import numpy as np
+
+# ------------------------------
+# Gaze calibration
+# ------------------------------
+# Maps eye/head features to normalized screen coords (0..1) with a polynomial
+# fitted by least squares. The fit keeps its normal equations (A^T A, A^T Y)
+# so new samples can be folded in without re-solving over old samples.
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gaze_calibration.npz")
+
+# FaceMesh landmark ids (refine_landmarks=True is needed for the iris points)
+RIGHT_IRIS = 468
+RIGHT_EYE_OUTER = 33
+RIGHT_EYE_INNER = 133
+RIGHT_EYE_TOP = 159
+RIGHT_EYE_BOTTOM = 145
+NOSE_TIP = 1
+FACE_LEFT = 234
+FACE_RIGHT = 454
+
+N_FEATURES = 4
+
+
+def gaze_features(landmarks):
+    """Iris offset inside the eye plus a head-pose proxy, or None if missing."""
+    try:
+        iris = landmarks[RIGHT_IRIS]
+        outer = landmarks[RIGHT_EYE_OUTER]
+        inner = landmarks[RIGHT_EYE_INNER]
+        top = landmarks[RIGHT_EYE_TOP]
+        bottom = landmarks[RIGHT_EYE_BOTTOM]
+        nose = landmarks[NOSE_TIP]
+        left = landmarks[FACE_LEFT]
+        right = landmarks[FACE_RIGHT]
+    except IndexError:
+        return None
+
+    eye_w = inner.x - outer.x
+    eye_h = bottom.y - top.y
+    face_w = right.x - left.x
+    if abs(eye_w) < 1e-6 or abs(eye_h) < 1e-6 or abs(face_w) < 1e-6:
+        return None
+
+    # iris position inside the eye box (roughly 0..1 on each axis)
+    ex = (iris.x - outer.x) / eye_w
+    ey = (iris.y - top.y) / eye_h
+    # head yaw/pitch proxy: nose relative to the face edges
+    hx = (nose.x - left.x) / face_w
+    hy = nose.y
+    return np.array([ex, ey, hx, hy])
+
+
+def poly_powers(n_features, degree):
+    # exponent matrix, one row per monomial (constant term first)
+    rows = []
+    for d in range(degree + 1):
+        for combo in itertools.combinations_with_replacement(range(n_features), d):
+            row = [0] * n_features
+            for i in combo:
+                row[i] += 1
+            rows.append(row)
+    return np.array(rows, dtype=float)
+
+
+class GazeModel:
+    def __init__(self, degree=2, ridge=1e-3):
+        self.degree = degree
+        self.ridge = ridge
+        self.powers = poly_powers(N_FEATURES, degree)
+        k = len(self.powers)
+        self.ata = np.zeros((k, k))
+        self.aty = np.zeros((k, 2))
+        self.n_samples = 0
+        self.coef = None
+
+    def design(self, features):
+        # (n, f) features -> (n, k) monomials in one broadcasted power/prod
+        features = np.atleast_2d(features)
+        return np.prod(features[:, None, :] ** self.powers[None, :, :], axis=2)
+
+    def reset(self):
+        self.ata[:] = 0
+        self.aty[:] = 0
+        self.n_samples = 0
+        self.coef = None
+
+    def add_samples(self, features, targets, weight=1.0):
+        """Fold samples into the normal equations and re-solve (k x k only)."""
+        a = self.design(features)
+        y = np.atleast_2d(targets)
+        self.ata += weight * (a.T @ a)
+        self.aty += weight * (a.T @ y)
+        self.n_samples += len(a)
+        self.solve()
+
+    def solve(self):
+        if self.n_samples < len(self.powers):
+            return
+        reg = self.ridge * np.eye(len(self.powers))
+        reg[0, 0] = 0  # don't shrink the offset
+        self.coef = np.linalg.solve(self.ata + reg, self.aty)
+
+    @property
+    def ready(self):
+        return self.coef is not None
+
+    def predict(self, features):
+        """Normalized screen coords for one (f,) or many (n, f) feature rows."""
+        single = np.ndim(features) == 1
+        out = self.design(features) @ self.coef
+        return out[0] if single else out
+
+    def save(self, path=CACHE_PATH):
+        np.savez(path, degree=self.degree, ridge=self.ridge, ata=self.ata,
+                 aty=self.aty, n_samples=self.n_samples)
+
+    @classmethod
+    def load(cls, path=CACHE_PATH):
+        if not os.path.exists(path):
+            return None
+        data = np.load(path)
+        model = cls(int(data["degree"]), float(data["ridge"]))
+        if data["ata"].shape != model.ata.shape:
+            return None
+        model.ata = data["ata"]
+        model.aty = data["aty"]
+        model.n_samples = int(data["n_samples"])
+        model.solve()
+        return model
+
+
+# ------------------------------
+# Calibration session
+# ------------------------------
+def target_grid(cols=3, rows=3, margin=0.1):
+    xs = np.linspace(margin, 1 - margin, cols)
+    ys = np.linspace(margin, 1 - margin, rows)
+    return [(x, y) for y in ys for x in xs]
+
+
+class CalibrationSession:
+    """Steps through on-screen targets, collecting feature samples at each."""
+
+    def __init__(self, model, targets=None, settle_frames=20, collect_frames=30):
+        self.model = model
+        self.targets = targets if targets is not None else target_grid()
+        self.settle_frames = settle_frames
+        self.collect_frames = collect_frames
+        self.index = 0
+        self.frame = 0
+        self.samples = []
+        self.done = False
+
+    @property
+    def target(self):
+        return self.targets[self.index]
+
+    def update(self, features):
+        if self.done:
+            return
+        self.frame += 1
+        if self.frame > self.settle_frames and features is not None:
+            self.samples.append(features)
+        if self.frame >= self.settle_frames + self.collect_frames:
+            if self.samples:
+                feats = np.array(self.samples)
+                self.model.add_samples(feats, np.tile(self.target, (len(feats), 1)))
+            self.samples = []
+            self.frame = 0
+            self.index += 1
+            if self.index >= len(self.targets):
+                self.done = True
@@ -0,0 +1,144 @@
+import math
+import time
+import numpy as np
+
+# ------------------------------
+# Temporal gestures
+# ------------------------------
+# Keeps the last `length` landmark frames in a fixed NumPy ring buffer and
+# recognizes motion gestures of one landmark (index tip by default):
+#   swipe_<dir>   sustained travel along one axis within `swipe_time`
+#   flick_<dir>   short burst of high speed
+#   circle_cw/ccw roughly constant radius, about one full turn
+#   hold          no movement for `hold_time` (once per hold)
+# Every feature reads a fixed number of frames, so update() costs the same
+# no matter how long the hand has been tracked. Coordinates are normalized
+# (0-1, y down); speeds are in normalized units per second.
+
+DIRECTIONS = {(1, 0): "right", (-1, 0): "left", (0, 1): "down", (0, -1): "up"}
+
+
+def direction(dx, dy):
+    if abs(dx) >= abs(dy):
+        return DIRECTIONS[(1 if dx > 0 else -1, 0)]
+    return DIRECTIONS[(0, 1 if dy > 0 else -1)]
+
+
+class GestureTracker:
+    def __init__(self, length=32, point=8, swipe_distance=0.25, swipe_time=0.35, flick_speed=3.0,
+                 circle_frames=24, circle_radius=0.04, hold_speed=0.08, hold_time=0.6, refractory=0.3):
+        self.length = length
+        self.point = point
+        self.frames = np.zeros((length, 21, 3), dtype=np.float32)
+        self.times = np.zeros(length)
+        self.head = 0  # next write slot
+        self.count = 0
+        self.swipe_distance = swipe_distance
+        self.swipe_time = swipe_time
+        self.flick_speed = flick_speed
+        self.circle_frames = min(circle_frames, length)
+        self.circle_radius = circle_radius
+        self.hold_speed = hold_speed
+        self.hold_time = hold_time
+        self.refractory = refractory
+        self.still_since = None
+        self.held = False
+        self.quiet_until = 0.0
+
+    def reset(self):
+        # hand lost: gestures never span a gap in tracking
+        self.count = 0
+        self.still_since = None
+        self.held = False
+
+    def _index(self, back):
+        # ring slot of the frame `back` frames before the newest (0 = newest)
+        return (self.head - 1 - back) % self.length
+
+    def recent(self, n):
+        """Last n frames (oldest first) as (n, 21, 3) plus their times."""
+        n = min(n, self.count)
+        idx = (self.head - n + np.arange(n)) % self.length
+        return self.frames[idx], self.times[idx]
+
+    def velocity(self, span=3):
+        # (vx, vy) of the tracked point over the last `span` frames
+        span = min(span, self.count - 1)
+        if span < 1:
+            return 0.0, 0.0
+        a, b = self._index(span), self._index(0)
+        dt = self.times[b] - self.times[a]
+        if dt <= 0:
+            return 0.0, 0.0
+        d = self.frames[b, self.point, :2] - self.frames[a, self.point, :2]
+        return float(d[0] / dt), float(d[1] / dt)
+
+    def update(self, points, t=None):
+        """Add one (21, 3) landmark frame; returns the gestures it completes."""
+        t = time.perf_counter() if t is None else t
+        self.frames[self.head] = points
+        self.times[self.head] = t
+        self.head = (self.head + 1) % self.length
+        self.count = min(self.count + 1, self.length)
+
+        events = []
+        vx, vy = self.velocity()
+        speed = math.hypot(vx, vy)
+
+        # hold: tracked incrementally, one event per still period
+        if speed < self.hold_speed:
+            if self.still_since is None:
+                self.still_since = t
+            elif not self.held and t - self.still_since >= self.hold_time:
+                self.held = True
+                events.append("hold")
+        else:
+            self.still_since = None
+            self.held = False
+
+        if t < self.quiet_until or self.count < 3:
+            return events
+        motion = self._flick(speed, vx, vy) or self._swipe(t) or self._circle()
+        if motion:
+            events.append(motion)
+            # one motion gesture per movement; history restarts after it
+            self.quiet_until = t + self.refractory
+            self.count = 1
+        return events
+
+    def _flick(self, speed, vx, vy):
+        if speed >= self.flick_speed:
+            return "flick_" + direction(vx, vy)
+
+    def _swipe(self, t):
+        # oldest frame still inside the swipe window, by binary search over a
+        # fixed-size window (times are increasing)
+        frames, times = self.recent(self.length)
+        start = int(np.searchsorted(times, t - self.swipe_time))
+        if start >= len(times) - 2:
+            return None
+        path = frames[start:, self.point, :2]
+        dx, dy = (float(v) for v in path[-1] - path[0])
+        along, across = max(abs(dx), abs(dy)), min(abs(dx), abs(dy))
+        if along < self.swipe_distance or across >= along * 0.5:
+            return None
+        # straight: an arc of a big circle covers the distance too
+        length = np.hypot(*np.diff(path, axis=0).T).sum()
+        if math.hypot(dx, dy) >= 0.8 * length:
+            return "swipe_" + direction(dx, dy)
+
+    def _circle(self):
+        if self.count < self.circle_frames:
+            return None
+        frames, _ = self.recent(self.circle_frames)
+        path = frames[:, self.point, :2]
+        rel = path - path.mean(axis=0)
+        radius = np.hypot(rel[:, 0], rel[:, 1])
+        mean_r = radius.mean()
+        if mean_r < self.circle_radius or radius.std() > 0.35 * mean_r:
+            return None
+        angles = np.unwrap(np.arctan2(rel[:, 1], rel[:, 0]))
+        turned = angles[-1] - angles[0]
+        if abs(turned) >= 1.8 * math.pi:
+            # y grows downwards, so a positive angle is clockwise on screen
+            return "circle_cw" if turned > 0 else "circle_ccw"
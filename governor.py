@@ -0,0 +1,207 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from demo_runtime import make_tracker
+
+# ------------------------------
+# Runtime tracker governor
+# ------------------------------
+# Wraps a tracker (same process() interface) and adapts it while running:
+#   - busy time over budget  -> lite model (hands model_complexity=0)
+#   - plenty of headroom     -> back to the full model
+#   - hand keeps dropping    -> lower detection/tracking thresholds
+#   - steady confident hand  -> restore the configured thresholds
+# Replacement models are built and warmed on a worker thread while the
+# current one keeps serving frames, then swapped in between two frames.
+# Built instances are kept, so switching back is immediate. Every switch is
+# printed with its reason and kept in .switches.
+#
+# Busy time is the time between two process() calls minus what the loop
+# spent blocked (clock wait, camera read), reported by the runner through
+# blocked(). A camera-paced loop is never faster than the camera, whatever
+# the model; only the work a switch can change is compared to the budget.
+
+# model knob per tracker kind, cheapest first (FaceMesh has none that keeps
+# the iris landmarks, and the Tasks models come in one complexity, so those
+# only get threshold changes)
+COMPLEXITY = {"hands": [("lite", {"model_complexity": 0}), ("full", {"model_complexity": 1})],
+              "face_mesh": [("full", {})]}
+THRESHOLD_STEP = 0.1
+THRESHOLD_FLOOR = 0.3
+
+
+def tracking_quality(results):
+    # (present, confidence) of the first hand/face in a results object
+    hands = getattr(results, "multi_hand_landmarks", None)
+    if hands:
+        handedness = getattr(results, "multi_handedness", None)
+        return True, handedness[0].classification[0].score if handedness else 1.0
+    if getattr(results, "multi_face_landmarks", None):
+        return True, 1.0
+    return False, 0.0
+
+
+class TrackerGovernor:
+    def __init__(self, config, target_fps=30, window=30, cooldown_windows=2, backend="solutions",
+                 factory=None, log=print):
+        kind, params = config
+        self.kind = kind
+        self.base = dict(params)
+        self.levels = COMPLEXITY[kind] if backend == "solutions" else [("full", {})]
+        factory = factory or functools.partial(make_tracker, backend=backend)
+        self.budget = 1.0 / target_fps
+        self.window = window
+        self.cooldown_windows = cooldown_windows
+        self.factory = factory
+        self.log = log
+        self.level = len(self.levels) - 1
+        self.offset = 0.0  # how far thresholds are lowered from the configured ones
+        self.instances = {}
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="governor")
+        self.pending = None  # (config, future, reason, label, level, offset)
+        self.cost = {}  # level -> mean inference seconds, measured while on it
+        self.switches = []  # (time, from, to, reason)
+        self.config = self._config()
+        self.tracker = self.instances[self.config] = factory(self.config)
+        self.cooldown = 0
+        self._reset_window()
+        self.last_call = None
+        self.last_rgb = None
+        self.waiting = 0.0  # blocked time reported since the last process()
+
+    def _reset_window(self):
+        self.frames = 0
+        self.loop_time = 0.0
+        self.wait_time = 0.0
+        self.infer_time = 0.0
+        self.present = 0
+        self.score = 0.0
+
+    def _config(self, level=None, offset=None):
+        level = self.level if level is None else level
+        offset = self.offset if offset is None else offset
+        params = dict(self.base)
+        params.update(self.levels[level][1])
+        for key in ("min_detection_confidence", "min_tracking_confidence"):
+            if key in params:
+                params[key] = round(max(THRESHOLD_FLOOR, params[key] - offset), 2)
+        return (self.kind, tuple(sorted(params.items())))
+
+    def describe(self, level=None, offset=None):
+        level = self.level if level is None else level
+        offset = self.offset if offset is None else offset
+        params = dict(self._config(level, offset)[1])
+        det = params.get("min_detection_confidence")
+        return f"{self.levels[level][0]} det {det}" if det is not None else self.levels[level][0]
+
+    def blocked(self, seconds):
+        # runner: time spent waiting on the clock / camera since the last frame
+        self.waiting += seconds
+
+    def process(self, rgb):
+        now = time.perf_counter()
+        if self.last_call is not None:
+            self.loop_time += now - self.last_call
+            self.wait_time += min(self.waiting, now - self.last_call)
+            self.frames += 1
+        self.waiting = 0.0
+        self.last_call = now
+
+        if self.pending is not None and self.pending[1].done():
+            self._swap()
+
+        t0 = time.perf_counter()
+        results = self.tracker.process(rgb)
+        self.infer_time += time.perf_counter() - t0
+        self.last_rgb = rgb
+        present, score = tracking_quality(results)
+        if present:
+            self.present += 1
+            self.score += score
+        if self.frames >= self.window:
+            self._evaluate()
+        return results
+
+    def _evaluate(self):
+        busy = (self.loop_time - self.wait_time) / self.frames
+        presence = self.present / self.frames
+        score = self.score / self.present if self.present else 0.0
+        self.cost[self.level] = self.infer_time / self.frames
+        self._reset_window()
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return
+        if self.pending is not None:
+            return
+        level, offset = self.level, self.offset
+        if busy > self.budget * 1.1 and level > 0:
+            level -= 1
+            reason = f"busy {busy * 1000:.1f} ms over {self.budget * 1000:.1f} ms budget"
+        elif level < len(self.levels) - 1 and self._predicted(busy, level + 1) < self.budget * 0.9:
+            level += 1
+            reason = (f"busy {busy * 1000:.1f} ms, {self.levels[level][0]} predicted "
+                      f"{self._predicted(busy, level) * 1000:.1f} ms within {self.budget * 1000:.1f} ms budget")
+        elif 0 < presence < 0.5 and self.base_threshold() - offset > THRESHOLD_FLOOR + 1e-9:
+            offset += THRESHOLD_STEP
+            reason = f"tracking lost: hand in {presence:.0%} of frames"
+        elif presence >= 0.9 and score >= 0.9 and offset > 0:
+            offset = max(0.0, offset - THRESHOLD_STEP)
+            reason = f"tracking steady: hand in {presence:.0%} of frames, score {score:.2f}"
+        else:
+            return
+        self._request(level, offset, reason)
+
+    def _predicted(self, busy, level):
+        # busy time with the other level's measured inference cost swapped in;
+        # a level never measured needs a wide margin instead
+        if level not in self.cost:
+            return busy / 0.6 * 0.9
+        return busy - self.cost[self.level] + self.cost[level]
+
+    def base_threshold(self):
+        return self.base.get("min_detection_confidence", THRESHOLD_FLOOR)
+
+    def _request(self, level, offset, reason):
+        config = self._config(level, offset)
+        label = self.describe(level, offset)
+        if config in self.instances:
+            self._apply(config, self.instances[config], reason, label, level, offset)
+            return
+        # build + first inference (graph warm-up) off the loop thread
+        rgb = None if self.last_rgb is None else self.last_rgb.copy()
+        future = self.pool.submit(self._build, config, rgb)
+        self.pending = (config, future, reason, label, level, offset)
+
+    def _build(self, config, rgb):
+        tracker = self.factory(config)
+        if rgb is not None:
+            tracker.process(rgb)
+        return tracker
+
+    def _swap(self):
+        config, future, reason, label, level, offset = self.pending
+        self.pending = None
+        try:
+            tracker = future.result()
+        except Exception as e:
+            self.log(f"governor: building {label} failed ({e}), staying on {self.describe()}")
+            return
+        self.instances[config] = tracker
+        self._apply(config, tracker, reason, label, level, offset)
+
+    def _apply(self, config, tracker, reason, label, level, offset):
+        previous = self.describe()
+        self.tracker = tracker
+        self.config = config
+        self.level, self.offset = level, offset
+        self.cooldown = self.cooldown_windows
+        self.switches.append((time.perf_counter(), previous, label, reason))
+        self.log(f"governor: {previous} -> {label} ({reason})")
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        if self.pending is not None and self.pending[1].done() and not self.pending[1].exception():
+            self.pending[1].result().close()
+        for tracker in self.instances.values():
+            tracker.close()
+        self.instances.clear()
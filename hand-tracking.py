@@ -1,41 +1,34 @@
 import cv2
-import mediapipe as mp
 import math
 import numpy as np
-
-# Initialize MediaPipe Hands
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-
-cap = cv2.VideoCapture(0)
-canvas = None
+import argparse
+from demo_runtime import add_input_args, CameraDemo, open_input, run_cv2
+from latency import LatencyProbe
 
 # Colors
 draw_color = (0, 0, 255)  # Red
 clear_color = (0, 0, 0)   # Black
 
-with mp_hands.Hands(
-    max_num_hands=1,  # We'll use one hand for drawing
-    min_detection_confidence=0.6,
-    min_tracking_confidence=0.6
-) as hands:
-    prev_x, prev_y = 0, 0  # Previous finger coordinates
 
-    while True:
-        success, frame = cap.read()
-        if not success:
-            break
+class DrawingDemo(CameraDemo):
+    title = "Air Drawing"
+    # default tracker: one hand for drawing, 0.6 confidence
 
-        frame = cv2.flip(frame, 1)
-        if canvas is None:
-            canvas = np.zeros_like(frame)
+    def start(self, screen):
+        super().start(screen)
+        self.canvas = None
+        self.prev_x, self.prev_y = 0, 0  # Previous finger coordinates
 
-        img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(img_rgb)
+    def on_frame(self, frame, results):
+        if frame is None:
+            return
+        if self.canvas is None or self.canvas.shape != frame.shape:
+            self.canvas = np.zeros_like(frame)
+        canvas = self.canvas
 
+        self.overlay.draw(frame, results.multi_hand_landmarks or [], self.preview_visible)
         if results.multi_hand_landmarks:
             hand_landmarks = results.multi_hand_landmarks[0]  # Only one hand
-            mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
             h, w, c = frame.shape
             thumb_tip = hand_landmarks.landmark[4]
@@ -52,12 +45,13 @@ with mp_hands.Hands(
 
             # Pinch to draw
             if distance < 40:
-                if prev_x == 0 and prev_y == 0:
-                    prev_x, prev_y = x2, y2
-                cv2.line(canvas, (prev_x, prev_y), (x2, y2), draw_color, 5)
-                prev_x, prev_y = x2, y2
+                if self.prev_x == 0 and self.prev_y == 0:
+                    self.prev_x, self.prev_y = x2, y2
+                cv2.line(canvas, (self.prev_x, self.prev_y), (x2, y2), draw_color, 5)
+                self.probe.output("stroke")
+                self.prev_x, self.prev_y = x2, y2
             else:
-                prev_x, prev_y = 0, 0
+                self.prev_x, self.prev_y = 0, 0
 
             # Fist to clear screen
             fingertips = [hand_landmarks.landmark[i] for i in [8,12,16,20]]
@@ -67,11 +61,24 @@ with mp_hands.Hands(
                 cv2.putText(frame, "CLEARED!", (50,50), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 3)
 
         # Combine camera and drawing
-        frame = cv2.addWeighted(frame, 0.5, canvas, 0.5, 0)
-        cv2.imshow("Air Drawing", frame)
+        self.output = cv2.addWeighted(frame, 0.5, canvas, 0.5, 0)
+
+
+def create_demo():
+    return DrawingDemo()
+
 
-        if cv2.waitKey(1) & 0xFF == 27:  # ESC to quit
-            break
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Air drawing")
+    add_input_args(parser)
+    parser.add_argument("--overlay-hz", type=float, default=15, help="landmark overlay refresh rate (0: every frame)")
+    args = parser.parse_args()
 
-cap.release()
-cv2.destroyAllWindows()
+    demo = create_demo()
+    demo.overlay_hz = args.overlay_hz
+    cap, hands = open_input(demo.tracker, service=args.service, govern=args.govern,
+                            backend=args.backend)
+    probe = LatencyProbe() if args.latency else None
+    run_cv2(demo, cap, hands, "Air Drawing", probe=probe)
+    if probe:
+        print(probe.report())
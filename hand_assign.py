@@ -0,0 +1,91 @@
+import itertools
+import time
+
+# ------------------------------
+# Hands -> players for two-player modes
+# ------------------------------
+# One tracker pass (max_num_hands=2) returns the hands in no particular
+# order, so each frame the hands are matched to player slots by the
+# cheapest assignment of:
+#   distance from the slot's last wrist position (or its home side of the
+#   frame, for a slot with no recent hand)
+#   + a penalty if the hand's handedness differs from the slot's last one,
+#     scaled by the classifier's confidence
+# With at most a couple of hands every permutation is tried, which costs
+# microseconds. Handedness alone isn't enough (two players can both raise
+# their right hand, and the label flickers at low confidence), nearest
+# wrist alone swaps identities when hands cross; together they hold.
+#
+# Note on cost: with max_num_hands=2 the palm detector keeps running on
+# every frame while fewer than two hands are tracked, so a one-player
+# session on a two-hand tracker pays more than on a one-hand tracker.
+# Only the two-player modes ask for two hands (see resolution.py --hands).
+
+
+class HandAssigner:
+    def __init__(self, players=2, hold=0.5, handedness_cost=0.3):
+        # hold: seconds a slot remembers its hand's wrist after losing it
+        self.players = players
+        self.hold = hold
+        self.handedness_cost = handedness_cost
+        # players left to right across the frame until their hands are seen
+        self.homes = [((i + 0.5) / players, 0.6) for i in range(players)]
+        self.reset()
+
+    def reset(self):
+        self.wrists = [None] * self.players
+        self.labels = [None] * self.players
+        self.seen = [0.0] * self.players
+
+    def cost(self, slot, wrist, label, score, now):
+        last = self.wrists[slot]
+        if last is None or now - self.seen[slot] > self.hold:
+            # no recent hand: only the side of the frame counts
+            return abs(wrist[0] - self.homes[slot][0])
+        cost = ((wrist[0] - last[0]) ** 2 + (wrist[1] - last[1]) ** 2) ** 0.5
+        if label is not None and self.labels[slot] is not None and label != self.labels[slot]:
+            cost += self.handedness_cost * score
+        return cost
+
+    def assign(self, wrists, labels=None, scores=None, t=None):
+        """Hand index per player slot (None: no hand this frame).
+
+        wrists: normalized (x, y) per tracked hand; labels/scores: handedness
+        ("Left"/"Right") and its confidence per hand, if known.
+        """
+        now = time.perf_counter() if t is None else t
+        n = len(wrists)
+        labels = labels or [None] * n
+        scores = scores or [1.0] * n
+        slots = [None] * self.players
+        if not n:
+            return slots
+        costs = [[self.cost(s, wrists[h], labels[h], scores[h], now) for h in range(n)]
+                 for s in range(self.players)]
+        # pad with "no hand" so extra slots or extra hands are allowed
+        hands = list(range(n)) + [None] * self.players
+        best, best_cost = None, float("inf")
+        for order in itertools.permutations(hands, self.players):
+            total = sum(costs[s][h] for s, h in enumerate(order) if h is not None)
+            # every hand that fits gets a slot before cost matters
+            total += (min(n, self.players) - sum(h is not None for h in order)) * 1e6
+            if total < best_cost:
+                best, best_cost = order, total
+        for s, h in enumerate(best):
+            if h is not None:
+                self.wrists[s] = tuple(wrists[h])
+                self.labels[s] = labels[h]
+                self.seen[s] = now
+            slots[s] = h
+        return slots
+
+    def assign_results(self, results, t=None):
+        # -> landmarks (or None) per player from a hands results object
+        hands = (results.multi_hand_landmarks or []) if results is not None else []
+        wrists = [(lms.landmark[0].x, lms.landmark[0].y) for lms in hands]
+        labels = scores = None
+        handedness = getattr(results, "multi_handedness", None)
+        if handedness:
+            labels = [h.classification[0].label for h in handedness]
+            scores = [h.classification[0].score for h in handedness]
+        return [None if h is None else hands[h] for h in self.assign(wrists, labels, scores, t)]
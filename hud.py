@@ -0,0 +1,87 @@
+from collections import OrderedDict
+import pygame
+
+# ------------------------------
+# Cached text / HUD rendering
+# ------------------------------
+# font.render() is one of the most expensive calls per frame, and HUD values
+# (score, level, lives) rarely change. TextCache keeps rendered surfaces keyed
+# by (font, text, color) with LRU eviction; Hud composes its items into one
+# surface that is only redrawn when one of the values changes.
+
+_MISSING = object()
+
+
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (id(font), text, tuple(color), antialias)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surf
+
+
+# shared by default so menus, banners and HUDs reuse each other's glyph runs
+text_cache = TextCache()
+
+
+class Hud:
+    def __init__(self, size, cache=None):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.cache = cache if cache is not None else text_cache
+        self.items = {}
+        self.values = {}
+        self.dirty = True
+        self.redraws = 0
+
+    def add_text(self, key, font, pos, fmt, color, anchor="topleft"):
+        # fmt is a format string applied to the value, e.g. "Score: {}"
+        self.items[key] = ("text", font, pos, fmt, color, anchor)
+        self.dirty = True
+
+    def add_widget(self, key, draw_fn):
+        # draw_fn(surface, value) for non-text items (icons, bars...)
+        self.items[key] = ("widget", draw_fn)
+        self.dirty = True
+
+    def set(self, key, value):
+        if self.values.get(key, _MISSING) != value:
+            self.values[key] = value
+            self.dirty = True
+
+    def update(self, **values):
+        for key, value in values.items():
+            self.set(key, value)
+
+    def redraw(self):
+        self.surface.fill((0, 0, 0, 0))
+        for key, item in self.items.items():
+            if key not in self.values:
+                continue
+            value = self.values[key]
+            if item[0] == "text":
+                _, font, pos, fmt, color, anchor = item
+                rendered = self.cache.render(font, fmt.format(value), color)
+                self.surface.blit(rendered, rendered.get_rect(**{anchor: pos}))
+            else:
+                item[1](self.surface, value)
+        self.dirty = False
+        self.redraws += 1
+
+    def draw(self, target, pos=(0, 0)):
+        if self.dirty:
+            self.redraw()
+        target.blit(self.surface, pos)
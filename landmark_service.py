@@ -0,0 +1,364 @@
+import argparse
+import math
+import socket
+import struct
+import sys
+import time
+import numpy as np
+
+# ------------------------------
+# Local landmark broadcast service
+# ------------------------------
+# One process owns the camera and the Hands model and publishes every result
+# over UDP on localhost; any number of apps subscribe. Subscribers send a
+# small hello every second and are dropped when they go quiet.
+#
+#   python landmark_service.py serve            # camera + MediaPipe
+#   python landmark_service.py fake             # synthetic hand, no camera
+#   python landmark_service.py monitor          # print rate / latency / drops
+#
+# Scripts take --service to read landmarks from here instead of the camera.
+#
+# Packet (little endian):
+#   header  "HLMK" | version u8 | seq u32 | capture time f64 (time.time())
+#           | frame width u16 | frame height u16 | hand count u8
+#   per hand  handedness u8 (0 left, 1 right) | score f32 | 21 x (x, y, z) f32
+
+HOST = "127.0.0.1"
+PORT = 47800
+MAGIC = b"HLMK"
+VERSION = 1
+HELLO = b"HLMK-SUB"
+SUBSCRIBER_TIMEOUT = 3.0
+KEEPALIVE = 1.0
+N_LANDMARKS = 21
+
+HEADER = struct.Struct("<4sBIdHHB")
+HAND = struct.Struct("<Bf")
+POINTS_SIZE = N_LANDMARKS * 3 * 4
+HANDEDNESS = ("Left", "Right")
+
+
+def encode_packet(seq, timestamp, width, height, hands):
+    """hands: list of (handedness 0/1, score, (21, 3) array-like)."""
+    parts = [HEADER.pack(MAGIC, VERSION, seq & 0xFFFFFFFF, timestamp, width, height, len(hands))]
+    for handedness, score, points in hands:
+        parts.append(HAND.pack(handedness, score))
+        parts.append(np.asarray(points, dtype="<f4").reshape(N_LANDMARKS * 3).tobytes())
+    return b"".join(parts)
+
+
+def decode_packet(data):
+    magic, version, seq, timestamp, width, height, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a landmark packet")
+    if len(data) < HEADER.size + count * (HAND.size + POINTS_SIZE):
+        raise ValueError("truncated landmark packet")
+    offset = HEADER.size
+    hands = []
+    for _ in range(count):
+        handedness, score = HAND.unpack_from(data, offset)
+        offset += HAND.size
+        points = np.frombuffer(data, dtype="<f4", count=N_LANDMARKS * 3, offset=offset).reshape(N_LANDMARKS, 3)
+        offset += POINTS_SIZE
+        hands.append((handedness, score, points))
+    return {"seq": seq, "timestamp": timestamp, "width": width, "height": height, "hands": hands}
+
+
+# ------------------------------
+# MediaPipe-shaped results (so scripts can use them unchanged)
+# ------------------------------
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+    def HasField(self, name):
+        # drawing_utils checks visibility/presence, which we don't send
+        return False
+
+
+class HandLandmarks:
+    def __init__(self, points):
+        self.landmark = [Landmark(float(x), float(y), float(z)) for x, y, z in points]
+
+
+class Classification:
+    def __init__(self, label, score):
+        self.label = label
+        self.score = score
+
+
+class Handedness:
+    def __init__(self, label, score):
+        self.classification = [Classification(label, score)]
+
+
+class Results:
+    def __init__(self, packet, mirror=False):
+        self.multi_hand_landmarks = None
+        self.multi_handedness = None
+        if packet and packet["hands"]:
+            self.multi_hand_landmarks = []
+            self.multi_handedness = []
+            for handedness, score, points in packet["hands"]:
+                if mirror:
+                    # same as running on a cv2.flip(frame, 1) image
+                    points = points.copy()
+                    points[:, 0] = 1.0 - points[:, 0]
+                    handedness = 1 - handedness
+                self.multi_hand_landmarks.append(HandLandmarks(points))
+                self.multi_handedness.append(Handedness(HANDEDNESS[handedness], score))
+
+
+def results_to_hands(results):
+    # MediaPipe results -> list of (handedness, score, (21, 3) array)
+    hands = []
+    if results.multi_hand_landmarks:
+        labels = results.multi_handedness or [None] * len(results.multi_hand_landmarks)
+        for lms, label in zip(results.multi_hand_landmarks, labels):
+            points = np.array([(p.x, p.y, p.z) for p in lms.landmark], dtype=np.float32)
+            if label is not None:
+                cls = label.classification[0]
+                handedness, score = (1 if cls.label == "Right" else 0), cls.score
+            else:
+                handedness, score = 1, 1.0
+            hands.append((handedness, score, points))
+    return hands
+
+
+# ------------------------------
+# Publisher
+# ------------------------------
+class Publisher:
+    def __init__(self, host=HOST, port=PORT):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.subscribers = {}
+        self.seq = 0
+
+    def _poll_hellos(self):
+        now = time.monotonic()
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(64)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            if data == HELLO:
+                if addr not in self.subscribers:
+                    print(f"subscriber joined: {addr}")
+                self.subscribers[addr] = now
+        for addr, seen in list(self.subscribers.items()):
+            if now - seen > SUBSCRIBER_TIMEOUT:
+                print(f"subscriber left: {addr}")
+                del self.subscribers[addr]
+
+    def publish(self, timestamp, width, height, hands):
+        self._poll_hellos()
+        self.seq += 1
+        packet = encode_packet(self.seq, timestamp, width, height, hands)
+        for addr in list(self.subscribers):
+            try:
+                self.sock.sendto(packet, addr)
+            except OSError:
+                del self.subscribers[addr]
+
+    def close(self):
+        self.sock.close()
+
+
+def serve(args):
+    import cv2
+    import mediapipe as mp
+    from capture import Camera
+
+    # negotiated MJPG / 1-frame buffer: every queued frame is latency for all subscribers
+    cap = Camera(args.camera, size=None)
+    print(cap.report())
+    hands = mp.solutions.hands.Hands(max_num_hands=args.max_hands,
+                                     min_detection_confidence=args.confidence,
+                                     min_tracking_confidence=args.confidence)
+    pub = Publisher(args.host, args.port)
+    print(f"publishing landmarks on udp://{args.host}:{args.port}")
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            captured = time.time()
+            h, w = frame.shape[:2]
+            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            pub.publish(captured, w, h, results_to_hands(results))
+    finally:
+        pub.close()
+        print(cap.report())
+        cap.release()
+
+
+def fake_hand(t):
+    # open hand drifting in a circle, pinching for half a second every 2 s
+    cx = 0.5 + 0.25 * math.cos(t * 0.8)
+    cy = 0.5 + 0.2 * math.sin(t * 0.8)
+    points = np.zeros((N_LANDMARKS, 3), dtype=np.float32)
+    for finger in range(5):
+        angle = -math.pi / 2 + (finger - 2) * 0.35
+        for joint in range(4):
+            r = 0.04 + joint * 0.03
+            points[1 + finger * 4 + joint, :2] = (cx + math.cos(angle) * r, cy + math.sin(angle) * r)
+    points[0, :2] = (cx, cy + 0.1)
+    if t % 2.0 < 0.5:
+        points[4, :2] = points[8, :2]
+    return points
+
+
+def fake(args):
+    pub = Publisher(args.host, args.port)
+    print(f"publishing fake landmarks on udp://{args.host}:{args.port} at {args.fps} fps")
+    start = time.time()
+    period = 1.0 / args.fps
+    try:
+        while True:
+            now = time.time()
+            pub.publish(now, 1280, 720, [(1, 1.0, fake_hand(now - start))])
+            time.sleep(max(0, period - (time.time() - now)))
+    finally:
+        pub.close()
+
+
+# ------------------------------
+# Subscriber
+# ------------------------------
+class LandmarkSubscriber:
+    def __init__(self, host=HOST, port=PORT):
+        self.server = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, 0))
+        self.last_hello = 0.0
+        self.last_seq = None
+        self.received = 0
+        self.dropped = 0
+        self.bad = 0  # datagrams that weren't landmark packets (or were cut short)
+
+    def _hello(self):
+        now = time.monotonic()
+        if now - self.last_hello >= KEEPALIVE:
+            self.sock.sendto(HELLO, self.server)
+            self.last_hello = now
+
+    def receive(self, timeout=None):
+        """Newest packet (older queued ones are skipped), or None on timeout or a bad packet."""
+        self._hello()
+        self.sock.settimeout(timeout)
+        try:
+            data = self.sock.recv(4096)
+        except (socket.timeout, ConnectionResetError):
+            return None
+        # drain anything queued behind it; only the newest matters
+        self.sock.setblocking(False)
+        while True:
+            try:
+                data = self.sock.recv(4096)
+            except (BlockingIOError, ConnectionResetError):
+                break
+        try:
+            packet = decode_packet(data)
+        except (ValueError, struct.error):
+            # stray or short datagram on the port: drop it
+            self.bad += 1
+            return None
+        if self.last_seq is not None and packet["seq"] > self.last_seq + 1:
+            self.dropped += packet["seq"] - self.last_seq - 1
+        self.last_seq = packet["seq"]
+        self.received += 1
+        return packet
+
+    def close(self):
+        self.sock.close()
+
+
+class ServiceClient:
+    """Stands in for both cv2.VideoCapture and mp Hands in the scripts.
+
+    read() waits up to `timeout` for the next published result and returns a
+    blank frame of the publisher's size, or (False, None) like a dropped
+    camera frame when nothing arrived (no publisher, or it died) so the loop
+    keeps pumping events; process() then returns that result (no hands after
+    a timeout). mirror=True flips landmarks like the scripts' cv2.flip(frame, 1).
+    """
+
+    def __init__(self, host=HOST, port=PORT, mirror=False, timeout=0.1):
+        self.sub = LandmarkSubscriber(host, port)
+        self.mirror = mirror
+        self.timeout = timeout
+        self.packet = None
+        self.frame = None
+
+    def read(self):
+        packet = self.packet = self.sub.receive(self.timeout)
+        if packet is None:
+            return False, None
+        shape = (packet["height"], packet["width"], 3)
+        if self.frame is None or self.frame.shape != shape:
+            self.frame = np.zeros(shape, dtype=np.uint8)
+        else:
+            self.frame[:] = 0
+        return True, self.frame
+
+    def process(self, image=None):
+        return Results(self.packet, self.mirror)
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        self.sub.close()
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def monitor(args):
+    sub = LandmarkSubscriber(args.host, args.port)
+    window_start = time.time()
+    count = 0
+    latency = 0.0
+    while True:
+        packet = sub.receive(1.0)
+        if packet is None:
+            print("waiting for publisher...")
+            continue
+        count += 1
+        latency += time.time() - packet["timestamp"]
+        elapsed = time.time() - window_start
+        if elapsed >= 1.0:
+            print(f"{count / elapsed:5.1f} packets/s  latency {latency / count * 1000:5.1f}ms  "
+                  f"hands {len(packet['hands'])}  seq {packet['seq']}  dropped {sub.dropped}  bad {sub.bad}")
+            window_start, count, latency = time.time(), 0, 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local hand landmark broadcast service")
+    parser.add_argument("mode", choices=["serve", "fake", "monitor"])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--max-hands", type=int, default=2)
+    parser.add_argument("--confidence", type=float, default=0.6)
+    parser.add_argument("--fps", type=float, default=30)
+    args = parser.parse_args(argv)
+    try:
+        {"serve": serve, "fake": fake, "monitor": monitor}[args.mode](args)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
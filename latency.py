@@ -0,0 +1,347 @@
+import argparse
+import math
+import sys
+import time
+import numpy as np
+
+# ------------------------------
+# Motion-to-photon latency probe
+# ------------------------------
+# The runners in demo_runtime.py stamp every frame as it moves through
+# capture -> prepare -> inference -> logic -> draw -> present
+# (pygame.display.update / cv2.imshow). Demos report outputs (cursor move,
+# paddle move, shot...) with probe.output(kind). When the tracked landmark
+# starts moving after being still, that frame's capture time is the motion
+# onset; the first output of each kind after it gives one latency event.
+#
+# "capture" is when cap.read() returned. Exposure and driver buffering before
+# that are not visible from here, so the numbers are a lower bound; the
+# capture source's negotiation and frame timing (capture.Camera) are
+# appended to the report to show how much buffering to expect.
+#
+#   python latency.py                  # synthetic replay check (exit 1 on failure)
+#   python latency.py --demo catch_game.py --budget-ms 40
+
+STAGES = ("capture", "prepare", "inference", "logic", "draw", "present")
+STAGE_INDEX = {name: i for i, name in enumerate(STAGES)}
+
+
+class NullProbe:
+    # default probe: every hook is a no-op, so uninstrumented runs pay nothing
+    enabled = False
+
+    def begin(self):
+        pass
+
+    def stamp(self, stage):
+        pass
+
+    def track(self, results):
+        pass
+
+    def output(self, kind, now=False):
+        pass
+
+    def present(self):
+        pass
+
+    def request(self):
+        # on-demand profile (profiler.FrameProfiler); nothing to start here
+        pass
+
+    def finish(self):
+        # runner exit; a FrameProfiler writes a session still in progress
+        pass
+
+
+NULL_PROBE = NullProbe()
+
+
+def tracked_point(results, hand_landmark=8, face_landmark=1):
+    # normalized (x, y) of the index tip (hands) or nose tip (face mesh), else None
+    hands = getattr(results, "multi_hand_landmarks", None)
+    if hands:
+        lm = hands[0].landmark[hand_landmark]
+        return lm.x, lm.y
+    faces = getattr(results, "multi_face_landmarks", None)
+    if faces:
+        lm = faces[0].landmark[face_landmark]
+        return lm.x, lm.y
+    return None
+
+
+class LatencyProbe:
+    enabled = True
+
+    def __init__(self, threshold=0.01, still_frames=5, max_lag_frames=60, max_frames=10000):
+        # threshold: per-frame landmark movement (normalized) that counts as motion
+        self.threshold = threshold
+        self.still_frames = still_frames
+        self.max_lag_frames = max_lag_frames
+        self.max_frames = max_frames
+        self.stages = np.full((max_frames, len(STAGES)), np.nan)
+        self.end_to_end = np.full(max_frames, np.nan)
+        self.frame = 0
+        self.last = None
+        self.captured = None
+        # onset detection
+        self.prev_point = None
+        self.still = 0
+        self.armed = False
+        self.onset = None  # (capture time, frame)
+        self.onsets = 0
+        self.resolved = set()
+        self.pending = set()
+        self.events = {}  # kind -> [(latency s, frames after onset)]
+        self.source = None  # capture source, set by the runner
+
+    def begin(self):
+        self.last = time.perf_counter()
+
+    def stamp(self, stage):
+        t = time.perf_counter()
+        if self.last is not None:
+            self.stages[self.frame % self.max_frames, STAGE_INDEX[stage]] = t - self.last
+        self.last = t
+        if stage == "capture":
+            self.captured = t
+
+    def track(self, results):
+        point = tracked_point(results)
+        if point is None:
+            self.prev_point = None
+            self.still = 0
+            return
+        if self.prev_point is not None:
+            moved = math.hypot(point[0] - self.prev_point[0], point[1] - self.prev_point[1])
+            if moved < self.threshold:
+                self.still += 1
+                if self.still >= self.still_frames:
+                    self.armed = True
+                    self.onset = None
+            elif self.armed:
+                self.onset = (self.captured, self.frame)
+                self.onsets += 1
+                self.armed = False
+                self.resolved = set()
+                self.still = 0
+            else:
+                self.still = 0
+        self.prev_point = point
+
+    def output(self, kind, now=False):
+        """The demo produced a visible output. now=True when the call itself is
+        the photon (e.g. pyautogui.moveTo), otherwise it lands at present()."""
+        if self.onset is None or kind in self.resolved:
+            return
+        if now:
+            self._resolve(kind, time.perf_counter())
+        else:
+            self.pending.add(kind)
+
+    def request(self):
+        pass
+
+    def finish(self):
+        pass
+
+    def _resolve(self, kind, t):
+        captured, frame = self.onset
+        self.events.setdefault(kind, []).append((t - captured, self.frame - frame))
+        self.resolved.add(kind)
+
+    def present(self):
+        self.stamp("present")
+        t = self.last
+        if self.captured is not None:
+            self.end_to_end[self.frame % self.max_frames] = t - self.captured
+        for kind in self.pending:
+            if kind not in self.resolved:
+                self._resolve(kind, t)
+        self.pending.clear()
+        if self.onset is not None and self.frame - self.onset[1] >= self.max_lag_frames:
+            self.onset = None
+        self.frame += 1
+        self.captured = None
+
+    def summary(self):
+        """Per-stage and end-to-end frame times plus per-event latencies, in ms."""
+        n = min(self.frame, self.max_frames)
+
+        def dist(values):
+            values = np.asarray(values, dtype=float) * 1000
+            values = values[~np.isnan(values)]
+            if not len(values):
+                return None
+            return {"n": len(values), "mean": float(values.mean()), "p50": float(np.percentile(values, 50)),
+                    "p95": float(np.percentile(values, 95)), "max": float(values.max())}
+
+        out = {"frames": self.frame, "onsets": self.onsets,
+               "stages": {name: dist(self.stages[:n, i]) for i, name in enumerate(STAGES)},
+               "end_to_end": dist(self.end_to_end[:n]), "events": {}}
+        if hasattr(self.source, "stats"):
+            out["capture"] = dict(self.source.negotiated, stats=self.source.stats())
+        for kind, items in self.events.items():
+            out["events"][kind] = dist([lat for lat, _ in items])
+            out["events"][kind]["lag_frames"] = float(np.mean([f for _, f in items]))
+        return out
+
+    def report(self):
+        s = self.summary()
+        lines = [f"latency: {s['frames']} frames, {s['onsets']} motion onsets"]
+
+        def row(name, d, extra=""):
+            if d is None:
+                return f"  {name:<12} -"
+            return (f"  {name:<12} n={d['n']:<6} mean {d['mean']:6.1f}  p50 {d['p50']:6.1f}  "
+                    f"p95 {d['p95']:6.1f}  max {d['max']:6.1f} ms{extra}")
+
+        for name in STAGES:
+            lines.append(row(name, s["stages"][name]))
+        lines.append(row("frame e2e", s["end_to_end"]))
+        for kind, d in sorted(s["events"].items()):
+            lines.append(row(kind, d, f"  ({d['lag_frames']:.1f} frames after onset)"))
+        if hasattr(self.source, "report"):
+            lines.append(self.source.report())
+        return "\n".join(lines)
+
+
+# ------------------------------
+# Synthetic replay check
+# ------------------------------
+class SyntheticHand:
+    """Stands in for camera + tracker: a hand that rests, then moves.
+
+    Each cycle is `still` frames at rest followed by `moving` frames moving
+    right by `step` per frame, so motion onsets are at known frames. read()
+    is paced to `fps`, process() sleeps `inference_ms` to model the model.
+    """
+
+    def __init__(self, cycles=5, still=20, moving=10, step=0.02, fps=30, inference_ms=15, size=(480, 640)):
+        from landmark_service import fake_hand
+        self.base = fake_hand(0.25)
+        self.cycles, self.still, self.moving, self.step = cycles, still, moving, step
+        self.interval = 1.0 / fps if fps else 0
+        self.inference = inference_ms / 1000
+        self.image = np.zeros(size + (3,), dtype=np.uint8)
+        self.frame = -1
+        self.next_read = None
+
+    @property
+    def onsets(self):
+        return self.cycles
+
+    def offset(self, frame):
+        period = self.still + self.moving
+        cycle, phase = divmod(frame, period)
+        # first moving frame of each cycle is an onset; position keeps the
+        # distance travelled in earlier cycles so rest frames are exactly still
+        moved = cycle * self.moving + max(0, phase - self.still + 1)
+        return moved * self.step
+
+    def read(self):
+        if self.next_read is not None:
+            delay = self.next_read - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.next_read = time.perf_counter() + self.interval
+        self.frame += 1
+        if not self.isOpened():
+            return False, None
+        return True, self.image
+
+    def isOpened(self):
+        return self.frame < self.cycles * (self.still + self.moving)
+
+    def process(self, image=None):
+        from landmark_service import Results
+        time.sleep(self.inference)
+        points = self.base.copy()
+        points[:, 0] = (points[:, 0] - 0.2 + self.offset(self.frame)) % 1.0
+        return Results({"hands": [(1, 1.0, points)]})
+
+    def release(self):
+        pass
+
+
+def run_check(args):
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from demo_runtime import Demo, run_pygame
+
+    class MoveDemo(Demo):
+        # moves a dot whenever the hand moves; logic_ms models game/gesture work
+        def start(self, screen):
+            super().start(screen)
+            self.prev = None
+            self.x = 0
+
+        def on_frame(self, frame, results):
+            if results is None or not results.multi_hand_landmarks:
+                return
+            time.sleep(args.logic_ms / 1000)
+            x = results.multi_hand_landmarks[0].landmark[8].x
+            if self.prev is not None and abs(x - self.prev) > 0.005:
+                self.x = int(x * self.screen.get_width())
+                self.probe.output("move")
+            self.prev = x
+
+        def draw(self):
+            self.screen.fill((0, 0, 0))
+            pygame.draw.circle(self.screen, (255, 255, 255), (self.x, 100), 10)
+
+    pygame.init()
+    screen = pygame.display.set_mode((640, 480))
+    source = SyntheticHand(cycles=args.cycles, fps=args.fps, inference_ms=args.inference_ms)
+    probe = LatencyProbe()
+    if args.demo:
+        from launcher import load_plugin
+        demo = load_plugin(args.demo).create_demo()
+        # synthetic landmarks are already in display orientation
+        demo.mirror = False
+    else:
+        demo = MoveDemo()
+    run_pygame(demo, source, source, screen, fps=0, probe=probe)
+    pygame.quit()
+    print(probe.report())
+
+    s = probe.summary()
+    failures = []
+    if s["onsets"] != source.onsets:
+        failures.append(f"detected {s['onsets']} motion onsets, expected {source.onsets}")
+    if not s["events"]:
+        failures.append("no output events recorded")
+    if not args.demo and "move" in s["events"]:
+        move = s["events"]["move"]
+        # every onset must show up on the very frame it was captured on, and
+        # the latency must cover at least the injected inference + logic time
+        floor = args.inference_ms + args.logic_ms
+        if move["n"] != source.onsets or move["lag_frames"] != 0:
+            failures.append(f"move events {move['n']} (lag {move['lag_frames']} frames), "
+                            f"expected {source.onsets} on the onset frame")
+        if move["p50"] < floor:
+            failures.append(f"move p50 {move['p50']:.1f} ms below injected {floor} ms")
+    if args.budget_ms is not None:
+        for kind, d in s["events"].items():
+            if d["p95"] > args.budget_ms:
+                failures.append(f"{kind} p95 {d['p95']:.1f} ms over budget {args.budget_ms} ms")
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic motion-to-photon latency check")
+    parser.add_argument("--demo", help="plugin script to replay through (default: built-in probe demo)")
+    parser.add_argument("--cycles", type=int, default=5, help="rest/move cycles (one motion onset each)")
+    parser.add_argument("--fps", type=float, default=30, help="synthetic camera rate")
+    parser.add_argument("--inference-ms", type=float, default=15, help="injected inference time")
+    parser.add_argument("--logic-ms", type=float, default=5, help="injected logic time (built-in demo)")
+    parser.add_argument("--budget-ms", type=float, help="fail if any event's p95 latency exceeds this")
+    return run_check(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+import argparse
+import importlib.util
+import os
+import time
+import pygame
+from demo_runtime import HANDS_DEFAULT, add_input_args, build_tracker, open_camera, report_wait
+from latency import NULL_PROBE, LatencyProbe
+from resolution import InferenceView, saved_capture_size
+from hud import text_cache
+
+# ------------------------------
+# In-process demo launcher
+# ------------------------------
+# One camera and one instance per tracker config stay open for the whole
+# session; switching demos only swaps the plugin object, so there is no
+# camera re-open or model load between them.
+#
+#   python launcher.py [--fullscreen] [--latency] [--autotune FPS] [--govern FPS] [--backend tasks]
+#   1-5: start a demo   ESC: back to the menu (ESC again quits)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# --autotune benchmarks each pad the demos run with: none, and space_air's edge padding
+AUTOTUNE_PADS = (0, 80)
+PLUGINS = [
+    ("Air Drawing", "hand-tracking.py"),
+    ("Air Mouse", "air_mouse.py"),
+    ("Catch the Objects", "catch_game.py"),
+    ("Space Shooter", "space_air.py"),
+    ("Eye Tracker", "eye_tracking.py"),
+]
+
+
+def load_plugin(filename):
+    # file-based import so hyphenated script names work too
+    name = os.path.splitext(filename)[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class Launcher:
+    def __init__(self, screen, cap, probe=None, govern=None, backend="solutions"):
+        self.screen = screen
+        self.cap = cap
+        self.probe = probe or NULL_PROBE
+        if self.probe.enabled:
+            self.probe.source = cap
+        self.inference_scales = {}  # pad -> scale, set by autotune(), else each demo's default
+        self.govern = govern  # target loop rate for governed trackers (governor.py)
+        self.backend = backend
+        # tracker config -> warm instance
+        self.trackers = {}
+        self.modules = {}
+        self.demo = None
+        self.font = pygame.font.SysFont("Arial", 36)
+
+    def tracker_for(self, config):
+        if config not in self.trackers:
+            self.trackers[config] = build_tracker(config, self.govern, self.backend)
+        return self.trackers[config]
+
+    def autotune(self, target_fps, pads=AUTOTUNE_PADS):
+        # benchmark on the warm camera + hands model before any demo starts;
+        # the capture size comes from the first pad, the others only pick a scale
+        from resolution import apply_capture_size, report, save_choice, tune
+        tracker = self.tracker_for(HANDS_DEFAULT)
+        for i, pad in enumerate(pads):
+            choice, rows = tune(self.cap, tracker, target_fps, pad=pad, resize=i == 0)
+            report(choice, rows)
+            save_choice(choice)
+            if i == 0:
+                apply_capture_size(self.cap, choice["capture"])
+            self.inference_scales[pad] = choice["scale"]
+
+    def switch(self, index):
+        start = time.perf_counter()
+        self.stop_demo()
+        title, filename = PLUGINS[index]
+        if filename not in self.modules:
+            self.modules[filename] = load_plugin(filename)
+        demo = self.modules[filename].create_demo()
+        demo.probe = self.probe
+        if self.inference_scales:
+            if demo.view is None:
+                demo.inference_scale = self.inference_scales.get(0)
+            else:
+                # built in the demo's __init__ (SpaceDemo): keep its pad, use the scale tuned for it
+                pad = demo.view.pad
+                scale = self.inference_scales.get(pad, demo.view.scale)
+                demo.view = InferenceView(scale, pad)
+        self.tracker = self.tracker_for(demo.tracker)
+        demo.start(self.screen)
+        self.demo = demo
+        print(f"{title}: started in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def stop_demo(self):
+        if self.demo is not None:
+            self.demo.stop()
+            self.demo = None
+
+    def close(self):
+        # warm trackers (and a governor's worker pool) live for the session
+        self.stop_demo()
+        for tracker in self.trackers.values():
+            tracker.close()
+        self.trackers.clear()
+
+    def draw_menu(self):
+        self.screen.fill((0, 0, 0))
+        for i, (title, _) in enumerate(PLUGINS):
+            line = text_cache.render(self.font, f"{i + 1}  {title}", (255, 255, 255))
+            self.screen.blit(line, (80, 80 + i * 60))
+        hint = text_cache.render(self.font, "ESC: back / quit", (120, 120, 120))
+        self.screen.blit(hint, (80, 120 + len(PLUGINS) * 60))
+
+    def run(self, fps=60):
+        clock = pygame.time.Clock()
+        running = True
+        while running:
+            t0 = time.perf_counter()
+            clock.tick(fps)
+            waited = time.perf_counter() - t0
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif self.demo is not None:
+                    # ESC always returns to the menu, even for demos that ignore it
+                    if (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE) \
+                            or self.demo.on_event(event) is False:
+                        self.stop_demo()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    elif pygame.K_1 <= event.key < pygame.K_1 + len(PLUGINS):
+                        self.switch(event.key - pygame.K_1)
+
+            demo = self.demo
+            probe = self.probe
+            probe.begin()
+            # the camera keeps streaming in the menu so the driver buffer stays fresh
+            t0 = time.perf_counter()
+            success, frame = self.cap.read()
+            waited += time.perf_counter() - t0
+            if demo is None:
+                self.draw_menu()
+                pygame.display.update()
+                continue
+            probe.stamp("capture")
+            report_wait(self.tracker, waited)
+            if success:
+                frame, rgb = demo.prepare(frame)
+                probe.stamp("prepare")
+                results = self.tracker.process(rgb)
+                probe.stamp("inference")
+                probe.track(results)
+            else:
+                frame = results = None
+            if demo.on_frame(frame, results) is False:
+                self.stop_demo()
+                continue
+            probe.stamp("logic")
+            demo.draw()
+            probe.stamp("draw")
+            pygame.display.update()
+            probe.present()
+            demo.preview_visible = pygame.display.get_active()
+        self.stop_demo()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hand-tracking demo launcher")
+    parser.add_argument("--fullscreen", action="store_true")
+    add_input_args(parser, service=False)
+    parser.add_argument("--autotune", type=float, metavar="FPS", help="pick capture/inference resolution for this loop rate first")
+    args = parser.parse_args()
+
+    pygame.init()
+    if args.fullscreen:
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        screen = pygame.display.set_mode((1280, 720))
+    pygame.display.set_caption("Hand Tracking Demos")
+
+    # 1280x720 unless resolution.py picked something else
+    cap = open_camera(size=saved_capture_size((1280, 720)))
+
+    probe = LatencyProbe() if args.latency else None
+    launcher = Launcher(screen, cap, probe, govern=args.govern, backend=args.backend)
+    try:
+        if args.autotune:
+            launcher.autotune(args.autotune)
+        launcher.run()
+    finally:
+        launcher.close()
+        cap.release()
+        pygame.quit()
+    if probe:
+        print(probe.report())
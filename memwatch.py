@@ -0,0 +1,302 @@
+import argparse
+import gc
+import logging
+import logging.handlers
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+# ------------------------------
+# Long-run memory instrumentation
+# ------------------------------
+# Kiosks run the games for days. With a MemoryWatch attached, the runner
+# calls tick() once per frame; every `interval` seconds that takes a
+# tracemalloc snapshot and writes one sample to a rotating log:
+# traced/peak/RSS memory, growth since the previous sample and since the
+# baseline, GC pauses in the interval, the demo's gauges (entity counts,
+# live pygame surfaces, cache sizes) and the allocation sites that grew
+# the most. Off by default: NULL_WATCH keeps tick() a no-op.
+#
+# tracemalloc slows allocation-heavy code down noticeably, so this is a
+# diagnosis mode, not something to leave on at every kiosk.
+#
+#   python space_air.py --memwatch 60               # sample once a minute
+#   python memwatch.py --demo space_air.py --minutes 10 --limit-kb 2048
+#                                                    # headless soak, exit 1 on growth
+
+LOG_FILE = "memwatch.log"
+# allocation sites that are the instrumentation itself
+IGNORED = (tracemalloc.Filter(False, tracemalloc.__file__),
+           tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+           tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+           tracemalloc.Filter(False, "<unknown>"))
+
+
+class GcTimer:
+    # measures collector pauses through gc.callbacks; running totals only,
+    # so it can stay registered for days
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.total = 0.0
+        self.worst = 0.0
+        self.started = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self.started = time.perf_counter()
+        elif self.started is not None:
+            pause = time.perf_counter() - self.started
+            self.collections[info["generation"]] += 1
+            self.total += pause
+            self.worst = max(self.worst, pause)
+            self.started = None
+
+    def install(self):
+        gc.callbacks.append(self)
+
+    def remove(self):
+        if self in gc.callbacks:
+            gc.callbacks.remove(self)
+
+    def report(self):
+        per_gen = self.collections
+        return (f"gc: {sum(per_gen)} collections (gen0/1/2 {per_gen[0]}/{per_gen[1]}/{per_gen[2]})  "
+                f"total pause {self.total * 1000:.1f}ms  max {self.worst * 1000:.2f}ms")
+
+
+def rss_kb():
+    # resident set size of this process (Linux), else the peak from getrusage
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def surface_count(*roots, depth=4):
+    """pygame Surfaces reachable from roots through attributes and containers.
+
+    Surfaces aren't tracked by gc, so gc.get_objects() can't find them;
+    walking the demo (sprites, pools, HUD, caches) catches the ones a leak
+    would pile up. Only called at sample time.
+    """
+    import pygame
+    seen = set()
+    count = 0
+    stack = [(root, 0) for root in roots]
+    while stack:
+        obj, level = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, pygame.Surface):
+            count += 1
+            continue
+        if level >= depth:
+            continue
+        if isinstance(obj, dict):
+            children = obj.values()
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            children = obj
+        elif hasattr(obj, "__dict__") and not isinstance(obj, type) and type(obj).__module__ != "builtins":
+            children = vars(obj).values()
+        else:
+            continue
+        stack.extend((child, level + 1) for child in children)
+    return count
+
+
+class NullWatch:
+    enabled = False
+
+    def attach(self, demo):
+        pass
+
+    def tick(self):
+        pass
+
+
+NULL_WATCH = NullWatch()
+
+
+class MemoryWatch:
+    """Periodic memory samples to a rotating log.
+
+    interval: seconds between samples; warmup: seconds before the baseline
+    is taken (caches, pools and fonts fill up first); top: allocation sites
+    listed per sample.
+    """
+    enabled = True
+
+    def __init__(self, interval=60.0, path=LOG_FILE, max_bytes=1 << 20, backups=5, top=8, warmup=None,
+                 frames=1, echo=False):
+        self.interval = interval
+        self.warmup = interval if warmup is None else warmup
+        self.top = top
+        self.frames = frames
+        self.log = logging.getLogger("memwatch")
+        self.log.setLevel(logging.INFO)
+        self.log.propagate = False
+        self.handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        self.handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self.log.addHandler(self.handler)
+        if echo:
+            self.echo = logging.StreamHandler(sys.stdout)
+            self.log.addHandler(self.echo)
+        else:
+            self.echo = None
+        self.gc_timer = GcTimer()
+        self.demo = None
+        self.started = None
+        self.next_sample = None
+        self.samples = 0
+        self.previous = None
+        self.baseline = None
+        self.baseline_traced = None
+        self.traced = 0
+        self.last_gc = (0, 0.0)
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self.gc_timer.install()
+        self.started = time.perf_counter()
+        self.next_sample = self.started + min(self.interval, self.warmup)
+        self.previous = self.snapshot()
+        self.log.info(f"start: interval {self.interval}s, warmup {self.warmup}s, rss {rss_kb()}KB")
+        return self
+
+    def attach(self, demo):
+        # gauges come from the running demo (demo.gauges() + its surfaces)
+        self.demo = demo
+
+    def snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(IGNORED)
+
+    def tick(self):
+        now = time.perf_counter()
+        if now >= self.next_sample:
+            self.next_sample = now + self.interval
+            self.sample(now)
+
+    def gauges(self):
+        if self.demo is None:
+            return {}
+        from hud import text_cache
+        values = dict(self.demo.gauges())
+        values["surfaces"] = surface_count(self.demo, text_cache.entries)
+        values["text_cache"] = len(text_cache.entries)
+        return values
+
+    def sample(self, now=None):
+        now = time.perf_counter() if now is None else now
+        snapshot = self.snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+        self.traced = traced
+        self.samples += 1
+        collections, pause = sum(self.gc_timer.collections), self.gc_timer.total
+        gc_line = (f"gc {collections - self.last_gc[0]} collections {(pause - self.last_gc[1]) * 1000:.1f}ms"
+                   f" (max ever {self.gc_timer.worst * 1000:.2f}ms)")
+        self.last_gc = (collections, pause)
+
+        if self.baseline is None and now - self.started >= self.warmup:
+            self.baseline = snapshot
+            self.baseline_traced = traced
+        since = f" {(traced - self.baseline_traced) / 1024:+.0f}KB since baseline" if self.baseline else ""
+        gauges = "  ".join(f"{k} {v}" for k, v in self.gauges().items())
+        self.log.info(f"sample {self.samples} t={now - self.started:.0f}s traced {traced / 1024:.0f}KB"
+                      f"{since} peak {peak / 1024:.0f}KB rss {rss_kb()}KB  {gc_line}  {gauges}")
+        for stat in snapshot.compare_to(self.previous, "lineno")[:self.top]:
+            if stat.size_diff > 0:
+                frame = stat.traceback[0]
+                self.log.info(f"  {stat.size_diff / 1024:+.1f}KB {stat.count_diff:+d} blocks"
+                              f"  {os.path.basename(frame.filename)}:{frame.lineno}")
+        self.previous = snapshot
+
+    def growth(self):
+        # traced bytes gained since the baseline (None before it's taken)
+        if self.baseline is None:
+            return None
+        return self.traced - self.baseline_traced
+
+    def stop(self):
+        self.sample()
+        if self.baseline is not None:
+            self.log.info("largest growth since baseline:")
+            for stat in self.previous.compare_to(self.baseline, "traceback")[:self.top]:
+                if stat.size_diff > 0:
+                    self.log.info(f"  {stat.size_diff / 1024:+.1f}KB {stat.count_diff:+d} blocks")
+                    for line in stat.traceback.format():
+                        self.log.info("    " + line.strip())
+        self.log.info(self.gc_timer.report())
+        self.gc_timer.remove()
+        tracemalloc.stop()
+        for handler in (self.handler, self.echo):
+            if handler is not None:
+                self.log.removeHandler(handler)
+                handler.close()
+
+
+# ------------------------------
+# Headless soak
+# ------------------------------
+def run_soak(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from demo_runtime import run_pygame
+    from launcher import load_plugin
+    from latency import SyntheticHand
+
+    pygame.init()
+    screen = pygame.display.set_mode((args.width, args.height))
+    plugin = load_plugin(args.demo)
+    # a hand that rests and moves forever; no camera or model needed
+    frames = int(args.minutes * 60 * args.fps)
+    source = SyntheticHand(cycles=frames // 30 + 1, fps=args.fps, inference_ms=0)
+    watch = MemoryWatch(args.interval, args.log, warmup=args.warmup, echo=True).start()
+    runs = 0
+    # the kiosk loop: a finished game (game over) starts a fresh one
+    while source.isOpened():
+        demo = plugin.create_demo()
+        demo.mirror = False
+        run_pygame(demo, source, source, screen, fps=0, watch=watch)
+        runs += 1
+    watch.stop()
+    pygame.quit()
+
+    growth = watch.growth()
+    print(f"soak: {args.demo} {source.frame} frames, {runs} games, log in {args.log}")
+    if growth is None:
+        print("FAIL: run ended before the warmup; no baseline")
+        return 1
+    print(f"soak: traced memory {growth / 1024:+.0f}KB since baseline (limit {args.limit_kb:.0f}KB)")
+    if growth > args.limit_kb * 1024:
+        print(f"FAIL: memory grew {growth / 1024:.0f}KB, over the {args.limit_kb:.0f}KB limit")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless memory soak for a demo (exit 1 on growth)")
+    parser.add_argument("--demo", default="space_air.py", help="plugin script to soak")
+    parser.add_argument("--minutes", type=float, default=5, help="run length in synthetic camera time")
+    parser.add_argument("--fps", type=float, default=30, help="synthetic camera rate")
+    parser.add_argument("--interval", type=float, default=30, help="seconds between samples")
+    parser.add_argument("--warmup", type=float, default=30, help="seconds before the baseline")
+    parser.add_argument("--limit-kb", type=float, default=2048, help="fail above this growth since the baseline")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--log", default=LOG_FILE)
+    return run_soak(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import time
+import numpy as np
+
+# ------------------------------
+# Landmark debug overlay
+# ------------------------------
+# Replaces per-frame mp_draw.draw_landmarks (one Python call per bone and per
+# joint) with one array conversion per hand and two batched cv2.polylines
+# calls. The geometry is refreshed at `rate` Hz, which can be lower than the
+# tracker rate; in between, the cached polylines are drawn onto each new
+# frame. Nothing happens while the preview isn't visible.
+
+# the 21 hand connections as 6 chains (fingers + palm loop)
+HAND_CHAINS = [[0, 1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 16], [17, 18, 19, 20],
+               [0, 5, 9, 13, 17, 0]]
+# flat gather indices + slices, so one fancy index builds every chain
+CHAIN_INDEX = np.concatenate(HAND_CHAINS)
+CHAIN_SLICES = [slice(a, a + len(c)) for a, c in zip(np.cumsum([0] + [len(c) for c in HAND_CHAINS]), HAND_CHAINS)]
+BONE_COLOR = (255, 255, 255)
+JOINT_COLOR = (0, 0, 255)
+
+
+def landmark_array(hand_landmarks):
+    # MediaPipe landmark list -> (n, 3) float32 normalized x, y, z
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+
+
+class LandmarkOverlay:
+    def __init__(self, rate=15, bone_color=BONE_COLOR, joint_color=JOINT_COLOR, thickness=2, joint_size=6):
+        # rate: geometry refreshes per second (None or 0: every frame)
+        self.interval = 1.0 / rate if rate else 0.0
+        self.bone_color = bone_color
+        self.joint_color = joint_color
+        self.thickness = thickness
+        self.joint_size = joint_size
+        self.next_refresh = 0.0
+        self.bones = []
+        self.joints = []
+
+    def update(self, hands, size):
+        """hands: list of MediaPipe landmark lists (or (n, 2+) arrays); size: (w, h)."""
+        now = time.perf_counter()
+        if now < self.next_refresh:
+            return
+        self.next_refresh = now + self.interval
+        self.bones = []
+        self.joints = []
+        scale = np.array(size, dtype=np.float32)
+        for hand in hands or ():
+            points = hand if isinstance(hand, np.ndarray) else landmark_array(hand)
+            px = (points[:, :2] * scale).astype(np.int32)
+            chains = px[CHAIN_INDEX]
+            self.bones.extend([chains[s] for s in CHAIN_SLICES])
+            # each joint as a zero-length segment: round caps draw it as a dot
+            self.joints.extend(np.stack([px, px], axis=1))
+
+    def draw(self, frame, hands=None, visible=True):
+        # hands=None redraws the cached geometry without a refresh
+        import cv2
+        if not visible:
+            return
+        if hands is not None:
+            self.update(hands, (frame.shape[1], frame.shape[0]))
+        if self.bones:
+            cv2.polylines(frame, self.bones, False, self.bone_color, self.thickness)
+            cv2.polylines(frame, self.joints, False, self.joint_color, self.joint_size)
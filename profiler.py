@@ -0,0 +1,149 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import signal
+import time
+import numpy as np
+from latency import NULL_PROBE, STAGES, STAGE_INDEX
+
+# ------------------------------
+# On-demand frame profiler
+# ------------------------------
+# For stutters in the field, where nothing can be attached to a fullscreen
+# window. FrameProfiler wraps the runner's probe (latency.py); F9 in the
+# pygame runner or SIGUSR1 (`kill -USR1 <pid>`) arms it, and the next
+# `frames` frames run under cProfile with per-stage timings. Then it writes
+# to profiles/:
+#   profile-<time>.txt   tags, per-stage table, top functions
+#   profile-<time>.prof  raw pstats (snakeviz, pstats.Stats)
+# Tags are the demo's gauges() (level, entity counts) at start and end.
+#
+# The runners call finish() on exit, so a session cut short by ESC or
+# the end of a recording still writes the frames it has.
+#
+# Armed or not, nothing is profiled until a request; idle, each hook is an
+# attribute check and a forward to the wrapped probe. Without --profile no
+# wrapper exists at all.
+#
+#   python space_air.py --profile 300    # then F9 or kill -USR1 <pid>
+
+
+class FrameProfiler:
+    def __init__(self, inner=None, frames=300, demo=None, out_dir="profiles",
+                 signum=getattr(signal, "SIGUSR1", None), top=40):
+        # demo: tagged with demo.gauges(); signum: None to leave signals alone
+        self.inner = inner or NULL_PROBE
+        self.frames = frames
+        self.demo = demo
+        self.out_dir = out_dir
+        self.top = top
+        self.pending = False
+        self.active = False
+        self.profile = None
+        self.dumps = []
+        if signum is not None:
+            # handler only sets a flag; the loop starts the session on its next frame
+            signal.signal(signum, lambda *_: self.request())
+
+    @property
+    def enabled(self):
+        return self.inner.enabled
+
+    @property
+    def source(self):
+        return getattr(self.inner, "source", None)
+
+    @source.setter
+    def source(self, value):
+        self.inner.source = value
+
+    def request(self):
+        if not self.active:
+            self.pending = True
+
+    # probe interface: forwarded, timed while a session is running
+    def begin(self):
+        if self.pending:
+            self._start()
+        self.inner.begin()
+        if self.active:
+            self.last = time.perf_counter()
+
+    def stamp(self, stage):
+        self.inner.stamp(stage)
+        if self.active:
+            t = time.perf_counter()
+            self.stages[self.frame, STAGE_INDEX[stage]] = t - self.last
+            self.last = t
+
+    def track(self, results):
+        self.inner.track(results)
+
+    def output(self, kind, now=False):
+        self.inner.output(kind, now)
+
+    def present(self):
+        self.inner.present()
+        if self.active:
+            self.stages[self.frame, STAGE_INDEX["present"]] = time.perf_counter() - self.last
+            self.frame += 1
+            if self.frame >= self.frames:
+                self._stop()
+
+    def finish(self):
+        # runner exit: write a session still in progress, with the frames it has
+        self.pending = False
+        if self.active:
+            self._stop()
+        self.inner.finish()
+
+    def _tags(self):
+        return dict(self.demo.gauges()) if self.demo is not None else {}
+
+    def _start(self):
+        self.pending = False
+        self.active = True
+        self.frame = 0
+        self.stages = np.full((self.frames, len(STAGES)), np.nan)
+        self.started_tags = self._tags()
+        self.started = time.time()
+        print(f"profiler: profiling {self.frames} frames")
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def _stop(self):
+        self.profile.disable()
+        self.active = False
+        elapsed = time.time() - self.started
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, time.strftime("profile-%Y%m%d-%H%M%S", time.localtime(self.started)))
+        self.profile.dump_stats(base + ".prof")
+        with open(base + ".txt", "w") as f:
+            f.write(self.report(elapsed))
+        self.profile = None
+        self.dumps.append(base)
+        print(f"profiler: wrote {base}.txt / .prof")
+
+    def report(self, elapsed):
+        title = getattr(self.demo, "title", "")
+        lines = [f"{title}: {self.frame} frames in {elapsed:.2f}s ({self.frame / elapsed:.1f} fps)",
+                 "tags at start: " + json.dumps(self.started_tags),
+                 "tags at end:   " + json.dumps(self._tags()), "",
+                 f"{'stage':<10} {'mean_ms':>8} {'p95_ms':>8} {'max_ms':>8} {'frames':>6}"]
+        stages = self.stages[:self.frame] * 1000
+        for name in STAGES:
+            values = stages[:, STAGE_INDEX[name]]
+            values = values[~np.isnan(values)]
+            if len(values):
+                lines.append(f"{name:<10} {values.mean():>8.2f} {np.percentile(values, 95):>8.2f} "
+                             f"{values.max():>8.2f} {len(values):>6}")
+        totals = np.nansum(stages, axis=1)
+        worst = int(np.argmax(totals)) if len(totals) else 0
+        lines.append(f"slowest frame: #{worst} {totals[worst] if len(totals) else 0:.2f} ms")
+        for sort in ("cumulative", "tottime"):
+            out = io.StringIO()
+            pstats.Stats(self.profile, stream=out).sort_stats(sort).print_stats(self.top)
+            lines += ["", f"--- by {sort} ---", out.getvalue()]
+        return "\n".join(lines) + "\n"
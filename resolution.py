@@ -0,0 +1,254 @@
+import argparse
+import json
+import os
+import time
+
+# ------------------------------
+# Capture / inference resolution tuning
+# ------------------------------
+# Landmarks come back normalized to the image the tracker saw, so the
+# tracker can run on a downscaled copy of the frame. InferenceView builds
+# that image (scale, then optional black border) and maps landmarks back to
+# exact frame pixels. tune() benchmarks capture sizes x inference scales
+# and picks the largest combination that still holds a target loop rate.
+# The choice is saved to resolution.json next to this file, and
+# open_camera()/Demo.prepare pick it up from there. Padding changes the
+# tracker image, so the scale is also kept per pad: tune with the pad the
+# demo runs with (space_air: 80) and it gets the scale measured for it.
+#
+#   python resolution.py --target-fps 30 [--pad 80] [--video clip.mp4]
+#   python resolution.py --hands 2 --compare-hands --video two_hands.mp4   # two-player budget
+
+CAPTURE_SIZES = [(1920, 1080), (1280, 720), (960, 540), (640, 480)]
+INFERENCE_SCALES = [1.0, 0.75, 0.5, 0.35]
+CHOICE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resolution.json")
+
+
+class InferenceView:
+    """Camera frame -> tracker image, and tracker landmarks -> frame pixels."""
+
+    def __init__(self, scale=1.0, pad=0):
+        # pad is in frame pixels, like space_air's edge padding
+        self.scale = scale
+        self.pad = pad
+        self.frame_size = None
+
+    def _fit(self, w, h):
+        s = self.scale
+        small = (max(1, round(w * s)), max(1, round(h * s)))
+        pad = round(self.pad * s)
+        self.frame_size = (w, h)
+        self.small = small
+        self.small_pad = pad
+        # per-axis factors: the rounded size is not exactly w*s
+        self.fx = w / small[0]
+        self.fy = h / small[1]
+
+    def image(self, frame):
+        import cv2
+        h, w = frame.shape[:2]
+        if (w, h) != self.frame_size:
+            self._fit(w, h)
+        if self.small != (w, h):
+            frame = cv2.resize(frame, self.small, interpolation=cv2.INTER_AREA)
+        pad = self.small_pad
+        if pad:
+            frame = cv2.copyMakeBorder(frame, pad, pad, pad, pad, cv2.BORDER_CONSTANT, value=[0,0,0])
+        return frame
+
+    def to_frame(self, lm):
+        # normalized landmark on the padded small image -> float frame pixels
+        pad = self.small_pad
+        x = (lm.x * (self.small[0] + 2*pad) - pad) * self.fx
+        y = (lm.y * (self.small[1] + 2*pad) - pad) * self.fy
+        return x, y
+
+    def to_frame_array(self, points):
+        # vectorized to_frame for an (n, 2+) array of normalized landmarks
+        pad = self.small_pad
+        out = points[:, :2] * (self.small[0] + 2*pad, self.small[1] + 2*pad) - pad
+        return out * (self.fx, self.fy)
+
+    @property
+    def inference_size(self):
+        pad = self.small_pad
+        return self.small[0] + 2*pad, self.small[1] + 2*pad
+
+
+# ------------------------------
+# Saved choice
+# ------------------------------
+def load_choice(path=CHOICE_FILE):
+    # None when the tuner hasn't been run
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_choice(choice, path=CHOICE_FILE):
+    # latest choice at the top level, plus the scale chosen for each pad so far
+    scales = (load_choice(path) or {}).get("scales", {})
+    scales[str(choice.get("pad", 0))] = choice["scale"]
+    with open(path, "w") as f:
+        json.dump(dict(choice, scales=scales), f, indent=2)
+
+
+def apply_capture_size(cap, size):
+    import cv2
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+
+
+def saved_capture_size(default=None):
+    choice = load_choice()
+    return tuple(choice["capture"]) if choice else default
+
+
+def saved_inference_scale(default=1.0, pad=0):
+    choice = load_choice()
+    if not choice:
+        return default
+    # the scale tuned with this pad, else the latest one
+    return choice.get("scales", {}).get(str(pad), choice["scale"])
+
+
+# ------------------------------
+# Benchmark
+# ------------------------------
+def measure(cap, tracker, view, frames=30, warmup=5):
+    """Loop rate of read -> view.image -> cvtColor -> tracker.process.
+
+    Returns (frame size, capture fps, processing ms, loop fps) or None if the
+    source stopped delivering frames.
+    """
+    import cv2
+    for _ in range(warmup):
+        success, frame = cap.read()
+        if not success:
+            return None
+    size = (frame.shape[1], frame.shape[0])
+    read_time = proc_time = 0.0
+    start = time.perf_counter()
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        success, frame = cap.read()
+        t1 = time.perf_counter()
+        if not success:
+            return None
+        tracker.process(cv2.cvtColor(view.image(frame), cv2.COLOR_BGR2RGB))
+        read_time += t1 - t0
+        proc_time += time.perf_counter() - t1
+    loop_fps = frames / (time.perf_counter() - start)
+    # a live camera blocks in read() until the next frame, so its fps is the
+    # arrival rate when processing keeps up; a file reads as fast as it decodes
+    return size, frames / max(read_time + proc_time, 1e-9), proc_time / frames * 1000, loop_fps
+
+
+def tune(cap, tracker, target_fps=30, pad=0, capture_sizes=CAPTURE_SIZES, scales=INFERENCE_SCALES,
+         frames=30, resize=True):
+    """Benchmark capture sizes x inference scales (largest first) and return
+    (choice, rows) where choice is the largest combination whose loop rate
+    reaches target_fps (or the fastest one if none does)."""
+    rows = []
+    seen = set()
+    for capture in capture_sizes if resize else [None]:
+        if capture is not None:
+            apply_capture_size(cap, capture)
+        for scale in scales:
+            view = InferenceView(scale, pad)
+            result = measure(cap, tracker, view, frames)
+            if result is None:
+                break
+            size, capture_fps, proc_ms, loop_fps = result
+            # the driver may round or ignore the request; skip duplicates
+            if (size, scale) in seen:
+                continue
+            seen.add((size, scale))
+            rows.append({"capture": list(size), "requested": list(capture) if capture else None,
+                         "scale": scale, "inference": list(view.inference_size),
+                         "capture_fps": round(capture_fps, 1), "process_ms": round(proc_ms, 2),
+                         "loop_fps": round(loop_fps, 1), "ok": loop_fps >= target_fps * 0.95})
+    if not rows:
+        raise RuntimeError("no frames from the capture source")
+    ok = [r for r in rows if r["ok"]]
+    pixels = lambda r: r["inference"][0] * r["inference"][1]
+    if ok:
+        best = max(ok, key=lambda r: (pixels(r), r["capture"][0] * r["capture"][1]))
+    else:
+        best = max(rows, key=lambda r: r["loop_fps"])
+    choice = dict(best, target_fps=target_fps, pad=pad)
+    return choice, rows
+
+
+def compare_hands(cap, view, frames=30, counts=(1, 2)):
+    """Processing ms of the same view with trackers for 1 and 2 hands.
+
+    The second hand costs a landmark pass, and with max_num_hands=2 the palm
+    detector also keeps running while fewer than two hands are tracked, so
+    measure on footage with the number of hands the mode will see.
+    """
+    from demo_runtime import HANDS_DEFAULT, hands_config, make_tracker
+    rows = []
+    for n in counts:
+        result = measure(cap, make_tracker(hands_config(n, HANDS_DEFAULT)), view, frames)
+        if result is None:
+            break
+        rows.append((n, result[2], result[3]))
+    return rows
+
+
+def report(choice, rows):
+    print(f"{'capture':>10} {'scale':>5} {'inference':>10} {'proc ms':>8} {'loop fps':>8}")
+    for r in rows:
+        mark = "*" if r["capture"] == choice["capture"] and r["scale"] == choice["scale"] else " "
+        print(f"{r['capture'][0]:>5}x{r['capture'][1]:<4} {r['scale']:>5} "
+              f"{r['inference'][0]:>5}x{r['inference'][1]:<4} {r['process_ms']:>8.1f} {r['loop_fps']:>8.1f} "
+              f"{'ok' if r['ok'] else '':>3}{mark}")
+    status = "meets" if choice["ok"] else "MISSES"
+    print(f"chosen: capture {choice['capture'][0]}x{choice['capture'][1]}, inference "
+          f"{choice['inference'][0]}x{choice['inference'][1]} (scale {choice['scale']}), "
+          f"{choice['loop_fps']} fps {status} target {choice['target_fps']}")
+
+
+def main(argv=None):
+    import cv2
+    from demo_runtime import HANDS_DEFAULT, hands_config, make_tracker
+    parser = argparse.ArgumentParser(description="Pick capture and inference resolution for a target loop rate")
+    parser.add_argument("--target-fps", type=float, default=30)
+    parser.add_argument("--pad", type=int, default=0, help="edge padding in frame pixels (space_air uses 80)")
+    parser.add_argument("--frames", type=int, default=30, help="timed frames per configuration")
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--video", help="benchmark on a recorded clip instead of the camera (scales only)")
+    parser.add_argument("--no-save", action="store_true", help=f"don't write {CHOICE_FILE}")
+    parser.add_argument("--hands", type=int, default=1, help="tune for a tracker with this max_num_hands (2: two-player modes)")
+    parser.add_argument("--compare-hands", action="store_true", help="then time the chosen setting with 1 and 2 hands")
+    args = parser.parse_args(argv)
+
+    cap = cv2.VideoCapture(args.video if args.video else args.camera)
+    tracker = make_tracker(hands_config(args.hands, HANDS_DEFAULT))
+    hand_rows = []
+    try:
+        choice, rows = tune(cap, tracker, args.target_fps, pad=args.pad, frames=args.frames,
+                            resize=not args.video)
+        if args.compare_hands:
+            if args.video:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            else:
+                apply_capture_size(cap, choice["capture"])
+            hand_rows = compare_hands(cap, InferenceView(choice["scale"], args.pad), args.frames)
+    finally:
+        cap.release()
+    choice["hands"] = args.hands
+    report(choice, rows)
+    for n, proc_ms, loop_fps in hand_rows:
+        extra = f" ({proc_ms / hand_rows[0][1] - 1:+.0%})" if n != hand_rows[0][0] else ""
+        print(f"{n} hand(s): {proc_ms:.1f} ms{extra}, {loop_fps:.1f} fps "
+              f"{'meets' if loop_fps >= args.target_fps * 0.95 else 'MISSES'} target {args.target_fps}")
+    if not args.no_save:
+        save_choice(choice)
+        print(f"saved to {CHOICE_FILE}")
+
+
+if __name__ == "__main__":
+    main()
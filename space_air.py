@@ -1,40 +1,37 @@
-import cv2
-import mediapipe as mp
 import pygame
 import random
-import math
 import time
 import os
+import sys
+import argparse
+import space_sim
+from space_sim import SIM_DT, SIM_HZ, POWERUP_SPEED
+from space_gravity import CORE
+from startup import Startup
+from asset_cache import AssetCache, LazyAssets
+from audio import AudioManager
+from hud import Hud, text_cache
+from demo_runtime import Demo, add_input_args, build_tracker as build_demo_tracker, hands_config, open_camera as open_tuned_camera, run_pygame
+from gestures import GestureTracker
+from hand_assign import HandAssigner
+from overlay import landmark_array
+from latency import LatencyProbe
+from memwatch import MemoryWatch
+from profiler import FrameProfiler
+from space_replay import SessionRecorder
+from resolution import InferenceView, saved_capture_size, saved_inference_scale
+
+# cv2 and mediapipe are imported lazily (on startup worker threads when run
+# standalone), so loading this module as a launcher plugin stays cheap
 
 # ------------------------------
 # Config
 # ------------------------------
-# Non-linear score thresholds for boss per level
-LEVEL_BOSS_THRESHOLDS = [150, 500, 1000, 2000, 3500, 5500]  # extend as needed
-
-# ------------------------------
-# MediaPipe Hand Tracking
-# ------------------------------
-mp_hands = mp.solutions.hands
-mp_draw = mp.solutions.drawing_utils
-cap = cv2.VideoCapture(0)
-cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.7)
-
-# ------------------------------
-# Pygame Setup
-# ------------------------------
-pygame.init()
-win = pygame.display.set_mode((0,0), pygame.FULLSCREEN)
-info = pygame.display.Info()
-WIDTH, HEIGHT = info.current_w, info.current_h
-pygame.display.set_caption("Air Space VR Shooter - Sabrina Blais (who should be sleeping by now...)")
-
-clock = pygame.time.Clock()
-font_big = pygame.font.SysFont("Arial", 80)
-font_med = pygame.font.SysFont("Arial", 50)
-font_small = pygame.font.SysFont("Arial", 30)
+MAX_FRAME_TIME = 0.25  # clamp huge stalls so we don't spiral catching up
+TRACKER = ("hands", (("max_num_hands", 1), ("min_detection_confidence", 0.7),
+                     ("min_tracking_confidence", 0.7)))
+# two-player co-op: one inference pass tracks both hands (hand_assign.py)
+TRACKER_2P = hands_config(2, TRACKER)
 
 # ------------------------------
 # Colors
@@ -46,402 +43,478 @@ YELLOW = (255,255,0)
 BLUE = (0,150,255)
 STAR_COLOR = (200,200,255)
 PARTICLE_COLOR = (255,200,50)
+TRAIL_COLOR = (120,120,0)
+WELL_COLOR = (110,60,200)
+PROJECTILE_COLOR = (255,80,200)
+PLAYER2_TINT = (120,255,160)
+BANNER_COLORS = {"boss": RED, "level": BLUE, "game_over": RED}
 
 # ------------------------------
-# Load Assets
+# Startup tasks (run concurrently, see startup.py)
 # ------------------------------
-ASSET_DIR = os.path.join(os.getcwd(), "space_game")
-def load_image(name):
-    return pygame.image.load(os.path.join(ASSET_DIR, name)).convert_alpha()
-def load_sound(name):
-    return pygame.mixer.Sound(os.path.join(ASSET_DIR, name))
-
-# NOTE: If any file missing this will throw; keep assets in space_game folder.
-ship_img = load_image("ship.png")
-enemy_img = load_image("enemy.png")
-boss_img = load_image("boss.png")
-heart_img = load_image("heart.png")
-
-laser_sounds = [load_sound("laser1.wav"), load_sound("laser13.wav")]
-enemy_attack_sound = load_sound("enemy_attack.wav")
-explosion_sound = load_sound("explosion.wav")
-powerup_sound = load_sound("powerup.wav")
-pygame.mixer.music.load(os.path.join(ASSET_DIR,"background.mp3"))
-pygame.mixer.music.play(-1)
+def build_tracker(govern=None, backend="solutions", players=1):
+    return build_demo_tracker(TRACKER_2P if players > 1 else TRACKER, govern, backend)
 
-# ------------------------------
-# Game State
-# ------------------------------
-def create_state():
-    return {
-        "player": {
-            "x": WIDTH//2,
-            "y": HEIGHT-150,
-            "prev_x": None,
-            "prev_y": None,
-            "life": 5,
-            # "shield": False,    # removed
-            "pinch_cooldown": 0,
-            "invincible": 0
-        },
-        "bullets": [],
-        "enemy_bullets": [],
-        "enemies": [],
-        "bosses": [],
-        "particles": [],
-        "powerups": [],
-        "score": 0,
-        "level": 1,
-        "enemy_spawn_timer": 0,
-        "boss_spawned": False,
-        "running": True,
-        "game_over": False,
-        "menu": True
-    }
+def open_camera():
+    # 1280x720 unless resolution.py picked something else
+    return open_tuned_camera(size=saved_capture_size((1280, 720)))
 
-# ------------------------------
-# Stars
-# ------------------------------
-stars = [[random.randint(0,WIDTH), random.randint(0,HEIGHT), random.randint(1,3)] for _ in range(120)]
+ASSET_DIR = os.path.join(os.getcwd(), "space_game")
+IMAGE_FILES = {"ship": "ship.png", "enemy": "enemy.png", "boss": "boss.png", "heart": "heart.png"}
+SOUND_FILES = {"laser1": "laser1.wav", "laser13": "laser13.wav", "enemy_attack": "enemy_attack.wav",
+               "explosion": "explosion.wav", "powerup": "powerup.wav"}
+
+def load_assets(cache=True, warm=False):
+    # decode only; convert_alpha() needs the display and runs on the main thread.
+    # Each asset loads on first access, from the pre-converted cache unless
+    # cache=False (asset_cache.py); warm=True loads them all now (startup worker)
+    assets = AssetCache(ASSET_DIR, enabled=cache)
+    images = LazyAssets(assets.image, IMAGE_FILES)
+    sounds = LazyAssets(assets.sound, SOUND_FILES)
+    if warm:
+        images.warm()
+        sounds.warm()
+        print(assets.summary())
+    return images, sounds
+
+def load_music():
+    path = os.path.join(ASSET_DIR, "background.mp3")
+    if not os.path.exists(path):
+        print(f"assets: {path} missing, no music")
+        return False
+    pygame.mixer.music.load(path)
+    return True
 
 # ------------------------------
 # Helper Functions
 # ------------------------------
 def draw_text_centered(surface, text, font, color, y_offset=0):
-    rendered = font.render(text, True, color)
-    rect = rendered.get_rect(center=(WIDTH//2, HEIGHT//2 + y_offset))
+    rendered = text_cache.render(font, text, color)
+    cx, cy = surface.get_rect().center
+    rect = rendered.get_rect(center=(cx, cy + y_offset))
     surface.blit(rendered, rect)
 
-def spawn_explosion(state, x, y, count=15):
-    for _ in range(count):
-        state["particles"].append([x, y, random.randint(2,5), random.uniform(-2,2), random.uniform(-2,2)])
-
-def draw_hearts(top_left_x, top_left_y, life):
-    for i in range(max(0, life)):
-        win.blit(pygame.transform.scale(heart_img, (36,36)), (top_left_x + i*40, top_left_y))
-
-def apply_gravity(state):
-    for gz in state.get("gravity_zones", []):
-        gx, gy, r = gz
-        for b in state["bullets"]:
-            dx, dy = gx-b["x"], gy-b["y"]
-            dist = math.hypot(dx, dy)
-            if dist < r and dist != 0:
-                b["x"] += dx/dist*0.5
-                b["y"] += dy/dist*0.5
-        for e in state["enemies"]:
-            dx, dy = gx-e["x"], gy-e["y"]
-            dist = math.hypot(dx, dy)
-            if dist < r and dist != 0:
-                e["x"] += dx/dist*0.3
-                e["y"] += dy/dist*0.3
-
-def draw_game(state):
-    win.fill(BLACK)
-    # Stars warp
-    for star in stars:
-        pygame.draw.circle(win, STAR_COLOR, (star[0], star[1]), star[2])
-        # safe prev_x usage
-        prev_x = state["player"]["prev_x"] if state["player"]["prev_x"] is not None else state["player"]["x"]
-        star[1] += max(1, abs(state["player"]["x"] - prev_x)//15)
-        if star[1] > HEIGHT:
-            star[0] = random.randint(0, WIDTH)
-            star[1] = 0
-            star[2] = random.randint(1,3)
-
-    # Player
-    player = state["player"]
-    img = pygame.transform.scale(ship_img, (100,100))
-    win.blit(img, (player["x"]-50, player["y"]-50))
-
-    # Draw hearts in top-left so they're always visible
-    draw_hearts(10, 10, player["life"])
-
-    # Bullets & trails
-    for b in state["bullets"]:
-        pygame.draw.rect(win, YELLOW, (b["x"]-5, b["y"], 10, 20))
-        for t in b.get("trail", []):
-            pygame.draw.circle(win, YELLOW, t, 3)
-
-    # Enemy bullets
-    for eb in state["enemy_bullets"]:
-        pygame.draw.rect(win, RED, (eb["x"]-5, eb["y"], 10, 20))
-
-    # Enemies
-    for e in state["enemies"]:
-        win.blit(pygame.transform.scale(enemy_img, (60,50)), (e["x"], e["y"]))
-
-    # Bosses (with life bar)
-    for boss in state["bosses"]:
-        win.blit(pygame.transform.scale(boss_img, (150,150)), (int(boss["x"]), int(boss["y"])))
-        # boss life bar
-        max_life = boss.get("max_life", boss["life"])
-        life_ratio = boss["life"] / max_life if max_life > 0 else 0
-        bar_w = 300
-        pygame.draw.rect(win, (100,100,100), (WIDTH//2 - bar_w//2, 20, bar_w, 18))
-        pygame.draw.rect(win, RED, (WIDTH//2 - bar_w//2, 20, int(bar_w * life_ratio), 18))
-
-    # Particles
-    for p in state["particles"]:
-        pygame.draw.circle(win, PARTICLE_COLOR, (int(p[0]), int(p[1])), int(p[2]))
-
-    # Power-ups
-    for pu in state["powerups"]:
-        win.blit(pygame.transform.scale(heart_img, (36,36)), (pu[0]-18, pu[1]-18))
-
-    # HUD
-    score_text = font_small.render(f"Score: {state['score']}", True, WHITE)
-    win.blit(score_text, (10, 56))
-    level_text = font_small.render(f"Level: {state['level']}", True, WHITE)
-    win.blit(level_text, (WIDTH-150, 10))
-
-    pygame.display.update()
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+def interp_pos(ent, alpha):
+    # render position between the previous and current simulation tick
+    return lerp(ent.px, ent.x, alpha), lerp(ent.py, ent.y, alpha)
+
+# Map a landmark from the (scaled, padded) tracker image back to original
+# camera coords (no extra flip)
+def landmark_to_screen(lm, view, orig_w, orig_h):
+    x, y = view.to_frame(lm)
+    x = max(0, min(orig_w-1, int(x)))
+    y = max(0, min(orig_h-1, int(y)))
+    return x, y
+
 
 # ------------------------------
-# Main Loop
+# Game
 # ------------------------------
-state = create_state()
+class SpaceDemo(Demo):
+    title = "Air Space VR Shooter"
+    tracker = TRACKER
+    # Mirror can cause inverted controls. Disable to get natural mapping.
+    mirror = False
+
+    def __init__(self, assets=None, music=False, pad=80, inference_scale=None, session=None, players=1):
+        # assets: decoded (images, sounds) from the startup orchestrator, else
+        # loaded in start(); pad: (optional) padding to improve edge detection
+        # (0 for service landmarks, which are unpadded); inference_scale: None
+        # uses the tuned one (resolution.py); session: path to record the
+        # run to (space_replay.py); players: 2 for two-hand co-op
+        self.assets = assets
+        self.music = music
+        self.players = players
+        self.assigner = None
+        if players > 1:
+            self.tracker = TRACKER_2P
+            self.assigner = HandAssigner(players)
+        self.session = session
+        self.recorder = None
+        if inference_scale is None:
+            inference_scale = saved_inference_scale(pad=pad) if pad else 1.0
+        self.view = InferenceView(inference_scale, pad)
+
+    def prepare(self, frame):
+        import cv2
+        if self.mirror:
+            frame = cv2.flip(frame, 1)
+        return frame, cv2.cvtColor(self.view.image(frame), cv2.COLOR_BGR2RGB)
+
+    def start(self, screen):
+        super().start(screen)
+        self.width, self.height = screen.get_size()
+        self.font_big = pygame.font.SysFont("Arial", 80)
+        self.font_small = pygame.font.SysFont("Arial", 30)
+
+        if self.assets is None:
+            self.assets = load_assets()
+        images, sounds = self.assets
+        self.ship_img = pygame.transform.scale(images["ship"].convert_alpha(), (100,100))
+        ship2_img = self.ship_img.copy()
+        ship2_img.fill(PLAYER2_TINT + (255,), special_flags=pygame.BLEND_RGBA_MULT)
+        self.ship_imgs = [self.ship_img, ship2_img]
+        self.enemy_img = pygame.transform.scale(images["enemy"].convert_alpha(), (60,50))
+        self.boss_img = pygame.transform.scale(images["boss"].convert_alpha(), (150,150))
+        self.heart_icon = pygame.transform.scale(images["heart"].convert_alpha(), (36,36))
+        # boss pattern bullet, blitted in one batch per frame
+        self.projectile_img = pygame.Surface((12, 12), pygame.SRCALPHA)
+        pygame.draw.circle(self.projectile_img, PROJECTILE_COLOR, (6, 6), 6)
+        pygame.draw.circle(self.projectile_img, WHITE, (6, 6), 3)
+
+        self.hud = Hud((self.width, 100))
+        self.hud.add_widget("life", self.draw_hearts)
+        if self.players > 1:
+            # second player's hearts top-right, under the level
+            self.hud.add_widget("life2", lambda surface, life: self.draw_hearts(surface, life, right=True))
+        self.hud.add_text("score", self.font_small, (10, 56), "Score: {}", WHITE)
+        self.hud.add_text("level", self.font_small, (self.width-150, 10), "Level: {}", WHITE)
+
+        # Sound effects share a fixed voice pool with per-effect caps (see audio.py)
+        self.audio = AudioManager(voices=16)
+        self.audio.add("laser", [sounds["laser1"], sounds["laser13"]], max_voices=3, min_interval=0.05, priority=2)
+        self.audio.add("explosion", sounds["explosion"], max_voices=4, min_interval=0.04, priority=1)
+        self.audio.add("enemy_attack", sounds["enemy_attack"], max_voices=2, min_interval=0.08, priority=1)
+        self.audio.add("powerup", sounds["powerup"], max_voices=1, min_interval=0, priority=3)
+        if self.music:
+            pygame.mixer.music.play(-1)
+
+        # Stars
+        self.stars = [[random.randint(0,self.width), random.randint(0,self.height), random.randint(1,3)]
+                      for _ in range(120)]
+
+        # an explicit seed so a recorded session can be replayed exactly
+        self.state = space_sim.create_state(self.width, self.height, seed=random.randrange(2**31),
+                                            players=self.players)
+        self.state["menu"] = False
+        if self.session:
+            self.recorder = SessionRecorder(self.session)
+            self.recorder.begin(self.state)
+        # control input per player sampled from the camera, consumed by the
+        # simulation ticks (step() takes the list with more than one player)
+        self.controls = [space_sim.new_control() for _ in range(self.players)]
+        self.control = self.controls if self.players > 1 else self.controls[0]
+        # index-tip motion history (frame-normalized); an upward flick fires
+        self.gestures = [GestureTracker() for _ in range(self.players)]
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+
+    def stop(self):
+        print(self.audio.summary())
+        if self.recorder is not None:
+            self.recorder.close()
+            print(self.recorder.summary() + f" -> {self.session}")
+        if self.music:
+            pygame.mixer.music.stop()
+
+    def gauges(self):
+        state = self.state
+        values = {kind: len(state[kind]) for kind in
+                  ("bullets", "enemy_bullets", "enemies", "bosses", "particles", "powerups", "projectiles")}
+        values["pooled"] = sum(pool.created for pool in state["pools"].values())
+        values["level"] = state["level"]
+        return values
+
+    def draw_hearts(self, surface, life, right=False):
+        for i in range(max(0, life)):
+            surface.blit(self.heart_icon, (self.width - 46 - i*40, 56) if right else (10 + i*40, 10))
+
+    # Stars scroll with horizontal ship movement (cosmetic, once per tick)
+    def scroll_stars(self):
+        state = self.state
+        if state["banner"] is not None:
+            return
+        player = state["player"]
+        prev_x = player["prev_x"] if player["prev_x"] is not None else player["x"]
+        for star in self.stars:
+            star[1] += max(1, abs(player["x"] - prev_x)//15)
+            if star[1] > self.height:
+                star[0] = random.randint(0, self.width)
+                star[1] = 0
+                star[2] = random.randint(1,3)
+
+    def on_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            return False
+
+    def steer(self, control, gestures, handLms, w0, h0):
+        # one tracked hand -> one player's control
+        WIDTH, HEIGHT = self.width, self.height
+        # map tips back to original frame coords
+        index_tip = handLms.landmark[8]
+        thumb_tip = handLms.landmark[4]
+        ix, iy = landmark_to_screen(index_tip, self.view, w0, h0)
+        tx, ty = landmark_to_screen(thumb_tip, self.view, w0, h0)
+
+        # map camera coords to game window coords (clamped)
+        control["x"] = int(max(50, min(WIDTH-50, ix / w0 * WIDTH)))
+        control["y"] = int(max(80, min(HEIGHT-80, iy / h0 * HEIGHT)))
+
+        # Pinch to shoot (latched until the next tick consumes it)
+        pinch_distance = ((tx - ix)**2 + (ty - iy)**2)**0.5
+        if pinch_distance < 30:
+            control["pinch"] = True
+
+        # Flick up to shoot too: uses the fingertip's velocity, so it
+        # reads a fast jab the pinch distance can't see
+        points = landmark_array(handLms)
+        points[:, :2] = self.view.to_frame_array(points) / (w0, h0)
+        if "flick_up" in gestures.update(points):
+            control["pinch"] = True
+
+    def on_frame(self, frame, results):
+        state, control = self.state, self.control
+
+        if frame is not None:
+            h0, w0 = frame.shape[:2]
+            if self.assigner is not None:
+                # same player keeps the same hand across frames
+                hands = self.assigner.assign_results(results)
+            elif results.multi_hand_landmarks:
+                hands = results.multi_hand_landmarks[:1]
+            else:
+                hands = [None]
+            for player_control, gestures, handLms in zip(self.controls, self.gestures, hands):
+                if handLms is not None:
+                    self.steer(player_control, gestures, handLms, w0, h0)
+                else:
+                    # keep last position if no hand detected; a motion gesture
+                    # can't span the gap
+                    gestures.reset()
+
+        # Advance the simulation in fixed steps for however much real time passed
+        now = time.perf_counter()
+        self.accumulator += min(now - self.last_time, MAX_FRAME_TIME)
+        self.last_time = now
+        ships = [(player["x"], player["y"]) for player in state["players"]]
+        while self.accumulator >= SIM_DT:
+            if self.recorder is not None:
+                self.recorder.tick(state, control)
+            space_sim.step(state, control)
+            self.scroll_stars()
+            self.accumulator -= SIM_DT
+        if [(player["x"], player["y"]) for player in state["players"]] != ships:
+            self.probe.output("ship")
+        for kind, name in state["events"]:
+            if kind == "sound":
+                self.audio.play(name)
+                if name == "laser":
+                    self.probe.output("shot")
+        state["events"].clear()
+
+        # Game over: wait for the banner to finish, then exit
+        if state["game_over"] and state["banner"] is None:
+            return False
+
+    def draw(self):
+        # Draw everything, interpolated between the last two ticks. While a
+        # banner pauses the world nothing moves, so draw the current positions
+        # (interpolating or back-extrapolating would jitter in place)
+        alpha = 1.0 if self.state["banner"] is not None else self.accumulator / SIM_DT
+        self.draw_game(self.state, alpha)
+
+    def draw_game(self, state, alpha):
+        win = self.screen
+        WIDTH = self.width
+        win.fill(BLACK)
+        # Stars warp
+        for star in self.stars:
+            pygame.draw.circle(win, STAR_COLOR, (star[0], star[1]), star[2])
+
+        # Gravity wells: rim and core (the pull peaks at the core's edge)
+        for x, y, r, _, expires in state["gravity_zones"]:
+            # flicker during the last second before the well closes
+            if expires - state["tick"] > SIM_HZ or state["tick"] % 8 < 4:
+                pygame.draw.circle(win, WELL_COLOR, (x, y), r, 2)
+                pygame.draw.circle(win, WELL_COLOR, (x, y), int(r * CORE))
+
+        # Players (a ship out of lives is gone until game over)
+        for player, ship_img in zip(state["players"], self.ship_imgs):
+            if player["life"] <= 0 and len(state["players"]) > 1:
+                continue
+            ship_x = lerp(player.get("px", player["x"]), player["x"], alpha)
+            ship_y = lerp(player.get("py", player["y"]), player["y"], alpha)
+            win.blit(ship_img, (ship_x-50, ship_y-50))
+
+        # Bullets & trails: each trail is one polyline read from the shared ring
+        # buffer (dim full length, bright newest half on top)
+        bullets = state["bullets"]
+        if bullets:
+            trails, counts = state["trails"].ordered([b.slot for b in bullets])
+            for b, trail, n in zip(bullets, trails, counts):
+                bx, by = interp_pos(b, alpha)
+                if n > 0:
+                    points = [(bx, by)] + trail[:n].tolist()
+                    pygame.draw.lines(win, TRAIL_COLOR, False, points, 3)
+                    pygame.draw.lines(win, YELLOW, False, points[:n // 2 + 2], 3)
+                pygame.draw.rect(win, YELLOW, (bx-5, by, 10, 20))
+
+        # Enemy bullets
+        for eb in state["enemy_bullets"]:
+            ebx, eby = interp_pos(eb, alpha)
+            pygame.draw.rect(win, RED, (ebx-5, eby, 10, 20))
+
+        # Boss pattern bullets (velocity is per second, back-extrapolated
+        # to the render time like the particles)
+        projectiles = state["projectiles"]
+        if projectiles.count:
+            x, y, vx, vy = projectiles.live[:4]
+            back = SIM_DT * (1 - alpha)
+            xs = (x - vx * back - 6).astype(int).tolist()
+            ys = (y - vy * back - 6).astype(int).tolist()
+            img = self.projectile_img
+            win.blits([(img, pos) for pos in zip(xs, ys)], doreturn=False)
+
+        # Enemies
+        for e in state["enemies"]:
+            win.blit(self.enemy_img, interp_pos(e, alpha))
 
-while True:
-    clock.tick(60)
-    # read frame from camera
-    ret, frame = cap.read()
-    if not ret:
-        continue
+        # Bosses (with life bar)
+        for boss in state["bosses"]:
+            bx, by = interp_pos(boss, alpha)
+            win.blit(self.boss_img, (int(bx), int(by)))
+            # boss life bar
+            life_ratio = boss.life / boss.max_life if boss.max_life > 0 else 0
+            bar_w = 300
+            pygame.draw.rect(win, (100,100,100), (WIDTH//2 - bar_w//2, 20, bar_w, 18))
+            pygame.draw.rect(win, RED, (WIDTH//2 - bar_w//2, 20, int(bar_w * life_ratio), 18))
 
-    # Mirror can cause inverted controls. Disable to get natural mapping.
-    MIRROR = False  # set False to stop horizontal mirroring
-
-    if MIRROR:
-        frame = cv2.flip(frame, 1)
-
-    # (Optional) padding to improve edge detection
-    PAD = 80
-    padded = cv2.copyMakeBorder(frame, PAD, PAD, PAD, PAD, cv2.BORDER_CONSTANT, value=[0,0,0])
-    rgb = cv2.cvtColor(padded, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
-
-    # Map a landmark from padded image back to original camera coords (no extra flip)
-    def landmark_to_screen(lm, orig_w, orig_h, pad=PAD, padded_w=None, padded_h=None):
-        pw = padded_w if padded_w is not None else (orig_w + 2*pad)
-        ph = padded_h if padded_h is not None else (orig_h + 2*pad)
-        x_padded = int(lm.x * pw)
-        y_padded = int(lm.y * ph)
-        x = x_padded - pad
-        y = y_padded - pad
-        x = max(0, min(orig_w-1, x))
-        y = max(0, min(orig_h-1, y))
-        return x, y
-
-    h0, w0 = frame.shape[:2]
-    if results.multi_hand_landmarks:
-        for handLms in results.multi_hand_landmarks:
-            mp_draw.draw_landmarks(padded, handLms, mp_hands.HAND_CONNECTIONS)
-
-            # map tips back to original frame coords
-            index_tip = handLms.landmark[8]
-            thumb_tip = handLms.landmark[4]
-            ix, iy = landmark_to_screen(index_tip, w0, h0)
-            tx, ty = landmark_to_screen(thumb_tip, w0, h0)
-
-            # Set player pos directly from camera coordinates (NO inversion)
-            state["player"]["prev_x"] = state["player"]["x"]
-            state["player"]["prev_y"] = state["player"]["y"]
-            # map camera coords to game window coords (clamped)
-            state["player"]["x"] = int(max(50, min(WIDTH-50, ix / w0 * WIDTH)))
-            state["player"]["y"] = int(max(80, min(HEIGHT-80, iy / h0 * HEIGHT)))
-
-            # Pinch to shoot (unchanged)
-            pinch_distance = ((tx - ix)**2 + (ty - iy)**2)**0.5
-            if pinch_distance < 30 and state["player"]["pinch_cooldown"] <= 0:
-                state["bullets"].append({"x": state["player"]["x"], "y": state["player"]["y"], "trail": []})
-                random.choice(laser_sounds).play()
-                state["player"]["pinch_cooldown"] = 10
-
-            if state["player"]["pinch_cooldown"] > 0:
-                state["player"]["pinch_cooldown"] -= 1
+        # Particles (velocity is per tick, so back-extrapolate to the previous tick)
+        for p in state["particles"]:
+            px = p[0] - p[3] * (1 - alpha)
+            py = p[1] - p[4] * (1 - alpha)
+            pygame.draw.circle(win, PARTICLE_COLOR, (int(px), int(py)), int(p[2]))
+
+        # Power-ups
+        for pu in state["powerups"]:
+            pu_y = pu[1] - POWERUP_SPEED * SIM_DT * (1 - alpha)
+            win.blit(self.heart_icon, (pu[0]-18, pu_y-18))
+
+        # HUD (hearts top-left so they're always visible); only re-rendered on change
+        players = state["players"]
+        self.hud.update(life=players[0]["life"], score=state["score"], level=state["level"])
+        if len(players) > 1:
+            self.hud.set("life2", players[1]["life"])
+        self.hud.draw(win)
+
+        if state["banner"] is not None:
+            banner = state["banner"]
+            draw_text_centered(win, banner["text"], self.font_big, BANNER_COLORS[banner["kind"]])
+
+
+def create_demo(players=1):
+    return SpaceDemo(players=players)
+
+
+# ------------------------------
+# Standalone: concurrent startup, menu, then the game
+# ------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Air Space VR Shooter")
+    add_input_args(parser)
+    parser.add_argument("--profile", type=int, metavar="FRAMES",
+                        help="profile FRAMES frames on F9 or SIGUSR1, written to profiles/")
+    parser.add_argument("--memwatch", type=float, metavar="SECONDS",
+                        help="log memory, GC and entity gauges every SECONDS to memwatch.log")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1,
+                        help="2: co-op, one ship per tracked hand")
+    parser.add_argument("--no-asset-cache", action="store_true",
+                        help="decode assets from the sources (startup time comparison)")
+    parser.add_argument("--record-session", metavar="PATH",
+                        help="record inputs and state snapshots for space_replay.py")
+    args = parser.parse_args()
+
+    # mixer must be up before sounds decode on the worker
+    pygame.mixer.init()
+
+    boot = Startup()
+    if args.service:
+        from landmark_service import ServiceClient
+        # the service owns camera and model; one client stands in for both
+        boot.submit("service", ServiceClient)
     else:
-        # keep last position if no hand detected
-        pass
-
-    # Move bullets
-    for b in state["bullets"][:]:
-        b["trail"].append((b["x"], b["y"]))
-        if len(b["trail"]) > 8:
-            b["trail"].pop(0)
-        b["y"] -= 14
-        if b["y"] < -20:
-            state["bullets"].remove(b)
-
-    # Spawn enemies
-    state["enemy_spawn_timer"] += 1
-    if state["enemy_spawn_timer"] >= max(30, 50 - state["level"]*5):
-        state["enemy_spawn_timer"] = 0
-        ex = random.randint(30, WIDTH-90)
-        state["enemies"].append({"x": ex, "y": -40, "split": random.choice([False, True, False])})
-
-    player = state["player"]
-
-    # Move enemies and handle collisions
-    for e in state["enemies"][:]:
-        e["y"] += 2 + state["level"] * 0.5
-        # enemy shooting (later levels)
-        if random.random() < 0.005 * state["level"]:
-            state["enemy_bullets"].append({"x": e["x"] + 30, "y": e["y"] + 50})
-
-        # collision with player bullets
-        for b in state["bullets"][:]:
-            if e["x"] < b["x"] < e["x"] + 60 and e["y"] < b["y"] < e["y"] + 50:
-                state["score"] += 10
-                spawn_explosion(state, e["x"] + 30, e["y"] + 25)
-                explosion_sound.play()
-                if e["split"]:
-                    state["enemies"].append({"x": e["x"] - 30, "y": e["y"], "split": False})
-                    state["enemies"].append({"x": e["x"] + 30, "y": e["y"], "split": False})
-                if e in state["enemies"]:
-                    state["enemies"].remove(e)
-                if b in state["bullets"]:
-                    state["bullets"].remove(b)
-                break
-
-        # collision with player (body)
-        if e["y"] + 50 >= player["y"] and abs(e["x"] + 30 - player["x"]) < 50 and not player["shield"]:
-            # only apply damage if not currently invincible
-            if player["invincible"] == 0:
-                player["life"] -= 1
-                player["invincible"] = 60  # 1 second invincibility
-                spawn_explosion(state, player["x"], player["y"])
-                explosion_sound.play()
-                if player["life"] <= 0:
-                    state["game_over"] = True
-                    state["running"] = False
-            if e in state["enemies"]:
-                state["enemies"].remove(e)
-
-    # Enemy collisions: touching an enemy damages the player (do NOT kill the enemy)
-    player = state["player"]
-    px, py = player["x"], player["y"]
-    for e in state["enemies"][:]:
-        ex, ey = e.get("x", 0), e.get("y", 0)
-        ew, eh = e.get("w", 60), e.get("h", 50)
-
-        # Simple AABB (rectangle) collision between player and enemy
-        if (px + 40 > ex and px - 40 < ex + ew and
-            py + 40 > ey and py - 40 < ey + eh):
-            # Damage player if not invincible
-            if player["invincible"] == 0:
-                player["life"] -= 1
-                player["invincible"] = 60  # frames of invincibility
-                spawn_explosion(state, px, py, count=10)
-                explosion_sound.play()
-                if player["life"] <= 0:
-                    state["game_over"] = True
-            # do NOT remove or kill the enemy here
-    # Move enemy bullets and handle collisions with player
-    for eb in state["enemy_bullets"][:]:
-        eb["y"] += 8 + state["level"]*0.2
-
-        if abs(eb["x"] - player["x"]) < 40 and abs(eb["y"] - player["y"]) < 40:
-            if player["invincible"] == 0:
-                player["life"] -= 1
-                player["invincible"] = 60
-                spawn_explosion(state, player["x"], player["y"], count=10)
-                explosion_sound.play()
-                if player["life"] <= 0:
-                    state["game_over"] = True
-            try:
-                state["enemy_bullets"].remove(eb)
-            except ValueError:
-                pass
-            continue
-
-        if eb["y"] > HEIGHT + 20:
-            try:
-                state["enemy_bullets"].remove(eb)
-            except ValueError:
-                pass
-
-    # Power-ups: heart drops
-    if random.random() < 0.002:
-        px = random.randint(50, WIDTH - 50)
-        state["powerups"].append([px, -20])
-    for pu in state["powerups"][:]:
-        pu[1] += 2
-        if abs(pu[0] - player["x"]) < 40 and abs(pu[1] - player["y"]) < 40:
-            if player["life"] < 5:
-                player["life"] += 1
-            powerup_sound.play()
-            state["powerups"].remove(pu)
-        elif pu[1] > HEIGHT + 20:
-            state["powerups"].remove(pu)
-
-    # reduce invincibility timer
-    if player["invincible"] > 0:
-        player["invincible"] -= 1
-
-    # Apply gravity (optional)
-    apply_gravity(state)
-
-    # Boss spawn using LEVEL_BOSS_THRESHOLDS
-    current_threshold = LEVEL_BOSS_THRESHOLDS[min(state["level"] - 1, len(LEVEL_BOSS_THRESHOLDS) - 1)]
-    if state["score"] >= current_threshold and not state["boss_spawned"]:
-        boss_life = 50 + state["level"] * 20
-        state["bosses"].append({"x": WIDTH//2 - 75, "y": 50, "life": boss_life, "max_life": boss_life, "speed_x": 3 + state["level"]*0.5})
-        state["boss_spawned"] = True
-        draw_text_centered(win, f"Level {state['level']} - Boss Incoming!", font_big, RED)
-        pygame.display.update()
-        pygame.time.delay(1400)
-
-    # Move bosses (horizontal only) and handle their bullets & collisions
-    for boss in state["bosses"][:]:
-        boss["x"] += boss["speed_x"]
-        if boss["x"] <= 0 or boss["x"] >= WIDTH - 150:
-            boss["speed_x"] *= -1
-        # boss shoots
-        if random.random() < 0.02 + state["level"] * 0.001:
-            state["enemy_bullets"].append({"x": boss["x"] + 75, "y": boss["y"] + 100})
-            enemy_attack_sound.play()
-        # collision with player bullets
-        for b in state["bullets"][:]:
-            if boss["x"] < b["x"] < boss["x"] + 150 and boss["y"] < b["y"] < boss["y"] + 150:
-                boss["life"] -= 1
-                spawn_explosion(state, b["x"], b["y"], count=6)
-                if b in state["bullets"]:
-                    state["bullets"].remove(b)
-                if boss["life"] <= 0:
-                    state["score"] += 50
-                    explosion_sound.play()
-                    if boss in state["bosses"]:
-                        state["bosses"].remove(boss)
-            
-            
-            
-            
-                    state["level"] += 1
-                    state["boss_spawned"] = False
-                    draw_text_centered(win, f"Level {state['level']}", font_big, BLUE)
-                    pygame.display.update()
-                    pygame.time.delay(1200)
-                    break
-
-    # Move particles
-    for p in state["particles"][:]:
-        p[0] += p[3]; p[1] += p[4]; p[2] -= 0.12
-        if p[2] <= 0:
-            state["particles"].remove(p)
-
-    # Draw everything
-    draw_game(state)
-
-    # Game over handling inside loop (so UI updates before exit)
-    if state["game_over"]:
+        boot.submit("tracker", build_tracker, args.govern, args.backend, args.players)
+        boot.submit("camera", open_camera)
+    boot.submit("assets", load_assets, not args.no_asset_cache, True)
+    boot.submit("music", load_music, optional=True)
+
+    def setup_display():
+        pygame.init()
+        win = pygame.display.set_mode((0,0), pygame.FULLSCREEN)
+        pygame.display.set_caption("Air Space VR Shooter - Sabrina Blais (who should be sleeping by now...)")
+        return win
+
+    win = boot.run_inline("display", setup_display)
+    clock = pygame.time.Clock()
+    font_big = pygame.font.SysFont("Arial", 80)
+    font_med = pygame.font.SysFont("Arial", 50)
+    font_small = pygame.font.SysFont("Arial", 30)
+
+    def quit_game():
+        boot.shutdown()
+        pygame.quit()
+        sys.exit()
+
+    # Menu (shown immediately, while startup tasks finish)
+    def draw_menu(ready):
         win.fill(BLACK)
-        draw_text_centered(win, "GAME OVER", font_big, RED)
+        draw_text_centered(win, "Air Space VR Shooter", font_big, WHITE, -100)
+        draw_text_centered(win, "By Sabrina Blais (who should be sleeping by now...)", font_med, WHITE, -30)
+        draw_text_centered(win, "Press ENTER to start" if ready else "Loading...", font_small, WHITE, 80)
         pygame.display.update()
-        pygame.time.wait(2500)
-        pygame.quit(); cap.release(); cv2.destroyAll_windows(); exit()
 
-# cleanup (won't reach normally because of exits above)
-pygame.quit()
-cap.release()
-cv2.destroyAll_windows()
+    boot.run_inline("menu", draw_menu, False)
+
+    reported = False
+    menu = True
+    while menu:
+        clock.tick(30)
+        ready = boot.ready()
+        if ready and not reported:
+            boot.report()
+            reported = True
+            if boot.failed():
+                # re-raise the first required failure (missing asset, no camera...)
+                for name in boot.failed():
+                    boot.result(name)
+        draw_menu(ready)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                quit_game()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_RETURN and ready:
+                    menu = False
+                elif event.key == pygame.K_ESCAPE:
+                    quit_game()
+
+    if args.service:
+        cap = hands = boot.result("service")
+    else:
+        hands = boot.result("tracker")
+        cap = boot.result("camera")
+
+    demo = SpaceDemo(assets=boot.result("assets"), music=bool(boot.result("music")),
+                     pad=0 if args.service else 80, session=args.record_session, players=args.players)
+    # cap the render rate; simulation speed doesn't depend on it
+    probe = LatencyProbe() if args.latency else None
+    if args.profile:
+        probe = FrameProfiler(probe, args.profile, demo)
+    watch = MemoryWatch(args.memwatch).start() if args.memwatch else None
+    try:
+        run_pygame(demo, cap, hands, win, fps=60, probe=probe, watch=watch)
+    finally:
+        if probe is not None:
+            # no-op unless run_pygame died before finishing it
+            probe.finish()
+    if args.latency:
+        print(probe.inner.report() if args.profile else probe.report())
+    if watch:
+        watch.stop()
+    quit_game()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import numpy as np
+
+# ------------------------------
+# Space shooter entities
+# ------------------------------
+# Slotted classes instead of per-spawn dicts, recycled through free-list pools
+# so steady-state play allocates (almost) nothing. Dead entities are flagged
+# with alive = False during a tick and released when the lists are compacted.
+
+
+class Bullet:
+    # slot is this bullet's row in the shared TrailBuffer; pooled bullets keep it
+    # vx, vy: drift from gravity wells (px/s), on top of the fixed movement
+    __slots__ = ("x", "y", "px", "py", "alive", "slot", "vx", "vy")
+
+    def reset(self, x, y, trails):
+        self.x = self.px = x
+        self.y = self.py = y
+        self.vx = self.vy = 0.0
+        self.alive = True
+        if not hasattr(self, "slot"):
+            self.slot = trails.new_slot()
+        trails.clear(self.slot)
+        return self
+
+
+class Enemy:
+    __slots__ = ("x", "y", "px", "py", "alive", "split", "w", "h", "vx", "vy")
+
+    def reset(self, x, y, split, w=60, h=50):
+        self.x = self.px = x
+        self.y = self.py = y
+        self.vx = self.vy = 0.0
+        self.alive = True
+        self.split = split
+        self.w = w
+        self.h = h
+        return self
+
+
+class EnemyBullet:
+    __slots__ = ("x", "y", "px", "py", "alive", "vx", "vy")
+
+    def reset(self, x, y):
+        self.x = self.px = x
+        self.y = self.py = y
+        self.vx = self.vy = 0.0
+        self.alive = True
+        return self
+
+
+class Boss:
+    # attack: index into the level's pattern cycle; attack_tick: ticks into it
+    __slots__ = ("x", "y", "px", "py", "alive", "life", "max_life", "speed_x", "attack", "attack_tick")
+
+    def reset(self, x, y, life, speed_x):
+        self.x = self.px = x
+        self.y = self.py = y
+        self.alive = True
+        self.life = self.max_life = life
+        self.speed_x = speed_x
+        self.attack = 0
+        self.attack_tick = 0
+        return self
+
+
+class TrailBuffer:
+    """Bullet trails as one (slots, length, 2) ring buffer shared by all bullets.
+
+    Every tick writes the same ring column for all live bullets, so pushing a
+    point is a single fancy-indexed assignment and nothing is ever popped.
+    """
+
+    def __init__(self, length=16, capacity=64):
+        self.length = length
+        self.points = np.zeros((capacity, length, 2), dtype=np.float32)
+        self.counts = np.zeros(capacity, dtype=np.int32)
+        self.used = 0
+        self.head = 0  # ring column written last
+
+    def new_slot(self):
+        if self.used == len(self.points):
+            self.points = np.concatenate([self.points, np.zeros_like(self.points)])
+            self.counts = np.concatenate([self.counts, np.zeros_like(self.counts)])
+        self.used += 1
+        return self.used - 1
+
+    def clear(self, slot):
+        self.counts[slot] = 0
+
+    def advance(self):
+        self.head = (self.head + 1) % self.length
+
+    def push(self, slots, xs, ys):
+        # append (x, y) to the trail of each slot in one vectorized write
+        self.advance()
+        slots = np.asarray(slots)
+        self.points[slots, self.head, 0] = xs
+        self.points[slots, self.head, 1] = ys
+        self.counts[slots] = np.minimum(self.counts[slots] + 1, self.length)
+
+    def ordered(self, slots):
+        """(n, length, 2) trails newest-first plus their valid lengths."""
+        order = (self.head - np.arange(self.length)) % self.length
+        slots = np.asarray(slots)
+        return self.points[slots][:, order], self.counts[slots]
+
+
+class ProjectileArray:
+    """Enemy projectiles as parallel float32 arrays, live ones packed at the front.
+
+    Rows of `data`: x, y, vx, vy, ax, ay (px, px/s, px/s^2). Moving,
+    culling and hit tests are whole-array operations, so thousands of
+    bullets cost a handful of NumPy calls per tick.
+    """
+
+    def __init__(self, capacity=256):
+        self.data = np.zeros((6, capacity), dtype=np.float32)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def live(self):
+        return self.data[:, :self.count]
+
+    def spawn(self, x, y, vx, vy, ax, ay):
+        n = len(x)
+        end = self.count + n
+        if end > self.data.shape[1]:
+            grown = np.zeros((6, max(end, 2 * self.data.shape[1])), dtype=np.float32)
+            grown[:, :self.count] = self.live
+            self.data = grown
+        self.data[:, self.count:end] = (x, y, vx, vy, ax, ay)
+        self.count = end
+
+    def step(self, dt):
+        live = self.live
+        live[2:4] += live[4:6] * dt
+        live[0:2] += live[2:4] * dt
+
+    def keep(self, mask):
+        # drop every projectile where mask is False
+        n = int(mask.sum())
+        if n != self.count:
+            self.data[:, :n] = self.live[:, mask]
+            self.count = n
+
+    def clear(self):
+        self.count = 0
+
+
+class Pool:
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0
+        self.spawned = 0
+
+    def spawn(self, *args):
+        self.spawned += 1
+        if self.free:
+            obj = self.free.pop()
+        else:
+            obj = self.cls()
+            self.created += 1
+        return obj.reset(*args)
+
+    def release(self, obj):
+        self.free.append(obj)
+
+
+def create_pools():
+    return {"bullets": Pool(Bullet), "enemies": Pool(Enemy),
+            "enemy_bullets": Pool(EnemyBullet), "bosses": Pool(Boss)}
+
+
+def compact(items, pool):
+    # drop dead entities in place, in one pass, and hand them back to the pool
+    j = 0
+    for obj in items:
+        if obj.alive:
+            items[j] = obj
+            j += 1
+        else:
+            pool.release(obj)
+    del items[j:]
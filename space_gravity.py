@@ -0,0 +1,132 @@
+import numpy as np
+
+# ------------------------------
+# Gravity wells as a precomputed force field
+# ------------------------------
+# A well is (x, y, radius, strength[, expires]). Its pull peaks at
+# `strength` px/s^2 at the edge of its core (CORE * radius), falls off
+# linearly to zero at the radius and ramps down to zero at the center, so
+# nothing gets flung out of the middle. All wells are summed into one
+# acceleration grid with a cell every `cell` px. The grid is only rebuilt
+# when the zone list changes; per tick, entities read their acceleration by
+# bilinear interpolation of the grid, vectorized over all of them, so the
+# cost per entity doesn't depend on how many wells there are. For a handful
+# of entities the numpy call overhead dominates, so the grid is also kept as
+# plain lists and sample_one() interpolates a single position in Python.
+
+DEFAULT_STRENGTH = 600.0  # px/s^2, for zones given as (x, y, radius)
+CORE = 0.15  # fraction of the radius over which the pull ramps up from the center
+
+
+class GravityField:
+    def __init__(self, width, height, cell=16):
+        self.cell = cell
+        self.cols = width // cell + 2
+        self.rows = height // cell + 2
+        # (ax, ay) per grid point; flat is the same memory as (rows*cols, 2)
+        self.field = np.zeros((self.rows, self.cols, 2), dtype=np.float32)
+        self.flat = self.field.reshape(-1, 2)
+        # the same grid as flat Python lists (ax, ay per grid point) for sample_one
+        self.ax = self.ay = None
+        self.upper = np.array([[self.cols - 1.001], [self.rows - 1.001]], dtype=np.float32)
+        # grid point coordinates in px
+        self.gx = np.arange(self.cols, dtype=np.float32) * cell
+        self.gy = np.arange(self.rows, dtype=np.float32) * cell
+        self.key = ()
+        self.active = False
+        self.rebuilds = 0
+
+    # pickled (session snapshots) without the grid, which is rebuilt from the
+    # zone key on load; `flat` has to stay a view of `field`
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["field"], state["flat"], state["ax"], state["ay"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.field = np.zeros((self.rows, self.cols, 2), dtype=np.float32)
+        self.flat = self.field.reshape(-1, 2)
+        self.ax = self.ay = None
+        if self.key:
+            self.rebuild(self.key)
+            self.rebuilds -= 1
+
+    def update(self, zones):
+        # cheap when nothing changed: the zone tuples compare equal
+        key = tuple(zones)
+        if key != self.key:
+            self.key = key
+            self.rebuild(zones)
+
+    def rebuild(self, zones):
+        self.field.fill(0)
+        cell = self.cell
+        for zone in zones:
+            x, y, r = zone[:3]
+            strength = zone[3] if len(zone) > 3 else DEFAULT_STRENGTH
+            # only the grid block covering the well's disc
+            c0, c1 = max(0, int((x - r) // cell)), min(self.cols, int((x + r) // cell) + 2)
+            r0, r1 = max(0, int((y - r) // cell)), min(self.rows, int((y + r) // cell) + 2)
+            if c0 >= c1 or r0 >= r1:
+                continue
+            dx = x - self.gx[c0:c1][None, :]
+            dy = y - self.gy[r0:r1][:, None]
+            dist = np.hypot(dx, dy)
+            core = r * CORE
+            # ramp up over the core, then fall off linearly to the rim
+            pull = np.where(dist < core, dist / core, (r - dist) / (r - core))
+            pull = strength * np.clip(pull, 0, None) / np.maximum(dist, 1e-6)
+            self.field[r0:r1, c0:c1, 0] += dx * pull
+            self.field[r0:r1, c0:c1, 1] += dy * pull
+        self.ax = self.flat[:, 0].tolist()
+        self.ay = self.flat[:, 1].tolist()
+        self.active = bool(zones)
+        self.rebuilds += 1
+
+    def sample(self, xs, ys):
+        """Bilinear (n, 2) acceleration in px/s^2 at positions xs, ys."""
+        p = np.array((xs, ys), dtype=np.float32)
+        p /= self.cell
+        np.clip(p, 0, self.upper, out=p)
+        i = p.astype(np.int32)
+        p -= i  # fractional position inside the cell
+        idx = i[1] * self.cols + i[0]
+        tx = p[0, :, None]
+        flat = self.flat
+        top = flat[idx]
+        top += (flat[idx + 1] - top) * tx
+        idx += self.cols
+        bottom = flat[idx]
+        bottom += (flat[idx + 1] - bottom) * tx
+        top += (bottom - top) * p[1, :, None]
+        return top
+
+    def sample_one(self, x, y):
+        """Bilinear (ax, ay) in px/s^2 at one position, in plain Python floats."""
+        # same clamp and interpolation as sample(), written out: this runs
+        # per entity, where min()/max() calls and attribute lookups show up
+        cols, ax, ay = self.cols, self.ax, self.ay
+        fx = x / self.cell
+        fy = y / self.cell
+        if fx < 0.0:
+            fx = 0.0
+        elif fx > cols - 1.001:
+            fx = cols - 1.001
+        if fy < 0.0:
+            fy = 0.0
+        elif fy > self.rows - 1.001:
+            fy = self.rows - 1.001
+        c, r = int(fx), int(fy)
+        fx -= c
+        fy -= r
+        i = r * cols + c
+        j = i + cols
+        top, bottom = ax[i], ax[j]
+        top += (ax[i + 1] - top) * fx
+        bottom += (ax[j + 1] - bottom) * fx
+        gx = top + (bottom - top) * fy
+        top, bottom = ay[i], ay[j]
+        top += (ay[i + 1] - top) * fx
+        bottom += (ay[j + 1] - bottom) * fx
+        return gx, top + (bottom - top) * fy
@@ -0,0 +1,248 @@
+import argparse
+from array import array
+import contextlib
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+import space_sim
+from memwatch import GcTimer
+from space_replay import SessionRecorder
+
+# ------------------------------
+# Headless runner for the space shooter simulation
+# ------------------------------
+# Drives space_sim.step() as fast as possible with scripted or recorded
+# inputs. Used for soak runs at late levels and for per-tick cost numbers.
+#
+#   python space_headless.py --ticks 100000 --level 5 --god
+#   python space_headless.py --record inputs.jsonl --ticks 3600
+#   python space_headless.py --replay inputs.jsonl    # seed, level, size... from its header
+#   python space_headless.py --ticks 72000 --god --session soak.session   # seekable, see space_replay.py
+#   python space_headless.py --ticks 200000 --god --max-growth-kb 256   # exit 1 on growth
+#   python space_headless.py --level 3 --wells 40     # 40 permanent gravity wells
+#   python space_headless.py --players 2 --level 4    # two-player cost
+
+
+def scripted_input(state, tick, index=0):
+    # sweep the ship left/right along the bottom and pinch a few times a second;
+    # further players (index) sweep out of phase
+    width, height = state["width"], state["height"]
+    phase = tick * space_sim.SIM_DT * 0.7 + index * 2.0
+    x = int(width / 2 + math.sin(phase) * (width / 2 - 60))
+    y = int(height - 150 + math.sin(phase * 3.1) * 60)
+    return {"x": x, "y": y, "pinch": (tick + index * 3) % 7 == 0}
+
+
+# run settings written as the first line of a --record file and used by --replay
+RECORDED = ("seed", "level", "width", "height", "players", "wells", "god")
+
+
+def is_header(line):
+    return isinstance(line, dict) and "header" in line
+
+
+def recording_header(path):
+    # None for recordings made before the header existed
+    with open(path) as f:
+        first = f.readline()
+    line = json.loads(first) if first.strip() else None
+    return line["header"] if is_header(line) else None
+
+
+def recorded_inputs(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                control = json.loads(line)
+                if not is_header(control):
+                    yield control
+
+
+def start_at_level(state, level):
+    # fast-forward progression: previous bosses already beaten
+    state["level"] = level
+    state["score"] = space_sim.boss_threshold(level - 1) if level > 1 else 0
+
+
+def add_wells(state, count, seed):
+    # permanent wells spread over the screen (field cost checks)
+    rng = random.Random(seed)
+    width, height = state["width"], state["height"]
+    for _ in range(count):
+        state["gravity_zones"].append((rng.randint(0, width), rng.randint(0, height - 250),
+                                       rng.randint(*space_sim.WELL_RADIUS), rng.uniform(*space_sim.WELL_STRENGTH),
+                                       float("inf")))
+
+
+def revive(state):
+    # --god: keep going instead of ending the run (space_replay repeats this)
+    state["game_over"] = False
+    state["running"] = True
+    state["banner"] = None
+    for player in state["players"]:
+        player["life"] = space_sim.MAX_LIFE
+
+
+def cost_table(counts, times, bucket):
+    # per-tick (entity_count, seconds) -> rows of (bucket_start, n, mean_us, max_us)
+    buckets = {}
+    for count, dt in zip(counts, times):
+        buckets.setdefault(count // bucket * bucket, []).append(dt)
+    rows = []
+    for start in sorted(buckets):
+        times = buckets[start]
+        rows.append((start, len(times), sum(times) / len(times) * 1e6, max(times) * 1e6))
+    return rows
+
+
+def run(args):
+    if args.replay:
+        header = recording_header(args.replay)
+        if header is not None:
+            # replay the run as recorded, whatever the command line says
+            for key in RECORDED:
+                setattr(args, key, header[key])
+            if header["sim_hz"] != space_sim.SIM_HZ:
+                print(f"warning: recorded at {header['sim_hz']} Hz, simulating at {space_sim.SIM_HZ} Hz")
+    state = space_sim.create_state(args.width, args.height, seed=args.seed, players=args.players)
+    state["menu"] = False
+    if args.level > 1:
+        start_at_level(state, args.level)
+    if args.wells:
+        add_wells(state, args.wells, args.seed)
+
+    source = recorded_inputs(args.replay) if args.replay else None
+    session = None
+    if args.session:
+        session = SessionRecorder(args.session, args.snapshot_every, god=args.god)
+        session.begin(state)
+
+    # preallocated so the measurement itself doesn't show up in --mem numbers
+    counts = array("i", bytes(4 * args.ticks))
+    times = array("d", bytes(8 * args.ticks))
+
+    gc_timer = None
+    if args.max_growth_kb is not None:
+        args.mem = True
+    if args.mem:
+        gc_timer = GcTimer()
+        gc_timer.install()
+        tracemalloc.start()
+    # traced memory once pools and caches have filled, for --max-growth-kb
+    warm_tick = args.ticks // 10
+    warm_traced = None
+
+    # flushed and closed even if a step raises
+    with open(args.record, "w") if args.record else contextlib.nullcontext() as record:
+        if record is not None:
+            header = {key: getattr(args, key) for key in RECORDED}
+            record.write(json.dumps({"header": dict(header, sim_hz=space_sim.SIM_HZ)}) + "\n")
+        events = 0
+        peak_entities = 0
+        perf = time.perf_counter
+        started = perf()
+        tick = 0
+        while tick < args.ticks:
+            if source is not None:
+                control = next(source, None)
+                if control is None:
+                    break
+            elif args.players > 1:
+                control = [scripted_input(state, tick, i) for i in range(args.players)]
+            else:
+                control = scripted_input(state, tick)
+            if record is not None:
+                record.write(json.dumps(control) + "\n")
+            if session is not None:
+                session.tick(state, control)
+
+            t0 = perf()
+            space_sim.step(state, control)
+            dt = perf() - t0
+
+            count = space_sim.entity_count(state)
+            counts[tick] = count
+            times[tick] = dt
+            peak_entities = max(peak_entities, count)
+            events += len(state["events"])
+            state["events"].clear()
+            tick += 1
+            if args.mem and tick == warm_tick:
+                warm_traced = tracemalloc.get_traced_memory()[0]
+
+            if state["game_over"]:
+                if not args.god:
+                    break
+                revive(state)
+
+    elapsed = perf() - started
+    if session is not None:
+        session.close()
+    if args.mem:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        gc_timer.remove()
+
+    print(f"ticks: {tick}  wall: {elapsed:.2f}s  rate: {tick / elapsed:.0f} ticks/s "
+          f"({tick / elapsed / space_sim.SIM_HZ:.1f}x real time)")
+    print(f"final level: {state['level']}  score: {state['score']}  "
+          f"peak entities: {peak_entities}  events: {events}  "
+          f"gravity field rebuilds: {state['gravity'].rebuilds}")
+    if tick:
+        counts, times = counts[:tick], times[:tick]
+        ordered = sorted(times)
+        p50 = ordered[len(ordered) // 2] * 1e6
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6
+        print(f"per tick: p50 {p50:.1f}us  p99 {p99:.1f}us  max {ordered[-1] * 1e6:.1f}us")
+        print("entities    ticks   mean_us    max_us")
+        for start, n, mean_us, max_us in cost_table(counts, times, args.bucket):
+            print(f"{start:>8} {n:>8} {mean_us:>9.1f} {max_us:>9.1f}")
+    if session is not None:
+        print(session.summary())
+    if args.mem:
+        print(f"memory: current {current / 1024:.0f}KB  peak {peak / 1024:.0f}KB (tracemalloc)")
+        print(gc_timer.report())
+        pools = ", ".join(f"{name} {pool.created}/{pool.spawned}" for name, pool in state["pools"].items())
+        print(f"pools (allocated/spawned): {pools}")
+    if warm_traced is not None:
+        state["memory_growth"] = current - warm_traced
+        print(f"memory growth after tick {warm_tick}: {(current - warm_traced) / 1024:+.0f}KB")
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless space shooter simulation runner")
+    parser.add_argument("--ticks", type=int, default=36000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--level", type=int, default=1, help="start at this level")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--players", type=int, default=1, help="co-op ships, each with its own scripted input")
+    parser.add_argument("--god", action="store_true", help="never end on game over (soak)")
+    parser.add_argument("--record", help="write the inputs used to this JSON-lines file")
+    parser.add_argument("--replay", help="drive the simulation from a recorded JSON-lines file (run settings from its header)")
+    parser.add_argument("--session", help="record a seekable session file (see space_replay.py)")
+    parser.add_argument("--snapshot-every", type=int, default=600, help="ticks between --session snapshots")
+    parser.add_argument("--mem", action="store_true", help="report tracemalloc peak and GC pauses")
+    parser.add_argument("--wells", type=int, default=0, help="add this many permanent gravity wells")
+    parser.add_argument("--bucket", type=int, default=25, help="entity-count bucket size")
+    parser.add_argument("--max-growth-kb", type=float,
+                        help="soak check (implies --mem): exit 1 if traced memory grows more than this after the first 10%% of ticks")
+    args = parser.parse_args(argv)
+    state = run(args)
+    growth = state.get("memory_growth")
+    if args.max_growth_kb is not None:
+        if growth is None:
+            print("FAIL: run ended before the warmup")
+            return 1
+        if growth > args.max_growth_kb * 1024:
+            print(f"FAIL: memory grew {growth / 1024:.0f}KB, over the {args.max_growth_kb:.0f}KB limit")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
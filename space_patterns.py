@@ -0,0 +1,145 @@
+import json
+import math
+import os
+import numpy as np
+
+# ------------------------------
+# Boss bullet patterns
+# ------------------------------
+# Patterns are data (space_game/boss_patterns.json). Each one compiles into
+# a Schedule: every bullet it will ever fire as parallel arrays sorted by
+# tick (tick, angle, speed, accel, gravity, aim, jitter). Firing is then a
+# binary search for this tick's slice and one vectorized spawn into the
+# ProjectileArray (space_entities.py).
+#
+# Angles are degrees, 0 = straight down, positive towards +x. Speeds are
+# px/s, accelerations px/s^2 ("accel" along the bullet's direction,
+# "gravity" a fixed [ax, ay]). "aim": angles are relative to the direction
+# from the boss to the player when the volley fires; "jitter": random +-
+# degrees per volley.
+#
+#   fan     count bullets over `spread` degrees, `repeat` volleys `interval` s apart
+#   ring    fan over the full circle
+#   spiral  `arms` bullets per shot, rotating `turn` degrees per shot
+#   aimed   `burst` single aimed shots `interval` s apart, `repeat` bursts `gap` s apart
+# fan/ring volleys rotate by `turn` degrees each repeat.
+
+PATTERN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "space_game", "boss_patterns.json")
+PAUSE = 0.6  # default seconds between one pattern ending and the next starting
+
+
+def volleys(spec):
+    # -> [(seconds, [angles])] for one pattern spec
+    kind = spec["type"]
+    angle = spec.get("angle", 0.0)
+    turn = spec.get("turn", 0.0)
+    if kind in ("fan", "ring"):
+        count = spec["count"]
+        spread = 360.0 * (count - 1) / count if kind == "ring" else spec.get("spread", 0.0)
+        offsets = np.linspace(-spread / 2, spread / 2, count) if count > 1 else np.zeros(1)
+        return [(k * spec.get("interval", 0.0), angle + turn * k + offsets)
+                for k in range(spec.get("repeat", 1))]
+    if kind == "spiral":
+        arms = spec.get("arms", 1)
+        offsets = np.arange(arms) * 360.0 / arms
+        return [(s * spec["interval"], angle + turn * s + offsets) for s in range(spec["shots"])]
+    if kind == "aimed":
+        return [(k * spec.get("gap", 0.5) + s * spec.get("interval", 0.1), np.array([angle]))
+                for k in range(spec.get("repeat", 1)) for s in range(spec.get("burst", 1))]
+    raise ValueError(f"unknown bullet pattern type: {kind}")
+
+
+class Schedule:
+    """One compiled pattern: per-bullet arrays sorted by spawn tick."""
+
+    def __init__(self, name, spec, hz):
+        self.name = name
+        shots = volleys(spec)
+        ticks = np.concatenate([np.full(len(angles), round(t * hz)) for t, angles in shots])
+        angles = np.radians(np.concatenate([angles for _, angles in shots]))
+        order = np.argsort(ticks, kind="stable")
+        n = len(ticks)
+        self.ticks = ticks[order].astype(np.int64)
+        self.angles = angles[order]
+        self.speed = np.full(n, float(spec["speed"]))
+        self.accel = np.full(n, float(spec.get("accel", 0.0)))
+        self.gravity = np.array(spec.get("gravity", (0.0, 0.0)), dtype=float)
+        self.aim = bool(spec.get("aim", spec["type"] == "aimed"))
+        self.jitter = math.radians(spec.get("jitter", 0.0))
+        self.offset = spec.get("offset", (0, 0))
+        # the next pattern starts after the last volley plus the pause
+        self.duration = int(self.ticks[-1]) + round(spec.get("pause", PAUSE) * hz) + 1
+
+    def volley(self, tick):
+        # slice of the bullets fired `tick` ticks into the pattern
+        return slice(np.searchsorted(self.ticks, tick, "left"), np.searchsorted(self.ticks, tick, "right"))
+
+
+class PatternBook:
+    """All compiled patterns plus which ones each level's boss cycles through."""
+
+    def __init__(self, data, hz):
+        self.patterns = {name: Schedule(name, spec, hz) for name, spec in data["patterns"].items()}
+        self.levels = sorted((int(level), names) for level, names in data["levels"].items())
+        for _, names in self.levels:
+            for name in names:
+                if name not in self.patterns:
+                    raise ValueError(f"level uses unknown bullet pattern: {name}")
+        self.speedup = data.get("level_speedup", 0.0)
+
+    def attacks(self, level):
+        # the list of the highest defined level <= level
+        names = self.levels[0][1]
+        for at, level_names in self.levels:
+            if at <= level:
+                names = level_names
+        return names
+
+
+def load_patterns(path=PATTERN_FILE, hz=60):
+    with open(path) as f:
+        return PatternBook(json.load(f), hz)
+
+
+_default = None
+
+
+def default_patterns(hz=60):
+    # compiled once per process; schedules are read-only
+    global _default
+    if _default is None:
+        _default = load_patterns(PATTERN_FILE, hz)
+    return _default
+
+
+def fire(book, boss, level, target, projectiles, rng, origin):
+    """Advance the boss's attack by one tick; returns the number of bullets fired.
+
+    boss.attack / boss.attack_tick hold the position in the level's cycle;
+    origin is the muzzle (x, y), target the player (x, y).
+    """
+    names = book.attacks(level)
+    schedule = book.patterns[names[boss.attack % len(names)]]
+    fired = 0
+    part = schedule.volley(boss.attack_tick)
+    n = part.stop - part.start
+    if n:
+        x0, y0 = origin[0] + schedule.offset[0], origin[1] + schedule.offset[1]
+        angles = schedule.angles[part]
+        if schedule.aim:
+            # angle from "straight down" to the player
+            angles = angles + math.atan2(target[0] - x0, target[1] - y0)
+        if schedule.jitter:
+            angles = angles + rng.uniform(-schedule.jitter, schedule.jitter)
+        dx, dy = np.sin(angles), np.cos(angles)
+        speed = schedule.speed[part] * (1 + book.speedup * (level - 1))
+        accel = schedule.accel[part]
+        gx, gy = schedule.gravity
+        projectiles.spawn(np.full(n, x0), np.full(n, y0), dx * speed, dy * speed,
+                          dx * accel + gx, dy * accel + gy)
+        fired = n
+    boss.attack_tick += 1
+    if boss.attack_tick >= schedule.duration:
+        boss.attack += 1
+        boss.attack_tick = 0
+    return fired
@@ -0,0 +1,279 @@
+import argparse
+import pickle
+import sys
+import time
+import zlib
+import numpy as np
+import space_sim
+from space_patterns import default_patterns
+
+# ------------------------------
+# Session record / replay for the space shooter
+# ------------------------------
+# step() is deterministic given the state (including its rng) and the
+# control dict, so a session is the inputs plus enough state to restart
+# from. A session file is a stream of pickled records:
+#   ("header", {...})              size, players, seed, start tick, bullet patterns, options
+#   ("inputs", first_tick, bytes)  packed per-tick controls, 5 bytes a tick per player
+#   ("snapshot", tick, digest, bytes)   full state before that tick's step
+# Inputs are flushed every second and snapshots are written every
+# `snapshot_every` ticks, so a crash loses at most a second. Seeking restores
+# the nearest snapshot at or before the tick and re-simulates only from
+# there. Snapshots are pickles: only open session files you trust.
+#
+#   python space_air.py --record-session bug.session
+#   python space_replay.py bug.session                       # summary
+#   python space_replay.py bug.session --verify              # re-simulate, check every snapshot
+#   python space_replay.py bug.session --bench 36000 39600   # per-tick cost over a stretch
+
+VERSION = 2
+CONTROL = np.dtype([("x", "<i2"), ("y", "<i2"), ("pinch", "u1")])
+NO_POSITION = -32768  # control x/y of None (no hand seen yet)
+# per-run or rebuilt-on-demand entries left out of snapshots
+TRANSIENT = ("events", "patterns")
+
+
+def pack_control(control):
+    x, y = control["x"], control["y"]
+    return (NO_POSITION if x is None else x, NO_POSITION if y is None else y, bool(control["pinch"]))
+
+
+def unpack_control(row):
+    x, y, pinch = int(row["x"]), int(row["y"]), bool(row["pinch"])
+    return {"x": None if x == NO_POSITION else x, "y": None if y == NO_POSITION else y, "pinch": pinch}
+
+
+def digest(state):
+    # cheap fingerprint to detect a replay drifting from the recording
+    players = [(p["life"], p["x"], p["y"]) for p in state["players"]]
+    key = (state["tick"], state["score"], state["level"], players,
+           space_sim.entity_count(state), state["rng"].getstate())
+    return zlib.crc32(repr(key).encode())
+
+
+def snapshot(state):
+    return pickle.dumps({k: v for k, v in state.items() if k not in TRANSIENT}, pickle.HIGHEST_PROTOCOL)
+
+
+def restore(blob, patterns):
+    state = pickle.loads(blob)
+    state["events"] = []
+    state["patterns"] = patterns
+    return state
+
+
+class SessionRecorder:
+    def __init__(self, path, snapshot_every=600, flush_every=60, **options):
+        # options: recorded in the header for the replay (e.g. god=True)
+        self.file = open(path, "wb")
+        self.snapshot_every = snapshot_every
+        self.flush_every = flush_every
+        self.options = options
+        self.buffer = None  # (flush_every, players), sized in begin()
+        self.pending = 0
+        self.first = None  # tick of buffer[0]
+        self.snapshots = 0
+        self.snapshot_time = 0.0
+
+    def _write(self, record):
+        pickle.dump(record, self.file, pickle.HIGHEST_PROTOCOL)
+
+    def begin(self, state):
+        players = len(state["players"])
+        self.buffer = np.zeros((self.flush_every, players), dtype=CONTROL)
+        self._write(("header", {"version": VERSION, "width": state["width"], "height": state["height"],
+                                "players": players,
+                                "seed": state["seed"], "start_tick": state["tick"], "sim_hz": space_sim.SIM_HZ,
+                                "patterns": state["patterns"], "options": self.options}))
+        self.take_snapshot(state)
+
+    def take_snapshot(self, state):
+        t0 = time.perf_counter()
+        self._write(("snapshot", state["tick"], digest(state), snapshot(state)))
+        self.file.flush()
+        self.snapshots += 1
+        self.snapshot_time += time.perf_counter() - t0
+
+    def flush(self):
+        if self.pending:
+            self._write(("inputs", self.first, self.buffer[:self.pending].tobytes()))
+            self.file.flush()
+            self.pending = 0
+
+    def tick(self, state, control):
+        """Call right before space_sim.step(state, control), with the same control."""
+        tick = state["tick"]
+        if tick % self.snapshot_every == 0 and self.snapshots and tick:
+            self.flush()
+            self.take_snapshot(state)
+        if self.pending == 0:
+            self.first = tick
+        controls = control if isinstance(control, list) else (control,)
+        self.buffer[self.pending] = [pack_control(c) for c in controls]
+        self.pending += 1
+        if self.pending == self.flush_every:
+            self.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def summary(self):
+        mean = self.snapshot_time / self.snapshots * 1000 if self.snapshots else 0.0
+        return f"session: {self.snapshots} snapshots, {mean:.2f} ms each"
+
+
+class Session:
+    """A recorded session: controls by tick plus an index of snapshots."""
+
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        chunks = []
+        self.snapshots = []  # (tick, digest, file offset)
+        with open(path, "rb") as f:
+            while True:
+                offset = f.tell()
+                try:
+                    record = pickle.load(f)
+                except EOFError:
+                    break
+                except pickle.UnpicklingError:
+                    # torn last record (crash while writing): keep what's complete
+                    break
+                if record[0] == "header":
+                    self.header = record[1]
+                elif record[0] == "inputs":
+                    chunks.append((record[1], np.frombuffer(record[2], dtype=CONTROL)))
+                elif record[0] == "snapshot":
+                    self.snapshots.append((record[1], record[2], offset))
+        if self.header is None:
+            raise ValueError(f"{path}: not a session file")
+        if self.header["version"] != VERSION:
+            raise ValueError(f"{path}: session format {self.header['version']}, expected {VERSION}")
+        self.start = self.header["start_tick"]
+        self.players = self.header["players"]
+        self.inputs = np.concatenate([c for _, c in chunks]) if chunks else np.zeros(0, dtype=CONTROL)
+        self.inputs = self.inputs.reshape(-1, self.players)
+        self.end = self.start + len(self.inputs)
+        self.patterns = self.header["patterns"] or default_patterns(space_sim.SIM_HZ)
+        self.god = self.header["options"].get("god", False)
+
+    def control(self, tick):
+        # same shape step() was given: a dict, or a list of them with players
+        controls = [unpack_control(row) for row in self.inputs[tick - self.start]]
+        return controls if self.players > 1 else controls[0]
+
+    def load_snapshot(self, offset):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            blob = pickle.load(f)[3]
+        return restore(blob, self.patterns)
+
+    def nearest(self, tick):
+        # latest snapshot taken at or before tick
+        best = None
+        for entry in self.snapshots:
+            if entry[0] <= tick:
+                best = entry
+        return best
+
+    def state_at(self, tick):
+        """State right before `tick`'s step: nearest snapshot + re-simulation."""
+        if not self.start <= tick <= self.end:
+            raise ValueError(f"tick {tick} outside the recording ({self.start}..{self.end})")
+        offset = self.nearest(tick)[2]
+        state = self.load_snapshot(offset)
+        self.play(state, tick)
+        return state
+
+    def play(self, state, end, on_tick=None):
+        # step from state["tick"] up to (not including) end; on_tick(state, seconds)
+        perf = time.perf_counter
+        while state["tick"] < end:
+            control = self.control(state["tick"])
+            t0 = perf()
+            space_sim.step(state, control)
+            dt = perf() - t0
+            state["events"].clear()
+            if self.god and state["game_over"]:
+                from space_headless import revive
+                revive(state)
+            if on_tick is not None:
+                on_tick(state, dt)
+        return state
+
+    def verify(self):
+        """Re-simulate from the first snapshot; returns ticks whose snapshot digests differ."""
+        first = self.snapshots[0]
+        state = self.load_snapshot(first[2])
+        mismatches = []
+        for tick, expected, _ in self.snapshots[1:]:
+            if tick > self.end:
+                break
+            self.play(state, tick)
+            if digest(state) != expected:
+                mismatches.append(tick)
+        return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect, verify, seek and benchmark recorded space shooter sessions")
+    parser.add_argument("session")
+    parser.add_argument("--verify", action="store_true", help="re-simulate and check every snapshot")
+    parser.add_argument("--seek", type=int, metavar="TICK", help="restore the state at TICK and print it")
+    parser.add_argument("--bench", type=int, nargs=2, metavar=("START", "END"),
+                        help="seek to START, then time every step up to END")
+    parser.add_argument("--bucket", type=int, default=25, help="entity-count bucket size for --bench")
+    args = parser.parse_args(argv)
+
+    session = Session(args.session)
+    for tick in ([args.seek] if args.seek is not None else []) + (args.bench or [])[:1]:
+        if not session.start <= tick <= session.end:
+            parser.error(f"tick {tick} outside the recording ({session.start}..{session.end})")
+    hz = session.header["sim_hz"]
+    print(f"{args.session}: ticks {session.start}..{session.end} ({(session.end - session.start) / hz:.0f}s), "
+          f"{len(session.snapshots)} snapshots, {session.players} player(s), seed {session.header['seed']}, "
+          f"{session.header['width']}x{session.header['height']}")
+
+    if args.verify:
+        t0 = time.perf_counter()
+        mismatches = session.verify()
+        print(f"verify: {len(session.snapshots) - 1} snapshots re-simulated in {time.perf_counter() - t0:.2f}s")
+        if mismatches:
+            print(f"FAIL: replay diverges from the recording by tick {mismatches[0]}")
+            return 1
+
+    if args.seek is not None:
+        t0 = time.perf_counter()
+        state = session.state_at(args.seek)
+        elapsed = time.perf_counter() - t0
+        snap = session.nearest(args.seek)[0]
+        print(f"seek {args.seek}: from snapshot {snap} + {args.seek - snap} ticks in {elapsed * 1000:.1f} ms; "
+              f"level {state['level']} score {state['score']} lives {[p['life'] for p in state['players']]} "
+              f"entities {space_sim.entity_count(state)}")
+
+    if args.bench:
+        from space_headless import cost_table
+        start, end = args.bench
+        state = session.state_at(start)
+        counts, times = [], []
+
+        def on_tick(state, dt):
+            counts.append(space_sim.entity_count(state))
+            times.append(dt)
+
+        session.play(state, min(end, session.end), on_tick)
+        if times:
+            ordered = sorted(times)
+            print(f"bench {start}..{start + len(times)}: p50 {ordered[len(ordered) // 2] * 1e6:.1f}us  "
+                  f"p99 {ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6:.1f}us  "
+                  f"max {ordered[-1] * 1e6:.1f}us")
+            print("entities    ticks   mean_us    max_us")
+            for bucket, n, mean_us, max_us in cost_table(counts, times, args.bucket):
+                print(f"{bucket:>8} {n:>8} {mean_us:>9.1f} {max_us:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,438 @@
+import random
+import numpy as np
+import space_patterns
+from space_entities import TrailBuffer, ProjectileArray, create_pools, compact
+from space_gravity import GravityField
+
+# ------------------------------
+# Air Space shooter simulation
+# ------------------------------
+# Pure game logic: no pygame, camera or audio. The frontend (space_air.py) or
+# the headless runner (space_headless.py) feeds a control dict each tick and
+# drains state["events"] to play sounds.
+
+# Non-linear score thresholds for boss per level
+LEVEL_BOSS_THRESHOLDS = [150, 500, 1000, 2000, 3500, 5500]  # extend as needed
+
+# Fixed simulation timestep
+SIM_HZ = 60
+SIM_DT = 1.0 / SIM_HZ
+
+# Speeds in px/second, timers in seconds
+BULLET_SPEED = 840
+ENEMY_BASE_SPEED = 120
+ENEMY_LEVEL_SPEED = 30
+ENEMY_BULLET_BASE_SPEED = 480
+ENEMY_BULLET_LEVEL_SPEED = 12
+POWERUP_SPEED = 120
+BOSS_BASE_SPEED = 180
+BOSS_LEVEL_SPEED = 30
+PINCH_COOLDOWN = 10 / 60
+INVINCIBLE_TIME = 1.0
+BOSS_BANNER_TIME = 1.4
+LEVEL_BANNER_TIME = 1.2
+GAME_OVER_TIME = 2.5
+
+MAX_LIFE = 5
+TRAIL_LENGTH = 16  # ticks of history kept per bullet trail
+
+# Gravity wells: from GRAVITY_LEVEL on, static wells appear for a while and
+# bend shots, enemies and enemy fire (see space_gravity.py)
+GRAVITY_LEVEL = 2
+MAX_WELLS = 5  # at once, reached at level GRAVITY_LEVEL + MAX_WELLS - 1
+WELL_CHANCE = 0.004  # per tick while below the cap
+WELL_LIFETIME = 8.0
+WELL_RADIUS = (120, 220)
+WELL_STRENGTH = (900, 1500)  # px/s^2 peak pull
+# how strongly each kind follows the field (1 = full acceleration)
+BULLET_PULL = 1.0
+ENEMY_PULL = 0.4
+ENEMY_BULLET_PULL = 0.7
+SCALAR_GRAVITY = 32  # below this many entities sample_one() per entity beats one vectorized sample
+# per tick: drift dies out once out of a well (or after it closes), so
+# nothing is left hovering with its drift cancelling its own movement
+DRIFT_DRAG = 0.985
+
+
+# ------------------------------
+# Game State
+# ------------------------------
+def new_player(width, height, index=0, count=1):
+    # ships start spread evenly along the bottom
+    return {
+        "x": width * (index + 1) // (count + 1),
+        "y": height-150,
+        "prev_x": None,
+        "prev_y": None,
+        "life": MAX_LIFE,
+        "pinch_cooldown": 0,
+        "invincible": 0
+    }
+
+
+def create_state(width, height, seed=None, patterns=None, players=1):
+    # patterns: a space_patterns.PatternBook (default: space_game/boss_patterns.json);
+    # players: ships in co-op play, each steered by its own control dict
+    ships = [new_player(width, height, i, players) for i in range(players)]
+    return {
+        "width": width,
+        "height": height,
+        # all gameplay randomness goes through this so runs are reproducible
+        "seed": seed,
+        "rng": random.Random(seed),
+        "tick": 0,
+        # shared score and level; a ship out of lives is down until game over
+        "players": ships,
+        "player": ships[0],
+        # entity lists hold space_entities objects recycled through "pools"
+        "pools": create_pools(),
+        "trails": TrailBuffer(TRAIL_LENGTH),
+        "bullets": [],
+        "enemy_bullets": [],
+        "enemies": [],
+        "bosses": [],
+        "particles": [],
+        "powerups": [],
+        # boss pattern bullets (arrays, not pooled objects)
+        "projectiles": ProjectileArray(),
+        "patterns": patterns or space_patterns.default_patterns(SIM_HZ),
+        # (x, y, radius, strength, expires_tick); the field is rebuilt from
+        # this list only when it changes
+        "gravity_zones": [],
+        "gravity": GravityField(width, height),
+        "score": 0,
+        "level": 1,
+        "enemy_spawn_timer": 0,
+        "boss_spawned": False,
+        # non-blocking banner: {"kind", "text", "time"}; world is paused while shown
+        "banner": None,
+        # ("sound", name) tuples for the frontend, cleared by whoever drains them
+        "events": [],
+        "running": True,
+        "game_over": False,
+        "menu": True
+    }
+
+
+def new_control():
+    # control input sampled from the camera (or a script), consumed by step()
+    return {"x": None, "y": None, "pinch": False}
+
+
+# ------------------------------
+# Helper Functions
+# ------------------------------
+def emit(state, kind, name):
+    state["events"].append((kind, name))
+
+
+def spawn_explosion(state, x, y, count=15):
+    rng = state["rng"]
+    for _ in range(count):
+        state["particles"].append([x, y, rng.randint(2,5), rng.uniform(-2,2), rng.uniform(-2,2)])
+
+
+def show_banner(state, kind, text, duration):
+    state["banner"] = {"kind": kind, "text": text, "time": duration}
+
+
+def boss_threshold(level):
+    return LEVEL_BOSS_THRESHOLDS[min(level - 1, len(LEVEL_BOSS_THRESHOLDS) - 1)]
+
+
+def update_wells(state):
+    # expire old wells, maybe open a new one; zones are immutable tuples so
+    # the force field only sees a change on these two events
+    zones = state["gravity_zones"]
+    tick = state["tick"]
+    if any(zone[4] <= tick for zone in zones):
+        zones[:] = [zone for zone in zones if zone[4] > tick]
+    level = state["level"]
+    if level < GRAVITY_LEVEL or len(zones) >= min(MAX_WELLS, level - GRAVITY_LEVEL + 1):
+        return
+    rng = state["rng"]
+    if rng.random() < WELL_CHANCE:
+        width, height = state["width"], state["height"]
+        r = rng.randint(*WELL_RADIUS)
+        # keep clear of the bottom strip where the ship flies
+        x = rng.randint(r // 2, width - r // 2)
+        y = rng.randint(r // 2, max(r // 2 + 1, height - 250 - r // 2))
+        zones.append((x, y, r, rng.uniform(*WELL_STRENGTH), tick + int(WELL_LIFETIME * SIM_HZ)))
+
+
+def apply_gravity(state):
+    # field acceleration -> drift velocity for every bullet, enemy and enemy
+    # bullet: one vectorized lookup, or per entity when there are only a few
+    field = state["gravity"]
+    field.update(state["gravity_zones"])
+    if not field.active:
+        return
+    projectiles = state["projectiles"]
+    if projectiles.count:
+        live = projectiles.live
+        live[2:4] += field.sample(live[0], live[1]).T * (ENEMY_BULLET_PULL * SIM_DT)
+    bullets, enemies, enemy_bullets = state["bullets"], state["enemies"], state["enemy_bullets"]
+    total = len(bullets) + len(enemies) + len(enemy_bullets)
+    if not total:
+        return
+    if total < SCALAR_GRAVITY:
+        sample = field.sample_one
+        # (entities, sprite center offset, pull)
+        for group, ox, oy, pull in ((bullets, 0, 10, BULLET_PULL), (enemies, 30, 25, ENEMY_PULL),
+                                    (enemy_bullets, 0, 10, ENEMY_BULLET_PULL)):
+            k = pull * SIM_DT
+            for e in group:
+                ax, ay = sample(e.x + ox, e.y + oy)
+                e.vx += ax * k
+                e.vy += ay * k
+        return
+    group = bullets + enemies + enemy_bullets
+    # sample at the sprite centers
+    xs = [b.x for b in bullets] + [e.x + 30 for e in enemies] + [eb.x for eb in enemy_bullets]
+    ys = [b.y + 10 for b in bullets] + [e.y + 25 for e in enemies] + [eb.y + 10 for eb in enemy_bullets]
+    accel = field.sample(xs, ys)
+    n, m = len(bullets), len(bullets) + len(enemies)
+    accel[:n] *= BULLET_PULL * SIM_DT
+    accel[n:m] *= ENEMY_PULL * SIM_DT
+    accel[m:] *= ENEMY_BULLET_PULL * SIM_DT
+    for e, (dvx, dvy) in zip(group, accel.tolist()):
+        e.vx += dvx
+        e.vy += dvy
+
+
+def damage_player(state, player, count=15):
+    if player["invincible"] > 0:
+        return
+    player["life"] -= 1
+    player["invincible"] = INVINCIBLE_TIME
+    spawn_explosion(state, player["x"], player["y"], count)
+    emit(state, "sound", "explosion")
+    if all(p["life"] <= 0 for p in state["players"]):
+        state["game_over"] = True
+        state["running"] = False
+        show_banner(state, "game_over", "GAME OVER", GAME_OVER_TIME)
+
+
+def entity_count(state):
+    return (len(state["bullets"]) + len(state["enemy_bullets"]) + len(state["enemies"]) +
+            len(state["bosses"]) + len(state["particles"]) + len(state["powerups"]) +
+            len(state["projectiles"]))
+
+
+# ------------------------------
+# Simulation tick (fixed SIM_DT)
+# ------------------------------
+def step(state, control):
+    # control: one control dict, or a list of them (one per player)
+    rng = state["rng"]
+    width, height = state["width"], state["height"]
+    state["tick"] += 1
+
+    # Banners pause the world but keep the loop (camera, events, drawing) alive
+    if state["banner"] is not None:
+        state["banner"]["time"] -= SIM_DT
+        if state["banner"]["time"] <= 0:
+            state["banner"] = None
+        return
+
+    players = state["players"]
+    controls = control if isinstance(control, list) else (control,)
+    pools = state["pools"]
+    bullets = state["bullets"]
+    enemies = state["enemies"]
+    enemy_bullets = state["enemy_bullets"]
+
+    # remember where everything was so the renderer can interpolate
+    for player in players:
+        player["px"], player["py"] = player["x"], player["y"]
+    for group in (bullets, enemy_bullets, enemies, state["bosses"]):
+        for ent in group:
+            ent.px, ent.py = ent.x, ent.y
+
+    for player, control in zip(players, controls):
+        if player["life"] <= 0:
+            control["pinch"] = False
+            continue
+        # Latest hand position sampled by the camera loop
+        player["prev_x"] = player["x"]
+        player["prev_y"] = player["y"]
+        if control["x"] is not None:
+            player["x"], player["y"] = control["x"], control["y"]
+
+        # Pinch to shoot (edge sampled once per camera frame, consumed by one tick)
+        if control["pinch"] and player["pinch_cooldown"] <= 0:
+            bullets.append(pools["bullets"].spawn(player["x"], player["y"], state["trails"]))
+            emit(state, "sound", "laser")
+            player["pinch_cooldown"] = PINCH_COOLDOWN
+        control["pinch"] = False
+        if player["pinch_cooldown"] > 0:
+            player["pinch_cooldown"] -= SIM_DT
+    # ships still in play, for the collision checks below
+    live = [player for player in players if player["life"] > 0]
+
+    # Move bullets (trail gets the position before the move)
+    if bullets:
+        state["trails"].push([b.slot for b in bullets], [b.x for b in bullets], [b.y for b in bullets])
+    else:
+        state["trails"].advance()
+    bullet_step = BULLET_SPEED * SIM_DT
+    for b in bullets:
+        b.x += b.vx * SIM_DT
+        b.y += b.vy * SIM_DT - bullet_step
+        b.vx *= DRIFT_DRAG
+        b.vy *= DRIFT_DRAG
+        if b.y < -20 or not -20 < b.x < width + 20:
+            b.alive = False
+
+    # Spawn enemies
+    state["enemy_spawn_timer"] += 1
+    if state["enemy_spawn_timer"] >= max(30, 50 - state["level"]*5):
+        state["enemy_spawn_timer"] = 0
+        ex = rng.randint(30, width-90)
+        enemies.append(pools["enemies"].spawn(ex, -40, rng.choice([False, True, False])))
+
+    # Move enemies and handle collisions (new split enemies start moving next tick)
+    enemy_step = (ENEMY_BASE_SPEED + state["level"] * ENEMY_LEVEL_SPEED) * SIM_DT
+    for i in range(len(enemies)):
+        e = enemies[i]
+        e.x += e.vx * SIM_DT
+        e.y += enemy_step + e.vy * SIM_DT
+        e.vx *= DRIFT_DRAG
+        e.vy *= DRIFT_DRAG
+        # enemy shooting (later levels)
+        if rng.random() < 0.005 * state["level"]:
+            enemy_bullets.append(pools["enemy_bullets"].spawn(e.x + 30, e.y + 50))
+
+        # collision with player bullets
+        for b in bullets:
+            if b.alive and e.x < b.x < e.x + e.w and e.y < b.y < e.y + e.h:
+                state["score"] += 10
+                spawn_explosion(state, e.x + 30, e.y + 25)
+                emit(state, "sound", "explosion")
+                if e.split:
+                    enemies.append(pools["enemies"].spawn(e.x - 30, e.y, False))
+                    enemies.append(pools["enemies"].spawn(e.x + 30, e.y, False))
+                e.alive = False
+                b.alive = False
+                break
+        if not e.alive:
+            continue
+
+        # collision with player (body)
+        for player in live:
+            if e.y + e.h >= player["y"] and abs(e.x + 30 - player["x"]) < 50:
+                damage_player(state, player)
+                e.alive = False
+                break
+
+    # Enemy collisions: touching an enemy damages the player (do NOT kill the enemy)
+    for player in live:
+        px, py = player["x"], player["y"]
+        for e in enemies:
+            # Simple AABB (rectangle) collision between player and enemy
+            if (e.alive and px + 40 > e.x and px - 40 < e.x + e.w and
+                py + 40 > e.y and py - 40 < e.y + e.h):
+                damage_player(state, player, count=10)
+                # do NOT remove or kill the enemy here
+    # Move enemy bullets and handle collisions with player
+    enemy_bullet_step = (ENEMY_BULLET_BASE_SPEED + state["level"] * ENEMY_BULLET_LEVEL_SPEED) * SIM_DT
+    for eb in enemy_bullets:
+        eb.x += eb.vx * SIM_DT
+        eb.y += enemy_bullet_step + eb.vy * SIM_DT
+        eb.vx *= DRIFT_DRAG
+        eb.vy *= DRIFT_DRAG
+
+        for player in live:
+            if abs(eb.x - player["x"]) < 40 and abs(eb.y - player["y"]) < 40:
+                damage_player(state, player, count=10)
+                eb.alive = False
+                break
+        else:
+            if eb.y > height + 20 or not -20 < eb.x < width + 20:
+                eb.alive = False
+
+    # Boss pattern bullets: moved, hit-tested against the ship and culled
+    # as whole arrays
+    projectiles = state["projectiles"]
+    if projectiles.count:
+        projectiles.step(SIM_DT)
+        x, y = projectiles.live[0], projectiles.live[1]
+        keep = (x > -20) & (x < width + 20) & (y > -20) & (y < height + 20)
+        for player in live:
+            hit = (np.abs(x - player["x"]) < 40) & (np.abs(y - player["y"]) < 40)
+            if hit.any():
+                damage_player(state, player, count=10)
+                keep &= ~hit
+        projectiles.keep(keep)
+
+    # Power-ups: heart drops
+    if rng.random() < 0.002:
+        px = rng.randint(50, width - 50)
+        state["powerups"].append([px, -20])
+    for pu in state["powerups"][:]:
+        pu[1] += POWERUP_SPEED * SIM_DT
+        for player in live:
+            if abs(pu[0] - player["x"]) < 40 and abs(pu[1] - player["y"]) < 40:
+                if player["life"] < MAX_LIFE:
+                    player["life"] += 1
+                emit(state, "sound", "powerup")
+                state["powerups"].remove(pu)
+                break
+        else:
+            if pu[1] > height + 20:
+                state["powerups"].remove(pu)
+
+    # reduce invincibility timer
+    for player in players:
+        if player["invincible"] > 0:
+            player["invincible"] = max(0, player["invincible"] - SIM_DT)
+
+    # Gravity wells bend everything that flies (from GRAVITY_LEVEL)
+    update_wells(state)
+    apply_gravity(state)
+
+    # Boss spawn using LEVEL_BOSS_THRESHOLDS
+    if state["score"] >= boss_threshold(state["level"]) and not state["boss_spawned"]:
+        boss_life = 50 + state["level"] * 20
+        boss_speed = BOSS_BASE_SPEED + state["level"] * BOSS_LEVEL_SPEED
+        state["bosses"].append(pools["bosses"].spawn(width//2 - 75, 50, boss_life, boss_speed))
+        state["boss_spawned"] = True
+        show_banner(state, "boss", f"Level {state['level']} - Boss Incoming!", BOSS_BANNER_TIME)
+
+    # Move bosses (horizontal only) and handle their bullets & collisions
+    for boss in state["bosses"]:
+        boss.x += boss.speed_x * SIM_DT
+        if boss.x <= 0 or boss.x >= width - 150:
+            boss.speed_x *= -1
+        # boss attacks: the level's bullet patterns in turn (space_patterns.py),
+        # aimed at the nearest ship still in play
+        target = min(live or players, key=lambda p: abs(p["x"] - boss.x - 75))
+        if space_patterns.fire(state["patterns"], boss, state["level"], (target["x"], target["y"]),
+                               projectiles, rng, (boss.x + 75, boss.y + 100)):
+            emit(state, "sound", "enemy_attack")
+        # collision with player bullets
+        for b in bullets:
+            if b.alive and boss.x < b.x < boss.x + 150 and boss.y < b.y < boss.y + 150:
+                boss.life -= 1
+                spawn_explosion(state, b.x, b.y, count=6)
+                b.alive = False
+                if boss.life <= 0:
+                    state["score"] += 50
+                    emit(state, "sound", "explosion")
+                    boss.alive = False
+                    # its bullets go with it
+                    projectiles.clear()
+                    state["level"] += 1
+                    state["boss_spawned"] = False
+                    show_banner(state, "level", f"Level {state['level']}", LEVEL_BANNER_TIME)
+                    break
+
+    # Move particles
+    for p in state["particles"][:]:
+        p[0] += p[3]; p[1] += p[4]; p[2] -= 0.12
+        if p[2] <= 0:
+            state["particles"].remove(p)
+
+    # Release everything that died this tick back to its pool
+    for group in ("bullets", "enemies", "enemy_bullets", "bosses"):
+        compact(state[group], pools[group])
@@ -0,0 +1,75 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ------------------------------
+# Startup orchestrator
+# ------------------------------
+# Runs slow init steps (model construction, camera negotiation, asset decoding)
+# on worker threads so the main thread can put a window up right away.
+# Every task is timed; report() prints the breakdown so regressions show up.
+
+
+class Startup:
+    def __init__(self, max_workers=4):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self.started = time.perf_counter()
+        self.tasks = {}
+        self.timings = {}
+        self.errors = {}
+        self.optional = set()
+
+    def _timed(self, name, fn, args):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args)
+        except Exception as e:
+            self.errors[name] = e
+            raise
+        finally:
+            self.timings[name] = time.perf_counter() - t0
+
+    def submit(self, name, fn, *args, optional=False):
+        if optional:
+            self.optional.add(name)
+        self.tasks[name] = self.pool.submit(self._timed, name, fn, args)
+
+    def run_inline(self, name, fn, *args):
+        # main-thread step (e.g. display setup) that still shows up in the report
+        return self._timed(name, fn, args)
+
+    def ready(self):
+        return all(task.done() for task in self.tasks.values())
+
+    def failed(self):
+        # required tasks that raised; optional failures are only reported
+        return {name: e for name, e in self.errors.items() if name not in self.optional}
+
+    def result(self, name):
+        """Result of a finished task; None for a failed optional task."""
+        try:
+            return self.tasks[name].result()
+        except Exception:
+            if name in self.optional:
+                return None
+            raise
+
+    def wait(self):
+        for task in self.tasks.values():
+            try:
+                task.result()
+            except Exception:
+                pass
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def report(self, out=print):
+        wall = time.perf_counter() - self.started
+        parts = []
+        for name, secs in sorted(self.timings.items(), key=lambda kv: -kv[1]):
+            status = ""
+            if name in self.errors:
+                status = " (skipped)" if name in self.optional else " (FAILED)"
+            parts.append(f"{name} {secs * 1000:.0f}ms{status}")
+        serial = sum(self.timings.values())
+        out(f"startup: {' | '.join(parts)} | total {wall * 1000:.0f}ms (serial {serial * 1000:.0f}ms)")
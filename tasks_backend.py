@@ -0,0 +1,199 @@
+import argparse
+import os
+import threading
+import time
+import urllib.request
+import numpy as np
+from landmark_service import HandLandmarks, Handedness
+
+# ------------------------------
+# MediaPipe Tasks live-stream backend
+# ------------------------------
+# HandLandmarker / FaceLandmarker in LIVE_STREAM mode behind the legacy
+# Hands/FaceMesh process() interface. process(rgb) queues the frame with
+# detect_async() and returns right away with the newest finished result,
+# so inference overlaps with capture and rendering instead of blocking the
+# loop. The result may be one or more frames old; the Tasks graph drops
+# frames that arrive while it is busy.
+#
+# Select it with --backend tasks on the scripts / launcher. Models are
+# downloaded to models/ on first use.
+#
+#   python tasks_backend.py clip.mp4 [more.mp4 ...]   # throughput vs legacy
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+MODEL_URLS = {
+    "hands": "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task",
+    "face_mesh": "https://storage.googleapis.com/mediapipe-models/face_landmarker/face_landmarker/float16/latest/face_landmarker.task",
+}
+
+# legacy solutions parameter -> Tasks option (per tracker kind); anything
+# else (model_complexity, refine_landmarks) has no Tasks equivalent: the
+# Tasks models are a single complexity and the face model always has irises
+OPTION_NAMES = {
+    "hands": {"max_num_hands": "num_hands", "min_detection_confidence": "min_hand_detection_confidence",
+              "min_tracking_confidence": "min_tracking_confidence"},
+    "face_mesh": {"max_num_faces": "num_faces", "min_detection_confidence": "min_face_detection_confidence",
+                  "min_tracking_confidence": "min_tracking_confidence"},
+}
+
+
+def ensure_model(kind, model_dir=MODEL_DIR):
+    path = os.path.join(model_dir, os.path.basename(MODEL_URLS[kind]))
+    if not os.path.exists(path):
+        os.makedirs(model_dir, exist_ok=True)
+        print(f"downloading {MODEL_URLS[kind]}")
+        urllib.request.urlretrieve(MODEL_URLS[kind], path + ".part")
+        os.replace(path + ".part", path)
+    return path
+
+
+# ------------------------------
+# Tasks results -> legacy-shaped results
+# ------------------------------
+def _points(landmarks):
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+
+
+class HandResults:
+    def __init__(self, result=None):
+        self.multi_hand_landmarks = None
+        self.multi_handedness = None
+        if result is not None and result.hand_landmarks:
+            self.multi_hand_landmarks = [HandLandmarks(_points(lms)) for lms in result.hand_landmarks]
+            self.multi_handedness = [Handedness(cats[0].category_name, cats[0].score) for cats in result.handedness]
+
+
+class FaceResults:
+    def __init__(self, result=None):
+        self.multi_face_landmarks = None
+        if result is not None and result.face_landmarks:
+            # same .landmark list shape as FaceMesh's NormalizedLandmarkList
+            self.multi_face_landmarks = [HandLandmarks(_points(lms)) for lms in result.face_landmarks]
+
+
+RESULTS = {"hands": HandResults, "face_mesh": FaceResults}
+
+
+class TasksTracker:
+    def __init__(self, config, model_dir=MODEL_DIR):
+        import mediapipe as mp
+        from mediapipe.tasks.python import BaseOptions, vision
+        kind, params = config
+        self.kind = kind
+        self.mp = mp
+        self.to_results = RESULTS[kind]
+        names = OPTION_NAMES[kind]
+        options = {names[key]: value for key, value in params if key in names}
+        base = BaseOptions(model_asset_path=ensure_model(kind, model_dir))
+        mode = vision.RunningMode.LIVE_STREAM
+        if kind == "hands":
+            options = vision.HandLandmarkerOptions(base_options=base, running_mode=mode,
+                                                   result_callback=self._on_result, **options)
+            self.landmarker = vision.HandLandmarker.create_from_options(options)
+        else:
+            options = vision.FaceLandmarkerOptions(base_options=base, running_mode=mode,
+                                                   result_callback=self._on_result, **options)
+            self.landmarker = vision.FaceLandmarker.create_from_options(options)
+        self.lock = threading.Lock()
+        self.latest = self.to_results()
+        self.latest_timestamp = None  # ms timestamp of the frame self.latest came from
+        self.last_timestamp = -1
+        self.submitted = 0
+        self.completed = 0
+
+    def _on_result(self, result, image, timestamp_ms):
+        # runs on the Tasks graph thread
+        converted = self.to_results(result)
+        with self.lock:
+            self.latest = converted
+            self.latest_timestamp = timestamp_ms
+            self.completed += 1
+
+    def process(self, rgb):
+        # timestamps must strictly increase
+        timestamp = max(int(time.monotonic() * 1000), self.last_timestamp + 1)
+        self.last_timestamp = timestamp
+        image = self.mp.Image(image_format=self.mp.ImageFormat.SRGB, data=np.ascontiguousarray(rgb))
+        self.landmarker.detect_async(image, timestamp)
+        self.submitted += 1
+        with self.lock:
+            return self.latest
+
+    def wait(self, timeout=1.0):
+        # block until every submitted frame has a result or was dropped
+        end = time.perf_counter() + timeout
+        while self.completed < self.submitted and time.perf_counter() < end:
+            time.sleep(0.005)
+
+    def close(self):
+        self.landmarker.close()
+
+
+# ------------------------------
+# Throughput comparison on recorded clips
+# ------------------------------
+def run_clip(path, tracker, render_ms=0.0):
+    """Play a clip through read -> cvtColor -> process -> (simulated render).
+
+    Returns (frames, seconds, frames with a detection in the returned result).
+    """
+    import cv2
+    cap = cv2.VideoCapture(path)
+    frames = detected = 0
+    start = time.perf_counter()
+    while True:
+        success, frame = cap.read()
+        if not success:
+            break
+        results = tracker.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if getattr(results, "multi_hand_landmarks", None) or getattr(results, "multi_face_landmarks", None):
+            detected += 1
+        if render_ms:
+            time.sleep(render_ms / 1000)
+        frames += 1
+    elapsed = time.perf_counter() - start
+    cap.release()
+    return frames, elapsed, detected
+
+
+def compare(paths, config, render_ms=0.0):
+    from demo_runtime import make_tracker
+    rows = []
+    for backend in ("solutions", "tasks"):
+        try:
+            tracker = make_tracker(config, backend)
+        except Exception as e:
+            print(f"{backend}: unavailable ({e})")
+            continue
+        for path in paths:
+            frames, elapsed, detected = run_clip(path, tracker, render_ms)
+            row = {"backend": backend, "clip": os.path.basename(path), "frames": frames,
+                   "fps": frames / elapsed if elapsed else 0.0, "detected": detected}
+            if backend == "tasks":
+                tracker.wait()
+                row["inferred"] = tracker.completed
+                tracker.submitted = tracker.completed = 0
+            rows.append(row)
+        tracker.close()
+    print(f"{'backend':<10} {'clip':<24} {'frames':>6} {'loop fps':>8} {'detected':>8} {'inferred':>8}")
+    for r in rows:
+        inferred = r.get("inferred", r["frames"])
+        print(f"{r['backend']:<10} {r['clip']:<24} {r['frames']:>6} {r['fps']:>8.1f} {r['detected']:>8} {inferred:>8}")
+    return rows
+
+
+def main(argv=None):
+    from demo_runtime import HANDS_DEFAULT
+    parser = argparse.ArgumentParser(description="Compare legacy and Tasks live-stream tracker throughput on clips")
+    parser.add_argument("clips", nargs="+")
+    parser.add_argument("--face", action="store_true", help="compare FaceMesh / FaceLandmarker instead of hands")
+    parser.add_argument("--render-ms", type=float, default=8.0,
+                        help="simulated per-frame render/game work that async inference can overlap with")
+    args = parser.parse_args(argv)
+    config = ("face_mesh", (("max_num_faces", 1), ("refine_landmarks", True))) if args.face else HANDS_DEFAULT
+    compare(args.clips, config, args.render_ms)
+
+
+if __name__ == "__main__":
+    main()